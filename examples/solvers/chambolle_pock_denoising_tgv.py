@@ -59,17 +59,9 @@ data.show(title='Simulated data')
 G = odl.Gradient(U, method='forward', pad_mode='symmetric')
 V = G.range
 
-Dx = odl.PartialDerivative(U, 0, method='backward', pad_mode='symmetric')
-Dy = odl.PartialDerivative(U, 1, method='backward', pad_mode='symmetric')
-
-# Create symmetrized operator and weighted space.
-# TODO: As the weighted space is currently not supported in ODL we find a
-# workaround.
-#W = odl.ProductSpace(U, 3, weighting=[1, 1, 2])
-#sym_gradient = odl.operator.ProductSpaceOperator(
-#    [[Dx, 0], [0, Dy], [0.5*Dy, 0.5*Dx]], range=W)
-E = odl.operator.ProductSpaceOperator(
-    [[Dx, 0], [0, Dy], [0.5*Dy, 0.5*Dx], [0.5*Dy, 0.5*Dx]])
+# Create symmetrized gradient, its range stores the 3 unique components of
+# the symmetric tensor in a weighted space
+E = odl.SymmetrizedGradient(V, method='backward', pad_mode='symmetric')
 W = E.range
 
 # Create the domain of the problem, given by the reconstruction space and the
@@ -17,9 +17,11 @@ import numpy as np
 from odl.discr.lp_discr import DiscreteLp
 from odl.operator.tensor_ops import PointwiseTensorFieldOperator
 from odl.space import ProductSpace
+from odl.util.bufferpool import temporary_element
 
 
-__all__ = ('PartialDerivative', 'Gradient', 'Divergence', 'Laplacian')
+__all__ = ('PartialDerivative', 'Gradient', 'Divergence', 'Laplacian',
+           'SymmetrizedGradient', 'Hessian')
 
 _SUPPORTED_DIFF_METHODS = ('central', 'forward', 'backward')
 _SUPPORTED_PAD_MODES = ('constant',
@@ -44,6 +46,9 @@ _ADJ_PADDING = {'constant': 'constant',
                 'order2': 'order2_adjoint',
                 'order2_adjoint': 'order2'}
 
+# Pad modes for which the Laplacian is computed by the fused kernel
+_FUSED_LAPLACIAN_PAD_MODES = ('constant', 'symmetric', 'periodic', 'order0')
+
 
 class PartialDerivative(PointwiseTensorFieldOperator):
 
@@ -137,8 +142,8 @@ class PartialDerivative(PointwiseTensorFieldOperator):
                     method=self.method, pad_mode=self.pad_mode,
                     pad_const=self.pad_const)
 
-        # self assignment: no overhead in the case out_arr is a view
-        out[:] = out_arr
+        if not _is_array_view(out):
+            out[:] = out_arr
         return out
 
     def derivative(self, point=None):
@@ -317,7 +322,8 @@ class Gradient(PointwiseTensorFieldOperator):
                         pad_const=self.pad_const,
                         out=out_arr)
 
-            out[axis][:] = out_arr
+            if not _is_array_view(out[axis]):
+                out[axis][:] = out_arr
 
         return out
 
@@ -489,20 +495,23 @@ class Divergence(PointwiseTensorFieldOperator):
         ndim = self.range.ndim
         dx = self.range.cell_sides
 
+        # The first component is differentiated directly into ``out``, the
+        # others via a pooled temporary
         out_arr = out.asarray()
-        tmp = np.empty(out.shape, out.dtype, order=out.space.order)
-        for axis in range(ndim):
-            finite_diff(x[axis], axis=axis, dx=dx[axis], method=self.method,
-                        pad_mode=self.pad_mode,
-                        pad_const=self.pad_const,
-                        out=tmp)
-            if axis == 0:
-                out_arr[:] = tmp
-            else:
-                out_arr += tmp
-
-        # self assignment: no overhead in the case asarray is a view
-        out[:] = out_arr
+        finite_diff(x[0].asarray(), axis=0, dx=dx[0], method=self.method,
+                    pad_mode=self.pad_mode, pad_const=self.pad_const,
+                    out=out_arr)
+        if ndim > 1:
+            with temporary_element(self.range) as tmp:
+                tmp_arr = tmp.asarray()
+                for axis in range(1, ndim):
+                    finite_diff(x[axis].asarray(), axis=axis, dx=dx[axis],
+                                method=self.method, pad_mode=self.pad_mode,
+                                pad_const=self.pad_const, out=tmp_arr)
+                    out_arr += tmp_arr
+
+        if not _is_array_view(out):
+            out[:] = out_arr
         return out
 
     def derivative(self, point=None):
@@ -619,35 +628,41 @@ class Laplacian(PointwiseTensorFieldOperator):
     def _call(self, x, out=None):
         """Calculate the spatial Laplacian of ``x``."""
         if out is None:
-            out = self.range.zero()
-        else:
-            out.set_zero()
+            out = self.range.element()
 
         x_arr = x.asarray()
         out_arr = out.asarray()
-        tmp = np.empty(out.shape, out.dtype, order=out.space.order)
 
         ndim = self.domain.ndim
         dx = self.domain.cell_sides
-
-        for axis in range(ndim):
-            # TODO: this can be optimized
-
-            finite_diff(x_arr, axis=axis, dx=dx[axis] ** 2,
-                        method='forward',
-                        pad_mode=self.pad_mode,
-                        pad_const=self.pad_const, out=tmp)
-
-            out_arr[:] += tmp
-
-            finite_diff(x_arr, axis=axis, dx=dx[axis] ** 2,
-                        method='backward',
-                        pad_mode=self.pad_mode,
-                        pad_const=self.pad_const, out=tmp)
-
-            out_arr[:] -= tmp
-
-        out[:] = out_arr
+        fused = (self.pad_mode in _FUSED_LAPLACIAN_PAD_MODES and
+                 min(self.domain.shape) >= 2)
+
+        with temporary_element(self.range) as tmp:
+            tmp_arr = tmp.asarray()
+            if fused:
+                for axis in range(ndim):
+                    _second_diff(x_arr, axis=axis, dx=dx[axis],
+                                 pad_mode=self.pad_mode,
+                                 pad_const=self.pad_const, out=out_arr,
+                                 tmp=None if axis == 0 else tmp_arr)
+            else:
+                out_arr[:] = 0
+                for axis in range(ndim):
+                    finite_diff(x_arr, axis=axis, dx=dx[axis] ** 2,
+                                method='forward',
+                                pad_mode=self.pad_mode,
+                                pad_const=self.pad_const, out=tmp_arr)
+                    out_arr += tmp_arr
+
+                    finite_diff(x_arr, axis=axis, dx=dx[axis] ** 2,
+                                method='backward',
+                                pad_mode=self.pad_mode,
+                                pad_const=self.pad_const, out=tmp_arr)
+                    out_arr -= tmp_arr
+
+        if not _is_array_view(out):
+            out[:] = out_arr
         return out
 
     def derivative(self, point=None):
@@ -679,6 +694,331 @@ class Laplacian(PointwiseTensorFieldOperator):
         return self
 
 
+class SymmetrizedGradient(PointwiseTensorFieldOperator):
+
+    """Symmetrized gradient operator for vector fields on `DiscreteLp`.
+
+    For a vector field ``v``, this operator computes the symmetric tensor
+    field ``E(v) = (grad(v) + grad(v)^T) / 2``, i.e., the components ::
+
+        E(v)_ij = (d_i v_j + d_j v_i) / 2
+
+    using `finite_diff`. Only the ``d * (d + 1) / 2`` unique components
+    of the symmetric tensor are stored: first the diagonal
+    ``E_00, E_11, ...``, then the upper triangle ``E_01, E_02, ...,
+    E_12, ...`` in row-major order. The range is weighted with 1 for
+    diagonal and 2 for off-diagonal components, such that inner products
+    and pointwise norms agree with those of the full tensor.
+    """
+
+    def __init__(self, domain=None, range=None, method='backward',
+                 pad_mode='symmetric'):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        domain : power space of `DiscreteLp`, optional
+            Space of vector fields which the operator acts on, with one
+            component per dimension of the base space.
+            This is required if ``range`` is not given.
+        range : power space of `DiscreteLp`, optional
+            Space of symmetric tensor fields to which the operator maps.
+            This is required if ``domain`` is not given.
+        method : {'central', 'forward', 'backward'}, optional
+            Finite difference method to be used
+        pad_mode : string, optional
+            The padding mode to use outside the domain, see `Gradient`.
+            The ``'constant'`` mode pads with zeros.
+
+        Examples
+        --------
+        >>> space = odl.uniform_discr([0, 0], [2, 3], (2, 3))
+        >>> sym_grad = SymmetrizedGradient(odl.ProductSpace(space, 2))
+        >>> len(sym_grad.range)
+        3
+        >>> v = sym_grad.domain.element([[[0, 0, 0], [1, 1, 1]],
+        ...                              [[0, 1, 2], [1, 2, 3]]])
+        >>> e = sym_grad(v)
+        >>> print(e[0])
+        [[0.0, 0.0, 0.0],
+         [1.0, 1.0, 1.0]]
+        >>> print(e[2])
+        [[0.0, 0.0, 0.0],
+         [0.5, 0.5, 0.5]]
+
+        The adjoint is exact with respect to the weighted range:
+
+        >>> w = odl.phantom.white_noise(sym_grad.range)
+        >>> abs(e.inner(w) - v.inner(sym_grad.adjoint(w))) < 1e-10
+        True
+        """
+        if domain is None and range is None:
+            raise ValueError('either `domain` or `range` must be specified')
+
+        if domain is None:
+            if not isinstance(range, ProductSpace):
+                raise TypeError('`range` {!r} is not a ProductSpace instance'
+                                ''.format(range))
+            domain = ProductSpace(range[0], range[0].ndim)
+
+        if not isinstance(domain, ProductSpace):
+            raise TypeError('`domain` {!r} is not a ProductSpace instance'
+                            ''.format(domain))
+        base_space = domain[0]
+        if not isinstance(base_space, DiscreteLp):
+            raise TypeError('`domain[0]` {!r} is not a `DiscreteLp` '
+                            'instance'.format(base_space))
+        if len(domain) != base_space.ndim:
+            raise ValueError('`domain` needs {} components, got {}'
+                             ''.format(base_space.ndim, len(domain)))
+
+        if range is None:
+            range = _sym_tensor_space(base_space)
+
+        super().__init__(domain, range, base_space=base_space, linear=True)
+
+        self.method, method_in = str(method).lower(), method
+        if method not in _SUPPORTED_DIFF_METHODS:
+            raise ValueError('`method` {} not understood'
+                             ''.format(method_in))
+
+        self.pad_mode, pad_mode_in = str(pad_mode).lower(), pad_mode
+        if pad_mode not in _SUPPORTED_PAD_MODES:
+            raise ValueError('`pad_mode` {} not understood'
+                             ''.format(pad_mode_in))
+
+    def _call(self, x, out=None):
+        """Calculate the symmetrized gradient of ``x``."""
+        if out is None:
+            out = self.range.element()
+
+        ndim = self.base_space.ndim
+        dx = self.base_space.cell_sides
+        x_arrs = [x_i.asarray() for x_i in x]
+
+        with temporary_element(self.base_space) as tmp:
+            tmp_arr = tmp.asarray()
+            for k, (i, j) in enumerate(_sym_tensor_indices(ndim)):
+                out_arr = out[k].asarray()
+                finite_diff(x_arrs[j], axis=i, dx=dx[i], method=self.method,
+                            pad_mode=self.pad_mode, out=out_arr)
+                if i != j:
+                    finite_diff(x_arrs[i], axis=j, dx=dx[j],
+                                method=self.method, pad_mode=self.pad_mode,
+                                out=tmp_arr)
+                    out_arr += tmp_arr
+                    out_arr *= out_arr.dtype.type(0.5)
+
+                if not _is_array_view(out[k]):
+                    out[k][:] = out_arr
+
+        return out
+
+    @property
+    def adjoint(self):
+        """Adjoint of this operator.
+
+        It is given by the negative divergence of a symmetric tensor
+        field with corrections for the method and padding, ::
+
+            E^*(w)_i = -sum_j d_j w_ij.
+        """
+        return _SymmetrizedGradientAdjoint(self)
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}({!r}, method={!r}, pad_mode={!r})'.format(
+            self.__class__.__name__, self.domain, self.method, self.pad_mode)
+
+
+class _SymmetrizedGradientAdjoint(PointwiseTensorFieldOperator):
+
+    """Adjoint of a `SymmetrizedGradient`."""
+
+    def __init__(self, sym_grad):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        sym_grad : `SymmetrizedGradient`
+            Operator whose adjoint this is.
+        """
+        super().__init__(sym_grad.range, sym_grad.domain,
+                         base_space=sym_grad.base_space, linear=True)
+        self.sym_grad = sym_grad
+
+    def _call(self, x, out=None):
+        """Calculate the adjoint symmetrized gradient of ``x``."""
+        if out is None:
+            out = self.range.element()
+
+        ndim = self.base_space.ndim
+        dx = self.base_space.cell_sides
+        method = _ADJ_METHOD[self.sym_grad.method]
+        pad_mode = _ADJ_PADDING[self.sym_grad.pad_mode]
+        x_arrs = [x_k.asarray() for x_k in x]
+        component = {}
+        for k, (i, j) in enumerate(_sym_tensor_indices(ndim)):
+            component[i, j] = component[j, i] = k
+
+        # The weight 2 of the off-diagonal components cancels the factor
+        # 1/2 in their definition
+        with temporary_element(self.base_space) as tmp:
+            tmp_arr = tmp.asarray()
+            for i in range(ndim):
+                out_arr = out[i].asarray()
+                for j in range(ndim):
+                    finite_diff(x_arrs[component[i, j]], axis=j, dx=dx[j],
+                                method=method, pad_mode=pad_mode,
+                                out=out_arr if j == 0 else tmp_arr)
+                    if j > 0:
+                        out_arr += tmp_arr
+                out_arr *= -1
+
+                if not _is_array_view(out[i]):
+                    out[i][:] = out_arr
+
+        return out
+
+    @property
+    def adjoint(self):
+        """Return the adjoint operator, the `SymmetrizedGradient`."""
+        return self.sym_grad
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{!r}.adjoint'.format(self.sym_grad)
+
+
+class Hessian(PointwiseTensorFieldOperator):
+
+    """Discrete Hessian operator for `DiscreteLp` spaces.
+
+    The Hessian is computed as the `SymmetrizedGradient` of the
+    `Gradient`, ::
+
+        H(f)_ij = (d'_i d_j f + d'_j d_i f) / 2,
+
+    where ``d`` uses the given finite difference method and ``d'`` its
+    adjoint method, e.g., backward differences for forward ``d``. The
+    range stores the ``d * (d + 1) / 2`` unique components, see
+    `SymmetrizedGradient`.
+    """
+
+    def __init__(self, domain=None, range=None, method='forward',
+                 pad_mode='symmetric'):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        domain : `DiscreteLp`, optional
+            Space of elements which the operator acts on.
+            This is required if ``range`` is not given.
+        range : power space of `DiscreteLp`, optional
+            Space of symmetric tensor fields to which the operator maps.
+            This is required if ``domain`` is not given.
+        method : {'central', 'forward', 'backward'}, optional
+            Finite difference method used for the first derivatives.
+        pad_mode : string, optional
+            The padding mode to use outside the domain, see `Gradient`.
+            The ``'constant'`` mode pads with zeros.
+
+        Examples
+        --------
+        >>> space = odl.uniform_discr([0, 0], [3, 3], (3, 3))
+        >>> hess = Hessian(space)
+        >>> f = space.element([[0, 1, 4], [0, 1, 4], [0, 1, 4]])
+        >>> print(hess(f)[1])
+        [[0.0, 2.0, -3.0],
+         [0.0, 2.0, -3.0],
+         [0.0, 2.0, -3.0]]
+        """
+        if domain is None and range is None:
+            raise ValueError('either `domain` or `range` must be specified')
+
+        if domain is None:
+            if not isinstance(range, ProductSpace):
+                raise TypeError('`range` {!r} is not a ProductSpace instance'
+                                ''.format(range))
+            domain = range[0]
+
+        if not isinstance(domain, DiscreteLp):
+            raise TypeError('`domain` {!r} is not a `DiscreteLp` '
+                            'instance'.format(domain))
+
+        if range is None:
+            range = _sym_tensor_space(domain)
+
+        super().__init__(domain, range, base_space=domain, linear=True)
+
+        self.method, method_in = str(method).lower(), method
+        if method not in _SUPPORTED_DIFF_METHODS:
+            raise ValueError('`method` {} not understood'
+                             ''.format(method_in))
+
+        self.pad_mode, pad_mode_in = str(pad_mode).lower(), pad_mode
+        if pad_mode not in _SUPPORTED_PAD_MODES:
+            raise ValueError('`pad_mode` {} not understood'
+                             ''.format(pad_mode_in))
+
+        self.__gradient = Gradient(domain, method=self.method,
+                                   pad_mode=self.pad_mode)
+        self.__sym_gradient = SymmetrizedGradient(
+            self.__gradient.range, range, method=_ADJ_METHOD[self.method],
+            pad_mode=self.pad_mode)
+
+    @property
+    def gradient(self):
+        """The `Gradient` computing the first derivatives."""
+        return self.__gradient
+
+    @property
+    def sym_gradient(self):
+        """The `SymmetrizedGradient` computing the second derivatives."""
+        return self.__sym_gradient
+
+    def _call(self, x, out=None):
+        """Calculate the Hessian of ``x``."""
+        if out is None:
+            out = self.range.element()
+
+        with temporary_element(self.gradient.range) as grad_x:
+            self.gradient(x, out=grad_x)
+            self.sym_gradient(grad_x, out=out)
+        return out
+
+    @property
+    def adjoint(self):
+        """Adjoint of this operator."""
+        return self.gradient.adjoint * self.sym_gradient.adjoint
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}({!r}, method={!r}, pad_mode={!r})'.format(
+            self.__class__.__name__, self.domain, self.method, self.pad_mode)
+
+
+def _sym_tensor_indices(ndim):
+    """Return the index pairs of the unique entries of a symmetric tensor.
+
+    The diagonal comes first, followed by the upper triangle in row-major
+    order.
+    """
+    return ([(i, i) for i in range(ndim)] +
+            [(i, j) for i in range(ndim) for j in range(i + 1, ndim)])
+
+
+def _sym_tensor_space(space):
+    """Return the space of symmetric tensor fields over ``space``.
+
+    Off-diagonal components are weighted by 2 since they appear twice in
+    the full tensor.
+    """
+    weights = [1.0 if i == j else 2.0
+               for i, j in _sym_tensor_indices(space.ndim)]
+    return ProductSpace(space, len(weights), weighting=weights)
+
+
 def finite_diff(f, axis, dx=1.0, method='forward', out=None, **kwargs):
     """Calculate the partial derivative of ``f`` along a given ``axis``.
 
@@ -1023,11 +1363,72 @@ def finite_diff(f, axis, dx=1.0, method='forward', out=None, **kwargs):
         raise NotImplementedError('unknown pad_mode')
 
     # divide by step size
-    out /= dx
+    if dx != 1:
+        out /= dx
 
     return out_in
 
 
+def _second_diff(f_arr, axis, dx, pad_mode, pad_const, out, tmp=None):
+    """Compute the second order central difference of ``f_arr``.
+
+    This is the fused version of the difference between forward and
+    backward `finite_diff` with step ``dx ** 2``, for the pad modes in
+    ``_FUSED_LAPLACIAN_PAD_MODES``. These correspond to padding ``f_arr``
+    with a single value on each side.
+
+    Parameters
+    ----------
+    f_arr : `numpy.ndarray`
+        Array to differentiate, with at least 2 entries along ``axis``.
+    axis : int
+        Axis along which the difference is computed.
+    dx : float
+        Step size along ``axis``.
+    pad_mode : string
+        Padding mode, see `finite_diff`.
+    pad_const : float
+        Value used for ``pad_mode == 'constant'``.
+    out : `numpy.ndarray`
+        Array to which the result is written.
+    tmp : `numpy.ndarray`, optional
+        Temporary array of the same shape as ``out``. If given, the result
+        is computed in ``tmp`` and added to ``out``.
+    """
+    f_arr = np.swapaxes(f_arr, 0, axis)
+    res = np.swapaxes(out if tmp is None else tmp, 0, axis)
+
+    # Interior: f[i + 1] - 2 * f[i] + f[i - 1]
+    np.add(f_arr[2:], f_arr[:-2], out=res[1:-1])
+    res[1:-1] -= f_arr[1:-1]
+    res[1:-1] -= f_arr[1:-1]
+
+    # Boundaries
+    if pad_mode == 'constant':
+        left = right = f_arr.dtype.type(pad_const)
+    elif pad_mode in ('symmetric', 'order0'):
+        left, right = f_arr[0], f_arr[-1]
+    elif pad_mode == 'periodic':
+        left, right = f_arr[-1], f_arr[0]
+    else:
+        raise NotImplementedError('unknown pad_mode')
+
+    res[0] = f_arr[1] + left - 2 * f_arr[0]
+    res[-1] = f_arr[-2] + right - 2 * f_arr[-1]
+
+    if dx != 1:
+        res *= res.dtype.type(1.0 / dx ** 2)
+    if tmp is not None:
+        out += tmp
+
+    return out
+
+
+def _is_array_view(x):
+    """Return ``True`` if ``x.asarray()`` is a view of the data of ``x``."""
+    return getattr(x.space, 'impl', None) == 'numpy'
+
+
 if __name__ == '__main__':
     # pylint: disable=wrong-import-position
     from odl.util.testutils import run_doctests
@@ -312,6 +312,11 @@ class DiscreteLp(DiscretizedSpace):
             indicates if ``inp`` is vectorized. If not, it will be wrapped
             with a vectorizer.
             Default: True
+        memmap : str or file-like
+            File in which the data of the new element is stored as a
+            memory map, see ``NumpyNtuples.element`` for details. If
+            ``inp`` is given, it is written to the file.
+            This requires ``dspace`` to support memory mapping.
 
         Returns
         -------
@@ -349,10 +354,29 @@ class DiscreteLp(DiscretizedSpace):
         >>> space.element(f, c=0.5)
         uniform_discr(-1.0, 1.0, 4).element([0.5, 0.5, 0.5, 0.75])
 
+        Elements can be stored in a file instead of in memory, which
+        allows handling data larger than the available memory:
+
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile() as f:
+        ...     x = space.element([1, 2, 3, 4], memmap=f)
+        ...     print(x)
+        ...     print(isinstance(x.ntuple.data, np.memmap))
+        [1.0, 2.0, 3.0, 4.0]
+        True
+
         See Also
         --------
         sampling : create a discrete element from an undiscretized one
         """
+        memmap = kwargs.pop('memmap', None)
+        if memmap is not None:
+            elem = self.element_type(
+                self, self.dspace.element(memmap=memmap))
+            if inp is not None:
+                elem[:] = self.element(inp, **kwargs)
+            return elem
+
         if inp is None:
             return self.element_type(self, self.dspace.element())
         elif inp in self:
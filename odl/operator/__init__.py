@@ -29,3 +29,6 @@ __all__ += tensor_ops.__all__
 
 from .oputils import *
 __all__ += oputils.__all__
+
+from .rewriting import *
+__all__ += rewriting.__all__
@@ -12,12 +12,14 @@
 from __future__ import print_function, division, absolute_import
 from builtins import object, super
 
+from contextlib import contextmanager
 import inspect
 from numbers import Number, Integral
 import sys
+import threading
 
 from odl.set import LinearSpace, LinearSpaceElement, Set, Field
-from odl.util import cache_arguments
+from odl.util import cache_arguments, temporary_element
 
 
 __all__ = ('Operator', 'OperatorComp', 'OperatorSum', 'OperatorVectorSum',
@@ -29,6 +31,12 @@ __all__ = ('Operator', 'OperatorComp', 'OperatorSum', 'OperatorVectorSum',
            'OpNotImplementedError')
 
 
+# Default for keeping the temporaries of `OperatorSum` and `OperatorComp`
+# between calls instead of drawing them from the buffer pool. Can be
+# changed at runtime.
+PERSISTENT_TMP = False
+
+
 def _default_call_out_of_place(op, x, **kwargs):
     """Default out-of-place evaluation.
 
@@ -296,6 +304,53 @@ def _dispatch_call_args(cls=None, bound_call=None, unbound_call=None,
     return has_out, out_optional, spec
 
 
+class _Workspace(object):
+
+    """Temporary element that is allocated once and then reused.
+
+    Concurrent or re-entrant requests cannot share the stored element,
+    they get a temporary from the buffer pool instead.
+    """
+
+    def __init__(self, space):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        space : `LinearSpace`
+            Space of the temporary.
+        """
+        self.space = space
+        self.__element = None
+        self.__lock = threading.Lock()
+
+    @property
+    def is_allocated(self):
+        """Whether the stored element has been allocated."""
+        return self.__element is not None
+
+    @contextmanager
+    def element(self, persistent):
+        """Context manager for the temporary.
+
+        Parameters
+        ----------
+        persistent : bool
+            If ``True``, use the stored element if available, otherwise
+            take a temporary from the buffer pool.
+        """
+        if persistent and self.__lock.acquire(False):
+            try:
+                if self.__element is None:
+                    self.__element = self.space.element()
+                yield self.__element
+            finally:
+                self.__lock.release()
+        else:
+            with temporary_element(self.space) as tmp:
+                yield tmp
+
+
 class Operator(object):
 
     """Abstract mathematical operator.
@@ -712,8 +767,9 @@ class Operator(object):
         ----------
         estimate : bool
             If true, estimate the operator norm. By default, it is estimated
-            using `power_method_opnorm`, which is only applicable for linear
-            operators.
+            using `lanczos_opnorm` for linear operators with adjoint, and
+            using `power_method_opnorm` otherwise. Estimates are cached
+            per operator and arguments, see `clear_opnorm_cache`.
             Subclasses are allowed to ignore this parameter if they can provide
             an exact value.
 
@@ -721,7 +777,8 @@ class Operator(object):
         ----------------
         kwargs :
             If ``estimate`` is True, pass these arguments to the
-            `power_method_opnorm` call.
+            `lanczos_opnorm` or `power_method_opnorm` call. The latter is
+            always used if ``xstart`` or ``callback`` is given.
 
         Returns
         -------
@@ -748,8 +805,8 @@ class Operator(object):
                                       '`Operator.norm(estimate=True)` to '
                                       'obtain an estimate.')
         else:
-            from odl.operator.oputils import power_method_opnorm
-            return power_method_opnorm(self, **kwargs)
+            from odl.operator.oputils import _estimate_opnorm
+            return _estimate_opnorm(self, **kwargs)
 
     def __add__(self, other):
         """Return ``self + other``.
@@ -1083,7 +1140,8 @@ class OperatorSum(Operator):
 
     """
 
-    def __init__(self, left, right, tmp_ran=None, tmp_dom=None):
+    def __init__(self, left, right, tmp_ran=None, tmp_dom=None,
+                 persistent_tmp=None):
         """Initialize a new instance.
 
         Parameters
@@ -1100,6 +1158,13 @@ class OperatorSum(Operator):
         tmp_dom : `Operator.domain` element, optional
             Used to avoid the creation of a temporary when applying the
             operator adjoint.
+        persistent_tmp : bool, optional
+            If ``True`` and ``tmp_ran`` is not given, allocate the
+            temporary at the first in-place evaluation and reuse it in
+            subsequent calls. Otherwise, a temporary is taken from the
+            buffer pool in each call.
+            For the default ``None``, the module-level ``PERSISTENT_TMP``
+            at call time is used.
 
         Examples
         --------
@@ -1138,6 +1203,8 @@ class OperatorSum(Operator):
         self.__right = right
         self.__tmp_ran = tmp_ran
         self.__tmp_dom = tmp_dom
+        self.__persistent_tmp = persistent_tmp
+        self.__workspace = _Workspace(left.range)
 
     @property
     def left(self):
@@ -1149,16 +1216,27 @@ class OperatorSum(Operator):
         """The left/second part of this sum."""
         return self.__right
 
+    @property
+    def persistent_tmp(self):
+        """Whether the temporary is kept between calls."""
+        if self.__persistent_tmp is None:
+            return PERSISTENT_TMP
+        else:
+            return self.__persistent_tmp
+
     def _call(self, x, out=None):
         """Implement ``self(x[, out])``."""
         if out is None:
             return self.left(x) + self.right(x)
         else:
-            tmp = (self.__tmp_ran if self.__tmp_ran is not None
-                   else self.range.element())
             self.left(x, out=out)
-            self.right(x, out=tmp)
-            out += tmp
+            if self.__tmp_ran is not None:
+                self.right(x, out=self.__tmp_ran)
+                out += self.__tmp_ran
+            else:
+                with self.__workspace.element(self.persistent_tmp) as tmp:
+                    self.right(x, out=tmp)
+                    out += tmp
 
     def derivative(self, x):
         """Return the operator derivative at ``x``.
@@ -1176,7 +1254,8 @@ class OperatorSum(Operator):
         else:
             return OperatorSum(self.left.derivative(x),
                                self.right.derivative(x),
-                               self.__tmp_dom, self.__tmp_ran)
+                               self.__tmp_dom, self.__tmp_ran,
+                               self.__persistent_tmp)
 
     @property
     def adjoint(self):
@@ -1201,7 +1280,8 @@ class OperatorSum(Operator):
             raise OpNotImplementedError('nonlinear operators have no adjoint')
 
         return OperatorSum(self.left.adjoint, self.right.adjoint,
-                           self.__tmp_dom, self.__tmp_ran)
+                           self.__tmp_dom, self.__tmp_ran,
+                           self.__persistent_tmp)
 
     def __repr__(self):
         """Return ``repr(self)``."""
@@ -1315,7 +1395,7 @@ class OperatorComp(Operator):
     The composition is only well-defined if ``left.domain == right.range``.
     """
 
-    def __init__(self, left, right, tmp=None):
+    def __init__(self, left, right, tmp=None, persistent_tmp=None):
         """Initialize a new `OperatorComp` instance.
 
         Parameters
@@ -1328,6 +1408,22 @@ class OperatorComp(Operator):
         tmp : element of the range of ``right``, optional
             Used to avoid the creation of a temporary when applying the
             operator.
+        persistent_tmp : bool, optional
+            If ``True`` and ``tmp`` is not given, allocate the temporary
+            at the first in-place evaluation and reuse it in subsequent
+            calls. Otherwise, a temporary is taken from the buffer pool
+            in each call.
+            For the default ``None``, the module-level ``PERSISTENT_TMP``
+            at call time is used.
+
+        Examples
+        --------
+        >>> r3 = odl.rn(3)
+        >>> op = odl.ScalingOperator(r3, 2.0)
+        >>> comp = OperatorComp(op, op, persistent_tmp=True)
+        >>> out = r3.element()
+        >>> comp([1, 2, 3], out=out)
+        rn(3).element([4.0, 8.0, 12.0])
         """
         if right.range != left.domain:
             raise OpTypeError('`range` {!r} of the right operator {!r} not '
@@ -1346,6 +1442,8 @@ class OperatorComp(Operator):
         self.__left = left
         self.__right = right
         self.__tmp = tmp
+        self.__persistent_tmp = persistent_tmp
+        self.__workspace = _Workspace(right.range)
 
     @property
     def left(self):
@@ -1357,15 +1455,26 @@ class OperatorComp(Operator):
         """The left/second part of this composition."""
         return self.__right
 
+    @property
+    def persistent_tmp(self):
+        """Whether the temporary is kept between calls."""
+        if self.__persistent_tmp is None:
+            return PERSISTENT_TMP
+        else:
+            return self.__persistent_tmp
+
     def _call(self, x, out=None):
         """Implement ``self(x[, out])``."""
         if out is None:
             return self.left(self.right(x))
         else:
-            tmp = (self.__tmp if self.__tmp is not None
-                   else self.right.range.element())
-            self.right(x, out=tmp)
-            return self.left(tmp, out=out)
+            if self.__tmp is not None:
+                self.right(x, out=self.__tmp)
+                return self.left(self.__tmp, out=out)
+            else:
+                with self.__workspace.element(self.persistent_tmp) as tmp:
+                    self.right(x, out=tmp)
+                    return self.left(tmp, out=out)
 
     @property
     def inverse(self):
@@ -1378,7 +1487,7 @@ class OperatorComp(Operator):
             ``OperatorComp(right.inverse, left.inverse)``
         """
         return OperatorComp(self.right.inverse, self.left.inverse,
-                            self.__tmp)
+                            self.__tmp, self.__persistent_tmp)
 
     def derivative(self, x):
         """Return the operator derivative.
@@ -1406,7 +1515,7 @@ class OperatorComp(Operator):
             right_deriv = self.right.derivative(x)
 
             return OperatorComp(left_deriv, right_deriv,
-                                self.__tmp)
+                                self.__tmp, self.__persistent_tmp)
 
     @property
     def adjoint(self):
@@ -1431,7 +1540,7 @@ class OperatorComp(Operator):
             raise OpNotImplementedError('nonlinear operators have no adjoint')
 
         return OperatorComp(self.right.adjoint, self.left.adjoint,
-                            self.__tmp)
+                            self.__tmp, self.__persistent_tmp)
 
     def __repr__(self):
         """Return ``repr(self)``."""
@@ -1490,10 +1599,10 @@ class OperatorPointwiseProduct(Operator):
         if out is None:
             return self.left(x) * self.right(x)
         else:
-            tmp = self.right.range.element()
             self.left(x, out=out)
-            self.right(x, out=tmp)
-            out *= tmp
+            with temporary_element(self.right.range) as tmp:
+                self.right(x, out=tmp)
+                out *= tmp
 
     def derivative(self, x):
         """Return the derivative at ``x``."""
@@ -1751,11 +1860,12 @@ class OperatorRightScalarMult(Operator):
             return self.operator(self.scalar * x)
         else:
             if self.__tmp is not None:
-                tmp = self.__tmp
+                self.__tmp.lincomb(self.scalar, x)
+                self.operator(self.__tmp, out=out)
             else:
-                tmp = self.domain.element()
-            tmp.lincomb(self.scalar, x)
-            self.operator(tmp, out=out)
+                with temporary_element(self.domain) as tmp:
+                    tmp.lincomb(self.scalar, x)
+                    self.operator(tmp, out=out)
 
     def __mul__(self, other):
         """Implement ``self * other``.
@@ -2130,9 +2240,9 @@ class OperatorRightVectorMult(Operator):
         if out is None:
             return self.operator(x * self.vector)
         else:
-            tmp = self.domain.element()
-            x.multiply(self.vector, out=tmp)
-            self.operator(tmp, out=out)
+            with temporary_element(self.domain) as tmp:
+                x.multiply(self.vector, out=tmp)
+                self.operator(tmp, out=out)
 
     @property
     def inverse(self):
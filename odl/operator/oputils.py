@@ -11,6 +11,9 @@
 # Imports for common Python 2/3 codebase
 from __future__ import print_function, division, absolute_import
 from future.utils import native
+from collections import OrderedDict
+import threading
+import weakref
 
 import numpy as np
 
@@ -18,28 +21,71 @@ from odl.space.base_ntuples import FnBase
 from odl.space import ProductSpace
 from odl.util import as_flat_array
 
-__all__ = ('matrix_representation', 'power_method_opnorm', 'as_scipy_operator',
-           'as_scipy_functional', 'as_proximal_lang_operator')
+__all__ = ('matrix_representation', 'power_method_opnorm', 'lanczos_opnorm',
+           'clear_opnorm_cache', 'as_scipy_operator', 'as_scipy_functional',
+           'as_proximal_lang_operator')
 
 
-def matrix_representation(op):
+def matrix_representation(op, sparse=False, sparsity_pattern=None,
+                          batch_size=1, executor=None):
     """Return a matrix representation of a linear operator.
 
     Parameters
     ----------
     op : `Operator`
         The linear operator of which one wants a matrix representation.
+    sparse : bool, optional
+        If ``True``, return a `scipy.sparse.csr_matrix` instead of a
+        dense array.
+    sparsity_pattern : `array-like` or `scipy.sparse.spmatrix`, optional
+        Boolean matrix of the same shape as the result, which is ``True``
+        wherever the matrix can be nonzero. It is used to probe several
+        columns at once (see Notes). By default, the pattern is known for
+        `PartialDerivative`, `Gradient`, `Divergence`, `Laplacian` and
+        `ScalingOperator`, and no compression is done for other operators.
+    batch_size : positive int, optional
+        Number of probes that are evaluated in one call of a
+        `DiagonalOperator` of ``op``.
+    executor : optional
+        Executor used to evaluate a batch of probes concurrently, see
+        `ProductSpaceOperator`.
 
     Returns
     ----------
-    matrix : `numpy.ndarray`
+    matrix : `numpy.ndarray` or `scipy.sparse.csr_matrix`
         The matrix representation of the operator.
 
+    Examples
+    --------
+    >>> space = odl.uniform_discr(0, 1, 3)
+    >>> grad = odl.Gradient(space, pad_mode='symmetric')
+    >>> matrix_representation(grad) / 3
+    array([[-1.,  1.,  0.],
+           [ 0., -1.,  1.],
+           [ 0.,  0.,  0.]])
+    >>> mat = matrix_representation(grad, sparse=True)
+    >>> mat.nnz
+    4
+
     Notes
     ----------
-    The algorithm works by letting the operator act on all unit vectors, and
-    stacking the output as a matrix.
+    The algorithm works by letting the operator act on unit vectors, and
+    stacking the output as a matrix. If a sparsity pattern is available,
+    columns whose nonzero rows do not overlap are grouped, and the sum of
+    their unit vectors is used as probe [CPR1974]. This reduces the
+    number of operator evaluations from the number of columns to the
+    number of groups, which is small for local operators such as finite
+    differences.
+
+    References
+    ----------
+    [CPR1974] Curtis, A R, Powell, M J D, and Reid, J K. *On the
+    estimation of sparse Jacobian matrices*. IMA Journal of Applied
+    Mathematics, 13 (1974), pp 117--119.
     """
+    # Lazy import to improve `import odl` time
+    import scipy.sparse
+    from odl.operator.tensor_ops import MatrixOperator
 
     if not op.is_linear:
         raise ValueError('the operator is not linear')
@@ -56,58 +102,191 @@ def matrix_representation(op):
         raise TypeError('operator range {!r} is not FnBase, nor ProductSpace '
                         'with only FnBase components'.format(op.range))
 
-    # Get the size of the range, and handle ProductSpace
-    # Store for reuse in loop
-    op_ran_is_prod_space = isinstance(op.range, ProductSpace)
-    if op_ran_is_prod_space:
-        num_ran = op.range.size
-        n = [ran.size for ran in op.range]
+    batch_size, batch_size_in = int(batch_size), batch_size
+    if batch_size <= 0:
+        raise ValueError('`batch_size` must be positive, got {}'
+                         ''.format(batch_size_in))
+
+    dtype = np.promote_types(op.domain.dtype, op.range.dtype)
+    n = _space_size(op.range)
+    m = _space_size(op.domain)
+
+    # The matrix is already there
+    if isinstance(op, MatrixOperator):
+        if sparse:
+            return scipy.sparse.csr_matrix(op.matrix, dtype=dtype)
+        elif scipy.sparse.isspmatrix(op.matrix):
+            return op.matrix.toarray().astype(dtype, copy=False)
+        else:
+            return np.array(op.matrix, dtype=dtype)
+
+    if sparsity_pattern is None:
+        sparsity_pattern = _sparsity_pattern(op)
+    if sparsity_pattern is not None:
+        sparsity_pattern = scipy.sparse.csc_matrix(sparsity_pattern,
+                                                   dtype=bool)
+        if sparsity_pattern.shape != (n, m):
+            raise ValueError('`sparsity_pattern` has shape {}, expected {}'
+                             ''.format(sparsity_pattern.shape, (n, m)))
+        groups = _column_groups(sparsity_pattern)
     else:
-        num_ran = 1
-        n = [op.range.size]
-
-    # Get the size of the domain, and handle ProductSpace
-    # Store for reuse in loop
-    op_dom_is_prod_space = isinstance(op.domain, ProductSpace)
-    if op_dom_is_prod_space:
-        num_dom = op.domain.size
-        m = [dom.size for dom in op.domain]
+        groups = [[j] for j in range(m)]
+
+    if batch_size == 1:
+        batch_op = op
     else:
-        num_dom = 1
-        m = [op.domain.size]
+        # Lazy import to avoid circular imports
+        from odl.operator.pspace_ops import DiagonalOperator
+        batch_op = DiagonalOperator(op, batch_size, executor=executor)
 
-    # Generate the matrix
-    dtype = np.promote_types(op.domain.dtype, op.range.dtype)
-    matrix = np.zeros([np.sum(n), np.sum(m)], dtype=dtype)
-    tmp_ran = op.range.element()  # Store for reuse in loop
-    tmp_dom = op.domain.zero()  # Store for reuse in loop
-    index = 0
-    last_i = last_j = 0
-
-    for i in range(num_dom):
-        for j in range(m[i]):
-            if op_dom_is_prod_space:
-                tmp_dom[last_i][last_j] = 0.0
-                tmp_dom[i][j] = 1.0
-            else:
-                tmp_dom[last_j] = 0.0
-                tmp_dom[j] = 1.0
-            op(tmp_dom, out=tmp_ran)
-            if op_ran_is_prod_space:
-                tmp_idx = 0
-                for k in range(num_ran):
-                    matrix[tmp_idx: tmp_idx + op.range[k].size, index] = (
-                        as_flat_array(tmp_ran[k]))
-                    tmp_idx += op.range[k].size
+    if sparse or sparsity_pattern is not None:
+        rows, cols, data = [], [], []
+    else:
+        matrix = np.zeros([n, m], dtype=dtype)
+
+    tmp_dom = batch_op.domain.element()
+    tmp_ran = batch_op.range.element()
+    probe = np.zeros(m, dtype=op.domain.dtype)
+    result = np.empty(n, dtype=op.range.dtype)
+
+    for start in range(0, len(groups), batch_size):
+        batch = groups[start:start + batch_size]
+
+        # Set up the probes, unused slots of the last batch stay as they are
+        for i, group in enumerate(batch):
+            probe[:] = 0
+            probe[group] = 1
+            _assign_flat(tmp_dom[i] if batch_size > 1 else tmp_dom, probe)
+
+        batch_op(tmp_dom, out=tmp_ran)
+
+        for i, group in enumerate(batch):
+            _copy_flat(tmp_ran[i] if batch_size > 1 else tmp_ran, result)
+            if sparsity_pattern is not None:
+                # Each nonzero row of the pattern in the group belongs to
+                # exactly one column
+                sub_pattern = sparsity_pattern[:, group]
+                rows.append(sub_pattern.indices)
+                cols.append(np.repeat(group, np.diff(sub_pattern.indptr)))
+                data.append(result[sub_pattern.indices])
+            elif sparse:
+                nonzero = np.flatnonzero(result)
+                rows.append(nonzero)
+                cols.append(np.full(nonzero.size, group[0], dtype=int))
+                data.append(result[nonzero])
             else:
-                matrix[:, index] = as_flat_array(tmp_ran)
-            index += 1
-            last_j = j
-            last_i = i
+                matrix[:, group[0]] = result
+
+    if sparse or sparsity_pattern is not None:
+        if rows:
+            rows, cols, data = (np.concatenate(rows), np.concatenate(cols),
+                                np.concatenate(data).astype(dtype))
+        matrix = scipy.sparse.csr_matrix((data, (rows, cols)), shape=(n, m),
+                                         dtype=dtype)
+        matrix.eliminate_zeros()
+        if not sparse:
+            matrix = matrix.toarray()
 
     return matrix
 
 
+def _assign_flat(x, arr):
+    """Assign the flat array ``arr`` to ``x``, in storage order."""
+    parts = x if isinstance(x.space, ProductSpace) else [x]
+    idx = 0
+    for part in parts:
+        part[:] = arr[idx:idx + part.size]
+        idx += part.size
+
+
+def _copy_flat(x, out):
+    """Copy the entries of ``x`` to the flat array ``out``."""
+    parts = x if isinstance(x.space, ProductSpace) else [x]
+    idx = 0
+    for part in parts:
+        out[idx:idx + part.size] = as_flat_array(part)
+        idx += part.size
+
+
+def _column_groups(pattern):
+    """Return groups of columns of ``pattern`` with disjoint rows.
+
+    The groups are found by greedy coloring of the column intersection
+    graph.
+    """
+    pattern = pattern.astype(int)
+    conflicts = (pattern.T * pattern).tocsr()
+    colors = np.full(pattern.shape[1], -1, dtype=int)
+    for j in range(pattern.shape[1]):
+        neighbors = conflicts.indices[conflicts.indptr[j]:
+                                      conflicts.indptr[j + 1]]
+        used = np.zeros(len(neighbors) + 1, dtype=bool)
+        nbr_colors = colors[neighbors]
+        used[nbr_colors[(nbr_colors >= 0) &
+                        (nbr_colors < len(used))]] = True
+        colors[j] = np.argmin(used)
+
+    order = np.argsort(colors, kind='mergesort')
+    splits = np.flatnonzero(np.diff(colors[order])) + 1
+    return np.split(order, splits)
+
+
+def _stencil_pattern(space, axes, width):
+    """Return the sparsity pattern of a stencil operator on ``space``.
+
+    The pattern couples each point to all points at distance at most
+    ``width`` along one of ``axes``, with periodic wrapping to cover
+    all boundary conditions.
+    """
+    # Lazy import to improve `import odl` time
+    import scipy.sparse
+
+    index = np.arange(space.size).reshape(space.shape, order=space.order)
+    rows = [index.ravel()]
+    cols = [index.ravel()]
+    for axis in axes:
+        for shift in range(1, width + 1):
+            for signed_shift in (shift, -shift):
+                rows.append(index.ravel())
+                cols.append(np.roll(index, signed_shift, axis=axis).ravel())
+
+    rows = np.concatenate(rows)
+    cols = np.concatenate(cols)
+    data = np.ones(rows.size, dtype=bool)
+    return scipy.sparse.csc_matrix((data, (rows, cols)),
+                                   shape=(space.size, space.size))
+
+
+def _sparsity_pattern(op):
+    """Return the sparsity pattern of ``op``, or ``None`` if unknown."""
+    # Lazy import to improve `import odl` time
+    import scipy.sparse
+    from odl.discr.diff_ops import (
+        PartialDerivative, Gradient, Divergence, Laplacian)
+    from odl.operator.default_ops import ScalingOperator
+
+    # Boundary handling of the finite differences uses up to 3 points
+    width = 2
+
+    if isinstance(op, ScalingOperator) and isinstance(op.domain, FnBase):
+        return scipy.sparse.identity(op.domain.size, dtype=bool,
+                                     format='csc')
+    elif isinstance(op, PartialDerivative):
+        return _stencil_pattern(op.domain, [op.axis], width)
+    elif isinstance(op, Laplacian):
+        return _stencil_pattern(op.domain, range(op.domain.ndim), width)
+    elif isinstance(op, Gradient):
+        return scipy.sparse.vstack(
+            [_stencil_pattern(op.domain, [axis], width)
+             for axis in range(op.domain.ndim)], format='csc')
+    elif isinstance(op, Divergence):
+        return scipy.sparse.hstack(
+            [_stencil_pattern(op.range, [axis], width)
+             for axis in range(op.range.ndim)], format='csc')
+    else:
+        return None
+
+
 def power_method_opnorm(op, xstart=None, maxiter=100, rtol=1e-05, atol=1e-08,
                         callback=None):
     """Estimate the operator norm with the power method.
@@ -254,7 +433,301 @@ def power_method_opnorm(op, xstart=None, maxiter=100, rtol=1e-05, atol=1e-08,
     return opnorm
 
 
-def as_scipy_operator(op):
+# Multiple of the machine epsilon below which the (relative) norm of a new
+# Lanczos vector is considered a breakdown
+_LANCZOS_BREAKDOWN_FACTOR = 100
+
+
+def lanczos_opnorm(op, num_probes=2, maxiter=50, rtol=1e-4, atol=0.0,
+                   failure_prob=1e-3, seed=None, executor=None,
+                   return_bound=False):
+    r"""Estimate the operator norm with Golub-Kahan-Lanczos iterations.
+
+    Several random probe vectors are iterated simultaneously, where the
+    operator and its adjoint are applied to all probes in one batched
+    call per iteration. The estimate is the largest singular value of
+    the bidiagonal matrices built up by the iteration. It is a lower
+    bound of the operator norm and typically converges much faster
+    than the power method.
+
+    Parameters
+    ----------
+    op : `Operator`
+        Linear operator whose norm is to be estimated. Its
+        `Operator.adjoint` must be defined.
+    num_probes : positive int, optional
+        Number of random starting vectors.
+    maxiter : positive int, optional
+        Maximum number of iterations. Each iteration evaluates ``op`` and
+        ``op.adjoint`` once per probe.
+    rtol : float, optional
+        Relative tolerance for the change of the estimate between two
+        iterations, below which the iteration is stopped.
+    atol : float, optional
+        Absolute tolerance for the change of the estimate between two
+        iterations, below which the iteration is stopped.
+    failure_prob : float, optional
+        Probability that the operator norm exceeds the upper bound
+        returned for ``return_bound=True``.
+    seed : int, optional
+        Random seed used to generate the probes. For ``None``, use the
+        current seed.
+    executor : optional
+        Executor used to evaluate the probes concurrently, see
+        `ProductSpaceOperator`.
+    return_bound : bool, optional
+        If ``True``, return a probabilistic upper bound of the operator
+        norm in addition to the estimate.
+
+    Returns
+    -------
+    est_opnorm : float
+        The estimated operator norm of ``op``.
+    upper_bound : float
+        Upper bound of the operator norm that holds with probability
+        at least ``1 - failure_prob``. It can be ``inf`` if too few
+        iterations were run. Only returned if ``return_bound`` is
+        ``True``.
+
+    Examples
+    --------
+    >>> space = odl.uniform_discr(0, 1, 5)
+    >>> op = odl.ScalingOperator(space, 3)
+    >>> est = lanczos_opnorm(op)
+    >>> round(est, 10)
+    3.0
+
+    Notes
+    -----
+    For a linear operator :math:`A`, the iteration is equivalent to the
+    Lanczos method for :math:`A^* A` with a random start. The upper bound
+    follows from the estimate by Kuczynski and Wozniakowski [KW1992] for
+    the Lanczos approximation :math:`\theta_k` of the largest eigenvalue
+    :math:`\lambda` of an :math:`n`-dimensional operator after :math:`k`
+    iterations,
+
+    .. math::
+        P(\theta_k < (1 - \epsilon) \lambda) \leq
+        1.648 \sqrt{n} e^{-\sqrt{\epsilon} (2k - 1)},
+
+    applied to all probes independently.
+
+    References
+    ----------
+    [KW1992] Kuczynski, J and Wozniakowski, H. *Estimating the largest
+    eigenvalue by the power and Lanczos algorithms with a random start*.
+    SIAM Journal on Matrix Analysis and Applications, 13 (1992),
+    pp 1094--1122.
+    """
+    # Lazy imports to avoid circular imports
+    from odl.operator.pspace_ops import DiagonalOperator
+    from odl.phantom.noise import white_noise
+
+    if not op.is_linear:
+        raise ValueError('`op` {!r} is not linear'.format(op))
+
+    num_probes, num_probes_in = int(num_probes), num_probes
+    if num_probes <= 0:
+        raise ValueError('`num_probes` must be positive, got {}'
+                         ''.format(num_probes_in))
+    maxiter, maxiter_in = int(maxiter), maxiter
+    if maxiter <= 0:
+        raise ValueError('`maxiter` must be positive, got {}'
+                         ''.format(maxiter_in))
+    failure_prob = float(failure_prob)
+    if not 0 < failure_prob < 1:
+        raise ValueError('`failure_prob` must lie strictly between 0 and 1, '
+                         'got {}'.format(failure_prob))
+
+    batch_op = DiagonalOperator(op, num_probes, executor=executor)
+    batch_adj = batch_op.adjoint
+
+    alphas = [[] for _ in range(num_probes)]
+    betas = [[] for _ in range(num_probes)]
+    active = [True] * num_probes
+
+    # Relative size of new Krylov directions that are considered rounding
+    # noise, i.e., a breakdown of the iteration
+    dtype = getattr(op.domain, 'dtype', None)
+    if dtype is None or not np.issubdtype(dtype, np.inexact):
+        dtype = float
+    breakdown_tol = _LANCZOS_BREAKDOWN_FACTOR * np.finfo(dtype).eps
+
+    def normalize(vecs, norms):
+        """Normalize ``vecs`` of the active probes and store the norms."""
+        for i, vec in enumerate(vecs):
+            if not active[i]:
+                continue
+            vec_norm = vec.norm()
+            if not np.isfinite(vec_norm):
+                raise ValueError('reached nonfinite iterate {!r}'
+                                 ''.format(vec))
+            scale = max([0.0] + alphas[i] + betas[i])
+            if vec_norm == 0 or vec_norm <= breakdown_tol * scale:
+                # Invariant subspace reached, this probe is done
+                norms[i].append(0.0)
+                active[i] = False
+            else:
+                norms[i].append(vec_norm)
+                vec /= vec_norm
+
+    def calc_opnorm():
+        """Return the largest singular value of the bidiagonal matrices."""
+        opnorm = 0.0
+        for alpha, beta in zip(alphas, betas):
+            k = len(alpha)
+            bidiag = np.diag(alpha) + np.diag(beta[:k - 1], 1)
+            opnorm = max(opnorm, np.linalg.norm(bidiag, 2))
+        return opnorm
+
+    v = white_noise(batch_op.domain, seed=seed)
+    v_tmp = batch_op.domain.element()
+    u = batch_op.range.element()
+    u_tmp = batch_op.range.element()
+
+    for v_i in v:
+        v_i /= v_i.norm()
+    batch_op(v, out=u)
+    normalize(u, alphas)
+    opnorm = calc_opnorm()
+
+    for _ in range(maxiter - 1):
+        if not any(active):
+            break
+
+        # v <- (A^* u - alpha * v) / beta
+        batch_adj(u, out=v_tmp)
+        for i in range(num_probes):
+            if active[i]:
+                v_tmp[i].lincomb(1, v_tmp[i], -alphas[i][-1], v[i])
+        normalize(v_tmp, betas)
+        v, v_tmp = v_tmp, v
+
+        # u <- (A v - beta * u) / alpha
+        batch_op(v, out=u_tmp)
+        for i in range(num_probes):
+            if active[i]:
+                u_tmp[i].lincomb(1, u_tmp[i], -betas[i][-1], u[i])
+        u, u_tmp = u_tmp, u
+        normalize(u, alphas)
+
+        opnorm, opnorm_old = calc_opnorm(), opnorm
+        if abs(opnorm - opnorm_old) <= atol + rtol * opnorm:
+            break
+
+    if not return_bound:
+        return opnorm
+
+    if not all(active):
+        # The Krylov space of a random start became invariant, hence it
+        # contains the largest singular vector almost surely
+        return opnorm, opnorm
+
+    dim = _space_size(op.domain)
+    if dim is None:
+        return opnorm, float('inf')
+
+    num_iter = min(len(alpha) for alpha in alphas)
+    probe_failure_prob = failure_prob ** (1.0 / num_probes)
+    sqrt_eps = (np.log(1.648 * np.sqrt(dim) / probe_failure_prob) /
+                (2 * num_iter - 1))
+    if sqrt_eps >= 1:
+        return opnorm, float('inf')
+    else:
+        return opnorm, opnorm / np.sqrt(1 - sqrt_eps ** 2)
+
+
+def _space_size(space):
+    """Return the total number of entries of elements in ``space``.
+
+    ``None`` is returned if the size cannot be determined.
+    """
+    if isinstance(space, ProductSpace):
+        sizes = [_space_size(spc) for spc in space]
+        if any(size is None for size in sizes):
+            return None
+        return sum(sizes)
+
+    try:
+        return int(space.size)
+    except (AttributeError, TypeError):
+        return None
+
+
+# Maximum number of cached operator norm estimates
+OPNORM_CACHE_SIZE = 128
+
+_OPNORM_CACHE = OrderedDict()
+_OPNORM_CACHE_LOCK = threading.Lock()
+
+
+def clear_opnorm_cache():
+    """Remove all cached results of ``Operator.norm(estimate=True)``.
+
+    The cache is keyed by operator identity, hence it needs to be cleared
+    when an operator is modified in place.
+    """
+    with _OPNORM_CACHE_LOCK:
+        _OPNORM_CACHE.clear()
+
+
+def _estimate_opnorm(op, **kwargs):
+    """Return a cached estimate of the norm of ``op``.
+
+    Linear operators with adjoint are handled by `lanczos_opnorm`, other
+    operators and calls with ``xstart`` or ``callback`` arguments by
+    `power_method_opnorm`. Results are cached per operator and arguments
+    in a least-recently-used fashion, with at most ``OPNORM_CACHE_SIZE``
+    entries.
+    """
+    if 'xstart' in kwargs or 'callback' in kwargs:
+        use_lanczos = False
+    elif op.is_linear:
+        try:
+            op.adjoint
+        except NotImplementedError:
+            use_lanczos = False
+        else:
+            use_lanczos = True
+    else:
+        use_lanczos = False
+
+    key = (id(op), use_lanczos, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        key = None
+    if 'callback' in kwargs:
+        key = None
+
+    if key is not None:
+        with _OPNORM_CACHE_LOCK:
+            cached = _OPNORM_CACHE.get(key)
+            if cached is not None and cached[0]() is op:
+                # Mark as most recently used
+                del _OPNORM_CACHE[key]
+                _OPNORM_CACHE[key] = cached
+                return cached[1]
+
+    if use_lanczos:
+        result = lanczos_opnorm(op, **kwargs)
+    else:
+        result = power_method_opnorm(op, **kwargs)
+
+    if key is not None:
+        try:
+            op_ref = weakref.ref(op)
+        except TypeError:
+            return result
+        with _OPNORM_CACHE_LOCK:
+            _OPNORM_CACHE[key] = (op_ref, result)
+            while len(_OPNORM_CACHE) > OPNORM_CACHE_SIZE:
+                _OPNORM_CACHE.popitem(last=False)
+
+    return result
+
+
+def as_scipy_operator(op, executor=None):
     """Wrap ``op`` as a ``scipy.sparse.linalg.LinearOperator``.
 
     This is intended to be used with the scipy sparse linear solvers.
@@ -263,12 +736,18 @@ def as_scipy_operator(op):
     ----------
     op : `Operator`
         A linear operator that should be wrapped
+    executor : optional
+        Executor used to apply ``op`` or its adjoint to the columns of a
+        matrix concurrently in ``matmat`` and ``rmatmat``, see
+        `ProductSpaceOperator`.
 
     Returns
     -------
     ``scipy.sparse.linalg.LinearOperator`` : linear_op
         The wrapped operator, has attributes ``matvec`` which calls ``op``,
-        and ``rmatvec`` which calls ``op.adjoint``.
+        ``rmatvec`` which calls ``op.adjoint``, and ``matmat`` and
+        ``rmatmat`` which apply ``op`` and ``op.adjoint``, respectively,
+        to all columns of a matrix in one batch.
 
     Examples
     --------
@@ -281,14 +760,29 @@ def as_scipy_operator(op):
     >>> result
     array([ 0.,  1.,  0.])
 
+    Matrices are mapped column by column:
+
+    >>> scipy_op = as_scipy_operator(2 * op)
+    >>> scipy_op.matmat(np.eye(3, 2))
+    array([[ 2.,  0.],
+           [ 0.,  2.],
+           [ 0.,  0.]])
+    >>> scipy_op.rmatmat(np.eye(3, 2))
+    array([[ 2.,  0.],
+           [ 0.,  2.],
+           [ 0.,  0.]])
+
     Notes
     -----
     If the data representation of ``op``'s domain and range is of type
-    `NumpyFn` this incurs no significant overhead. If the space type is
-    ``CudaFn`` or some other nonlocal type, the overhead is significant.
+    `NumpyFn`, contiguous input arrays of the correct data type are
+    wrapped as space elements without copying, and the result is written
+    directly into the returned array. If the space type is ``CudaFn`` or
+    some other nonlocal type, the overhead is significant.
     """
     # Lazy import to improve `import odl` time
-    import scipy.sparse
+    import scipy.sparse.linalg
+    from odl.operator.tensor_ops import MatrixOperator
 
     if not op.is_linear:
         raise ValueError('`op` needs to be linear')
@@ -298,24 +792,121 @@ def as_scipy_operator(op):
         raise ValueError('dtypes of ``op.domain`` and ``op.range`` needs to '
                          'match')
 
-    def as_flat_array(arr):
-        if hasattr(arr, 'order'):
-            return arr.asarray().ravel(arr.order)
-        else:
-            return arr.asarray()
+    shape = (native(_space_size(op.range)), native(_space_size(op.domain)))
 
-    shape = (native(op.range.size), native(op.domain.size))
+    def apply(operator, v):
+        """Return ``operator(v)`` as flat array, ``v`` being flat."""
+        v = np.asarray(v).reshape(-1)
+        result = np.empty(_space_size(operator.range), dtype=dtype)
+        x = _as_element_view(operator.domain, v)
+        y = _as_element_view(operator.range, result)
+        operator(x, out=y)
+        if not _is_numpy_space(operator.range):
+            _copy_flat(y, result)
+        return result
 
     def matvec(v):
-        return as_flat_array(op(v))
+        return apply(op, v)
 
     def rmatvec(v):
-        return as_flat_array(op.adjoint(v))
+        return apply(op.adjoint, v)
+
+    # Batch operators per operator and number of columns
+    batch_ops = {}
+
+    def apply_batch(operator, mat):
+        """Return ``operator`` applied to the columns of ``mat``."""
+        if isinstance(operator, MatrixOperator):
+            return operator.matrix.dot(mat)
+
+        # Columns are stored as contiguous rows to allow wrapping them
+        num_cols = mat.shape[1]
+        mat_t = np.ascontiguousarray(mat.T)
+        result_t = np.empty((num_cols, _space_size(operator.range)),
+                            dtype=dtype)
+
+        batch_op = batch_ops.get((id(operator), num_cols))
+        if batch_op is None:
+            # Lazy import to avoid circular imports
+            from odl.operator.pspace_ops import DiagonalOperator
+            batch_op = DiagonalOperator(operator, num_cols,
+                                        executor=executor)
+            batch_ops[id(operator), num_cols] = batch_op
+
+        x = batch_op.domain.element(
+            [_as_element_view(operator.domain, row) for row in mat_t])
+        y = batch_op.range.element(
+            [_as_element_view(operator.range, row) for row in result_t])
+        batch_op(x, out=y)
+        if not _is_numpy_space(operator.range):
+            for y_i, row in zip(y, result_t):
+                _copy_flat(y_i, row)
+        return result_t.T
+
+    adjoints = []
+
+    def adjoint():
+        """Return ``op.adjoint``, created only once."""
+        if not adjoints:
+            adjoints.append(op.adjoint)
+        return adjoints[0]
+
+    def matmat(mat):
+        return apply_batch(op, mat)
+
+    def rmatmat(mat):
+        return apply_batch(adjoint(), mat)
+
+    try:
+        return scipy.sparse.linalg.LinearOperator(shape=shape,
+                                                  matvec=matvec,
+                                                  rmatvec=rmatvec,
+                                                  matmat=matmat,
+                                                  rmatmat=rmatmat,
+                                                  dtype=dtype)
+    except TypeError:
+        # SciPy before version 1.4 has no ``rmatmat`` hook
+        linear_op = scipy.sparse.linalg.LinearOperator(shape=shape,
+                                                       matvec=matvec,
+                                                       rmatvec=rmatvec,
+                                                       matmat=matmat,
+                                                       dtype=dtype)
+        linear_op.rmatmat = rmatmat
+        return linear_op
+
+
+def _is_numpy_space(space):
+    """Return ``True`` if elements of ``space`` can wrap numpy arrays."""
+    if isinstance(space, ProductSpace):
+        return all(_is_numpy_space(spc) for spc in space)
+    else:
+        dspace = getattr(space, 'dspace', space)
+        return isinstance(dspace, FnBase) and dspace.impl == 'numpy'
+
 
-    return scipy.sparse.linalg.LinearOperator(shape=shape,
-                                              matvec=matvec,
-                                              rmatvec=rmatvec,
-                                              dtype=dtype)
+def _as_element_view(space, arr):
+    """Return an element of ``space`` with the flat ``arr`` as data.
+
+    The array is wrapped without copying if ``space`` is numpy-based and
+    ``arr`` is contiguous with the data type of ``space``, otherwise it is
+    copied.
+    """
+    if isinstance(space, ProductSpace):
+        parts = []
+        idx = 0
+        for spc in space:
+            size = _space_size(spc)
+            parts.append(_as_element_view(spc, arr[idx:idx + size]))
+            idx += size
+        return space.element(parts)
+
+    dspace = getattr(space, 'dspace', space)
+    if (_is_numpy_space(space) and arr.dtype == space.dtype and
+            arr.flags.contiguous):
+        elem = dspace.element(arr)
+        return elem if dspace is space else space.element(elem)
+    else:
+        return space.element(arr)
 
 
 def as_scipy_functional(func, return_gradient=False):
@@ -18,6 +18,7 @@ from numbers import Integral
 from odl.operator.operator import Operator
 from odl.operator.default_ops import ZeroOperator
 from odl.space import ProductSpace
+from odl.util import default_buffer_pool, executor_map, temporary_element
 
 
 __all__ = ('ProductSpaceOperator',
@@ -25,6 +26,18 @@ __all__ = ('ProductSpaceOperator',
            'BroadcastOperator', 'ReductionOperator', 'DiagonalOperator')
 
 
+def _operator_array(operators):
+    """Return ``operators`` as 1d object array.
+
+    NumPy would unpack operators on product spaces since they support
+    indexing, hence the array is filled element by element.
+    """
+    arr = np.empty(len(operators), dtype=object)
+    for i, op in enumerate(operators):
+        arr[i] = op
+    return arr
+
+
 class ProductSpaceOperator(Operator):
 
     """A "matrix of operators" on product spaces.
@@ -91,7 +104,7 @@ class ProductSpaceOperator(Operator):
     DiagonalOperator : Case where the 'matrix' is diagonal.
     """
 
-    def __init__(self, operators, domain=None, range=None):
+    def __init__(self, operators, domain=None, range=None, executor=None):
         """Initialize a new instance.
 
         Parameters
@@ -106,6 +119,15 @@ class ProductSpaceOperator(Operator):
             Range of the operator. If not provided, it is tried to be
             inferred from the operators. This requires each **row**
             to contain at least one operator.
+        executor : optional
+            Object with a ``map(func, iterable)`` method, e.g., a
+            ``concurrent.futures.ThreadPoolExecutor`` or a
+            ``multiprocessing.pool.ThreadPool``, used to evaluate
+            independent blocks concurrently. Rows are evaluated in
+            parallel, and if there is only one row, its entries are.
+            Since the blocks work on shared memory, process-based
+            executors cannot be used.
+            ``None`` means sequential evaluation.
 
         Examples
         --------
@@ -214,32 +236,123 @@ class ProductSpaceOperator(Operator):
         linear = all(op.is_linear for op in self.ops.data)
 
         super().__init__(domain=domain, range=range, linear=linear)
+        self.__executor = executor
+
+        self.__plan, self.__duplicate_of = self._execution_plan()
+
+    def _execution_plan(self):
+        """Compile `ops` into a per-row execution plan.
+
+        Returns
+        -------
+        plan : list
+            Per row, a list of terms ``(op, cols)``, such that the row
+            is given by the sum of ``op(sum(x[col] for col in cols))``
+            over all terms. A linear operator appearing several times in
+            a row results in only one term, and zero operators are
+            skipped.
+        duplicate_of : list
+            Per row, the index of a previous row with identical terms,
+            or ``None``. Duplicate rows are copied instead of evaluated.
+        """
+        plan = [[] for _ in self.range]
+        for row, col, op in zip(self.ops.row, self.ops.col, self.ops.data):
+            if isinstance(op, ZeroOperator):
+                continue
+            terms = plan[row]
+            for k, (other_op, cols) in enumerate(terms):
+                if other_op is op and op.is_linear:
+                    terms[k] = (op, cols + (col,))
+                    break
+            else:
+                terms.append((op, (col,)))
+
+        duplicate_of = []
+        for row, terms in enumerate(plan):
+            duplicate_of.append(None)
+            if not terms:
+                continue
+            for prev_row in range(row):
+                prev_terms = plan[prev_row]
+                if (duplicate_of[prev_row] is None and
+                        len(prev_terms) == len(terms) and
+                        all(op1 is op2 and cols1 == cols2
+                            for (op1, cols1), (op2, cols2)
+                            in zip(prev_terms, terms)) and
+                        self.range[prev_row] == self.range[row]):
+                    duplicate_of[row] = prev_row
+                    break
+
+        return plan, duplicate_of
+
+    @property
+    def executor(self):
+        """Executor for concurrent evaluation of blocks, or ``None``."""
+        return self.__executor
 
     def _call(self, x, out=None):
         """Call the operators on the parts of ``x``."""
-        # TODO: add optimization in case an operator appears repeatedly in a
-        # row
         if out is None:
-            out = self.range.zero()
-            for i, j, op in zip(self.ops.row, self.ops.col, self.ops.data):
-                out[i] += op(x[j])
+            out = self.range.element()
+
+        rows = [i for i, dup in enumerate(self.__duplicate_of) if dup is None]
+        num_rows = sum(1 for i in rows if self.__plan[i])
+        if self.executor is not None and num_rows > 1:
+            executor_map(self.executor,
+                         lambda i: self._call_row(i, x, out[i],
+                                                  executor=None),
+                         rows)
         else:
-            has_evaluated_row = np.zeros(self.range.size, dtype=bool)
-            for i, j, op in zip(self.ops.row, self.ops.col, self.ops.data):
-                if not has_evaluated_row[i]:
-                    op(x[j], out=out[i])
-                else:
-                    # TODO: optimize
-                    out[i] += op(x[j])
+            for i in rows:
+                self._call_row(i, x, out[i], executor=self.executor)
 
-                has_evaluated_row[i] = True
-
-            for i, evaluated in enumerate(has_evaluated_row):
-                if not evaluated:
-                    out[i].set_zero()
+        for i, dup in enumerate(self.__duplicate_of):
+            if dup is not None:
+                out[i].assign(out[dup])
 
         return out
 
+    def _call_row(self, row, x, out, executor):
+        """Evaluate row ``row`` in ``x`` and write to ``out``."""
+        terms = self.__plan[row]
+        if not terms:
+            out.set_zero()
+        elif executor is None or len(terms) == 1:
+            self._call_term(terms[0], x, out)
+            if len(terms) > 1:
+                # One scratch element per row for the accumulation
+                with temporary_element(out.space) as tmp:
+                    for term in terms[1:]:
+                        self._call_term(term, x, tmp)
+                        out += tmp
+        else:
+            # Evaluate the terms concurrently into separate temporaries
+            pool = default_buffer_pool()
+            results = [out] + [pool.acquire(out.space) for _ in terms[1:]]
+            try:
+                executor_map(
+                    executor,
+                    lambda k: self._call_term(terms[k], x, results[k]),
+                    range(len(terms)))
+                for tmp in results[1:]:
+                    out += tmp
+            finally:
+                for tmp in results[1:]:
+                    pool.release(tmp)
+
+    @staticmethod
+    def _call_term(term, x, out):
+        """Evaluate ``op(sum(x[col] for col in cols))`` into ``out``."""
+        op, cols = term
+        if len(cols) == 1:
+            op(x[cols[0]], out=out)
+        else:
+            with temporary_element(op.domain) as arg:
+                arg.lincomb(1, x[cols[0]], 1, x[cols[1]])
+                for col in cols[2:]:
+                    arg += x[col]
+                op(arg, out=out)
+
     def derivative(self, x):
         """Derivative of the product space operator.
 
@@ -308,8 +421,10 @@ class ProductSpaceOperator(Operator):
                                                               self.ops.col)]
         indices = [self.ops.row, self.ops.col]
         shape = self.ops.shape
-        deriv_matrix = scipy.sparse.coo_matrix((deriv_ops, indices), shape)
-        return ProductSpaceOperator(deriv_matrix, self.domain, self.range)
+        deriv_matrix = scipy.sparse.coo_matrix(
+            (_operator_array(deriv_ops), indices), shape)
+        return ProductSpaceOperator(deriv_matrix, self.domain, self.range,
+                                    executor=self.executor)
 
     @property
     def adjoint(self):
@@ -354,8 +469,10 @@ class ProductSpaceOperator(Operator):
         adjoint_ops = [op.adjoint for op in self.ops.data]
         indices = [self.ops.col, self.ops.row]  # Swap col/row -> transpose
         shape = (self.ops.shape[1], self.ops.shape[0])
-        adj_matrix = scipy.sparse.coo_matrix((adjoint_ops, indices), shape)
-        return ProductSpaceOperator(adj_matrix, self.range, self.domain)
+        adj_matrix = scipy.sparse.coo_matrix(
+            (_operator_array(adjoint_ops), indices), shape)
+        return ProductSpaceOperator(adj_matrix, self.range, self.domain,
+                                    executor=self.executor)
 
     def __getitem__(self, index):
         """Get sub-operator by index.
@@ -650,7 +767,7 @@ class BroadcastOperator(Operator):
     ReductionOperator : Calculates sum of operator results.
     DiagonalOperator : Case where each operator should have its own argument.
     """
-    def __init__(self, *operators):
+    def __init__(self, *operators, **kwargs):
         """Initialize a new instance
 
         Parameters
@@ -660,6 +777,12 @@ class BroadcastOperator(Operator):
             Can also be given as ``operator, n`` with ``n`` integer,
             in which case ``operator`` is repeated ``n`` times.
 
+        Other Parameters
+        ----------------
+        executor : optional
+            Executor for concurrent evaluation of the operators, see
+            `ProductSpaceOperator`.
+
         Examples
         --------
         Initialize an operator:
@@ -692,8 +815,14 @@ class BroadcastOperator(Operator):
                 isinstance(operators[1], Integral)):
             operators = (operators[0],) * operators[1]
 
+        executor = kwargs.pop('executor', None)
+        if kwargs:
+            raise TypeError('got unexpected keyword arguments: {}'
+                            ''.format(kwargs))
+
         self.__operators = operators
-        self.__prod_op = ProductSpaceOperator([[op] for op in operators])
+        self.__prod_op = ProductSpaceOperator([[op] for op in operators],
+                                              executor=executor)
 
         super().__init__(self.prod_op.domain[0],
                          self.prod_op.range,
@@ -709,6 +838,11 @@ class BroadcastOperator(Operator):
         """Tuple of sub-operators that comprise ``self``."""
         return self.__operators
 
+    @property
+    def executor(self):
+        """Executor for concurrent evaluation, or ``None``."""
+        return self.prod_op.executor
+
     def __getitem__(self, index):
         """Return ``self(index)``."""
         return self.operators[index]
@@ -766,7 +900,8 @@ class BroadcastOperator(Operator):
         ])
         """
         return BroadcastOperator(*[op.derivative(x) for op in
-                                   self.operators])
+                                   self.operators],
+                                 executor=self.executor)
 
     @property
     def adjoint(self):
@@ -783,7 +918,8 @@ class BroadcastOperator(Operator):
         >>> op.adjoint([[1, 2, 3], [2, 3, 4]])
         rn(3).element([5.0, 8.0, 11.0])
         """
-        return ReductionOperator(*[op.adjoint for op in self.operators])
+        return ReductionOperator(*[op.adjoint for op in self.operators],
+                                 executor=self.executor)
 
     def __repr__(self):
         """Return ``repr(self)``.
@@ -820,7 +956,7 @@ class ReductionOperator(Operator):
     BroadcastOperator : Calls several operators with same argument.
     DiagonalOperator : Case where each operator should have its own argument.
     """
-    def __init__(self, *operators):
+    def __init__(self, *operators, **kwargs):
         """Initialize a new instance.
 
         Parameters
@@ -830,6 +966,12 @@ class ReductionOperator(Operator):
             Can also be given as ``operator, n`` with ``n`` integer,
             in which case ``operator`` is repeated ``n`` times.
 
+        Other Parameters
+        ----------------
+        executor : optional
+            Executor for concurrent evaluation of the operators, see
+            `ProductSpaceOperator`.
+
         Examples
         --------
         >>> I = odl.IdentityOperator(odl.rn(3))
@@ -868,8 +1010,13 @@ class ReductionOperator(Operator):
                 isinstance(operators[1], Integral)):
             operators = (operators[0],) * operators[1]
 
+        executor = kwargs.pop('executor', None)
+        if kwargs:
+            raise TypeError('got unexpected keyword arguments: {}'
+                            ''.format(kwargs))
+
         self.__operators = operators
-        self.__prod_op = ProductSpaceOperator([operators])
+        self.__prod_op = ProductSpaceOperator([operators], executor=executor)
 
         super().__init__(self.prod_op.domain,
                          self.prod_op.range[0],
@@ -885,6 +1032,11 @@ class ReductionOperator(Operator):
         """Tuple of sub-operators that comprise ``self``."""
         return self.__operators
 
+    @property
+    def executor(self):
+        """Executor for concurrent evaluation, or ``None``."""
+        return self.prod_op.executor
+
     def __getitem__(self, index):
         """Return an operator by index."""
         return self.operators[index]
@@ -950,7 +1102,8 @@ class ReductionOperator(Operator):
         rn(3).element([9.0, 14.0, 19.0])
         """
         return ReductionOperator(*[op.derivative(xi)
-                                   for op, xi in zip(self.operators, x)])
+                                   for op, xi in zip(self.operators, x)],
+                                 executor=self.executor)
 
     @property
     def adjoint(self):
@@ -970,7 +1123,8 @@ class ReductionOperator(Operator):
             [2.0, 4.0, 6.0]
         ])
         """
-        return BroadcastOperator(*[op.adjoint for op in self.operators])
+        return BroadcastOperator(*[op.adjoint for op in self.operators],
+                                 executor=self.executor)
 
     def __repr__(self):
         """Return ``repr(self)``.
@@ -1061,7 +1215,8 @@ class DiagonalOperator(ProductSpaceOperator):
 
         indices = [range(len(operators)), range(len(operators))]
         shape = (len(operators), len(operators))
-        op_matrix = scipy.sparse.coo_matrix((operators, indices), shape)
+        op_matrix = scipy.sparse.coo_matrix(
+            (_operator_array(operators), indices), shape)
 
         self.__operators = tuple(operators)
 
@@ -1118,7 +1273,8 @@ class DiagonalOperator(ProductSpaceOperator):
 
         derivs = [op.derivative(p) for op, p in zip(self.operators, point)]
         return DiagonalOperator(*derivs,
-                                domain=self.domain, range=self.range)
+                                domain=self.domain, range=self.range,
+                                executor=self.executor)
 
     @property
     def adjoint(self):
@@ -1147,7 +1303,8 @@ class DiagonalOperator(ProductSpaceOperator):
         """
         adjoints = [op.adjoint for op in self.operators]
         return DiagonalOperator(*adjoints,
-                                domain=self.range, range=self.domain)
+                                domain=self.range, range=self.domain,
+                                executor=self.executor)
 
     @property
     def inverse(self):
@@ -1176,7 +1333,8 @@ class DiagonalOperator(ProductSpaceOperator):
         """
         inverses = [op.inverse for op in self.operators]
         return DiagonalOperator(*inverses,
-                                domain=self.range, range=self.domain)
+                                domain=self.range, range=self.domain,
+                                executor=self.executor)
 
     def __repr__(self):
         """Return ``repr(self)``.
@@ -0,0 +1,546 @@
+﻿# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Simplification of operator expressions before evaluation."""
+
+# Imports for common Python 2/3 codebase
+from __future__ import print_function, division, absolute_import
+from numbers import Number
+
+import numpy as np
+
+from odl.operator.operator import (
+    Operator, OperatorComp, OperatorSum, OperatorVectorSum,
+    OperatorPointwiseProduct, OperatorLeftScalarMult, OperatorRightScalarMult,
+    OperatorLeftVectorMult, OperatorRightVectorMult, FunctionalLeftVectorMult,
+    _Workspace)
+from odl.operator.default_ops import (
+    ScalingOperator, IdentityOperator, MultiplyOperator, ZeroOperator)
+from odl.operator.pspace_ops import (
+    BroadcastOperator, ReductionOperator, DiagonalOperator,
+    ComponentProjection, ComponentProjectionAdjoint)
+from odl.operator.tensor_ops import MatrixOperator
+from odl.set import LinearSpace, LinearSpaceElement, Set
+
+
+__all__ = ('optimize',)
+
+
+# Operator expression types which are represented as a chain of factors
+_CHAIN_TYPES = (OperatorComp, OperatorLeftScalarMult, OperatorRightScalarMult,
+                OperatorLeftVectorMult, OperatorRightVectorMult)
+
+# Exceptions signalling that a rewrite rule does not apply
+_RULE_EXCEPTIONS = (NotImplementedError, TypeError, ValueError,
+                    ZeroDivisionError)
+
+
+def optimize(op):
+    """Return a simplified operator equivalent to ``op``.
+
+    The expression tree of ``op`` is rewritten such that it can be
+    evaluated with fewer passes over the data and fewer temporaries.
+    In particular, the following rules are applied:
+
+    - Scalar factors are folded into a single factor, and scaling and
+      identity operators are merged or removed.
+    - Consecutive `MultiplyOperator`'s are merged into one.
+    - Compositions of an operator with its inverse are removed if the
+      inverse is exact from both sides, i.e., for scaling operators with
+      nonzero factor, `DiagonalOperator`'s of such operators and discrete
+      Fourier transforms between complex spaces. Pseudo-inverses and
+      approximate inverses, e.g., of `ResizingOperator`, are kept.
+    - A `ComponentProjection` after a `BroadcastOperator` is replaced by
+      the selected operator(s), likewise a `ReductionOperator` after a
+      `ComponentProjectionAdjoint`.
+    - Adjacent `MatrixOperator`'s are collapsed into one if the product
+      matrix is not larger than the factors, and sums of
+      `MatrixOperator`'s are replaced by the operator of the summed
+      matrices.
+
+    Operators that are not expression types are left unchanged, and
+    the result has the same `Operator.domain` and `Operator.range`
+    as ``op``.
+
+    Parameters
+    ----------
+    op : `Operator`
+        Operator to simplify.
+
+    Returns
+    -------
+    optimized : `Operator`
+        Simplified operator. If no rule applies, ``op`` itself is
+        returned.
+
+    Examples
+    --------
+    Scalars are collected into one multiplication:
+
+    >>> r3 = odl.rn(3)
+    >>> ident = odl.IdentityOperator(r3)
+    >>> op = 2 * (ident * 3) * odl.ScalingOperator(r3, 0.5)
+    >>> optimize(op)
+    ScalingOperator(rn(3), 3.0)
+
+    Pointwise multiplications are merged:
+
+    >>> x = r3.element([1, 2, 3])
+    >>> op = odl.MultiplyOperator(x) * odl.MultiplyOperator(x)
+    >>> optimize(op)([1, 1, 1])
+    rn(3).element([1.0, 4.0, 9.0])
+
+    An operator composed with its exact inverse is removed:
+
+    >>> matrix = np.array([[1.0, 2.0], [0.0, 1.0]])
+    >>> A = odl.MatrixOperator(matrix)
+    >>> B = odl.ScalingOperator(A.domain, 2.0)
+    >>> optimize(A * B.inverse * B)
+    MatrixOperator(
+        [[ 1.,  2.],
+         [ 0.,  1.]]
+    )
+    """
+    if not isinstance(op, Operator):
+        raise TypeError('`op` {!r} is not an `Operator` instance'.format(op))
+
+    # Only the plain expression types are rewritten since subclasses,
+    # e.g. functional expressions, carry additional structure
+    op_type = type(op)
+    if op_type in _CHAIN_TYPES:
+        return _optimize_chain(op)
+    elif op_type is OperatorSum:
+        return _optimize_sum(op)
+    elif op_type is OperatorVectorSum:
+        new_op = optimize(op.operator)
+        if new_op is op.operator:
+            return op
+        return OperatorVectorSum(new_op, op.vector)
+    elif op_type is OperatorPointwiseProduct:
+        left, right = optimize(op.left), optimize(op.right)
+        if left is op.left and right is op.right:
+            return op
+        return OperatorPointwiseProduct(left, right)
+    elif op_type is FunctionalLeftVectorMult:
+        new_op = optimize(op.functional)
+        if new_op is op.functional:
+            return op
+        return FunctionalLeftVectorMult(new_op, op.vector)
+    elif op_type in (BroadcastOperator, ReductionOperator, DiagonalOperator):
+        operators = [optimize(sub_op) for sub_op in op.operators]
+        if all(new is old for new, old in zip(operators, op.operators)):
+            return op
+        if op_type is DiagonalOperator:
+            return DiagonalOperator(*operators, domain=op.domain,
+                                    range=op.range, executor=op.executor)
+        else:
+            return op_type(*operators, executor=op.executor)
+    else:
+        return op
+
+
+# --- Expression chains --- #
+
+
+def _flatten(op):
+    """Return the factors of the composition chain ``op``.
+
+    The factors are ordered from left to right, i.e., the last one is
+    applied first.
+    """
+    op_type = type(op)
+    if op_type is OperatorComp:
+        return _flatten(op.left) + _flatten(op.right)
+    elif op_type is OperatorLeftScalarMult:
+        return ([ScalingOperator(op.operator.range, op.scalar)] +
+                _flatten(op.operator))
+    elif op_type is OperatorRightScalarMult:
+        return (_flatten(op.operator) +
+                [ScalingOperator(op.operator.domain, op.scalar)])
+    elif op_type is OperatorLeftVectorMult:
+        space = op.operator.range
+        return ([MultiplyOperator(op.vector, domain=space, range=space)] +
+                _flatten(op.operator))
+    elif op_type is OperatorRightVectorMult:
+        space = op.operator.domain
+        return (_flatten(op.operator) +
+                [MultiplyOperator(op.vector, domain=space, range=space)])
+    else:
+        return [op]
+
+
+def _optimize_chain(op):
+    """Optimize a chain of composed operators."""
+    orig_factors = _flatten(op)
+
+    changed = False
+    factors = []
+    for factor in orig_factors:
+        new_factor = optimize(factor)
+        changed = changed or new_factor is not factor
+        factors.extend(_flatten(new_factor))
+
+    # Collect scaling factors that can be moved to the front
+    scalar = 1
+    remaining = []
+    for factor in factors:
+        if isinstance(factor, ScalingOperator):
+            if factor.scalar == 1:
+                changed = True
+                continue
+            elif _scalar_commutes(factor.scalar, remaining):
+                changed = changed or bool(remaining) or scalar != 1
+                scalar = scalar * factor.scalar
+                continue
+        remaining.append(factor)
+
+    # Merge adjacent factors until no rule applies anymore
+    factors = remaining
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(factors) - 1):
+            new_factors = _merge_pair(factors[i], factors[i + 1])
+            if new_factors is not None:
+                factors[i:i + 2] = [new for factor in new_factors
+                                    for new in _flatten(optimize(factor))]
+                merged = changed = True
+                break
+
+    if scalar != 1 and factors:
+        # Try to absorb the scalar into the outermost factor
+        try:
+            scaling = ScalingOperator(factors[0].range, scalar)
+        except _RULE_EXCEPTIONS:
+            new_factors = None
+        else:
+            new_factors = _merge_pair(scaling, factors[0])
+        if new_factors is not None:
+            factors[:1] = new_factors
+            scalar = 1
+            changed = True
+
+    if not changed:
+        return op
+
+    if not factors:
+        if scalar == 1:
+            return IdentityOperator(op.domain)
+        else:
+            return ScalingOperator(op.domain, scalar)
+
+    result = factors[-1]
+    for factor in reversed(factors[:-1]):
+        result = _compose(factor, result)
+
+    if scalar != 1:
+        result = OperatorLeftScalarMult(result, scalar)
+
+    return result
+
+
+def _scalar_commutes(scalar, factors):
+    """Return ``True`` if ``scalar`` can be moved in front of ``factors``."""
+    try:
+        return all(factor.is_linear and
+                   scalar in getattr(factor.domain, 'field', None) and
+                   scalar in getattr(factor.range, 'field', None)
+                   for factor in factors)
+    except _RULE_EXCEPTIONS:
+        return False
+
+
+def _is_pointwise_mult(op):
+    """Return ``True`` if ``op`` multiplies with an element of its domain."""
+    return (isinstance(op, MultiplyOperator) and
+            isinstance(op.domain, LinearSpace) and
+            op.domain == op.range and
+            op.multiplicand in op.domain)
+
+
+def _compose(left, right):
+    """Return the composition ``left * right`` as expression type."""
+    if isinstance(left, ScalingOperator):
+        return OperatorLeftScalarMult(right, left.scalar)
+    elif (_is_pointwise_mult(left) and
+          left.multiplicand in right.range):
+        return OperatorLeftVectorMult(right, left.multiplicand)
+    elif isinstance(right, ScalingOperator):
+        if left.is_linear and right.scalar in left.range.field:
+            return OperatorLeftScalarMult(left, right.scalar)
+        else:
+            return OperatorRightScalarMult(left, right.scalar)
+    elif _is_pointwise_mult(right):
+        return OperatorRightVectorMult(left, right.multiplicand)
+    else:
+        return OperatorComp(left, right)
+
+
+def _merge_pair(left, right):
+    """Return a list of factors replacing ``left * right``, or ``None``.
+
+    ``None`` signals that none of the rewrite rules apply.
+    """
+    try:
+        new_factors = _merge_pair_rules(left, right)
+    except _RULE_EXCEPTIONS:
+        return None
+
+    if new_factors is None:
+        return None
+    elif not new_factors:
+        return [] if right.domain == left.range else None
+    elif (len(new_factors) == 1 and
+          new_factors[0].domain == right.domain and
+          new_factors[0].range == left.range):
+        return new_factors
+    else:
+        return None
+
+
+def _merge_pair_rules(left, right):
+    """Apply the rewrite rules to the pair ``left * right``."""
+    # Scaling operators
+    if isinstance(left, ScalingOperator) and left.scalar == 1:
+        return [right]
+    elif isinstance(right, ScalingOperator) and right.scalar == 1:
+        return [left]
+
+    if isinstance(left, ScalingOperator):
+        if isinstance(right, ScalingOperator):
+            scalar = left.scalar * right.scalar
+            if scalar == 1:
+                return []
+            return [ScalingOperator(right.domain, scalar)]
+        elif _is_pointwise_mult(right):
+            if left.scalar not in right.domain.field:
+                return None
+            return [MultiplyOperator(left.scalar * right.multiplicand,
+                                     domain=right.domain, range=right.range)]
+        elif isinstance(right, MatrixOperator):
+            return [MatrixOperator(left.scalar * right.matrix,
+                                   domain=right.domain, range=right.range)]
+
+    if isinstance(right, ScalingOperator):
+        if _is_pointwise_mult(left) or isinstance(left, MatrixOperator):
+            return _merge_pair_rules(right, left)
+
+    # Pointwise multiplication
+    if _is_pointwise_mult(left) and _is_pointwise_mult(right):
+        return [MultiplyOperator(left.multiplicand * right.multiplicand,
+                                 domain=right.domain, range=right.range)]
+
+    # Matrix products
+    if isinstance(left, MatrixOperator) and isinstance(right, MatrixOperator):
+        matrix = _collapse_matrices(left.matrix, right.matrix)
+        if matrix is None:
+            return None
+        return [MatrixOperator(matrix, domain=right.domain, range=left.range)]
+
+    # Product space projections
+    if (isinstance(left, ComponentProjection) and
+            isinstance(right, BroadcastOperator)):
+        index = left.index
+        if isinstance(index, Number):
+            return [right.operators[index]]
+        else:
+            operators = _select(right.operators, index)
+            return [BroadcastOperator(*operators, executor=right.executor)]
+
+    if (isinstance(left, ReductionOperator) and
+            isinstance(right, ComponentProjectionAdjoint)):
+        index = right.index
+        if isinstance(index, Number):
+            selected = [index]
+        else:
+            selected = _select(range(len(left.operators)), index)
+        # Operators applied to zero components must vanish on them
+        if not all(op.is_linear for i, op in enumerate(left.operators)
+                   if i not in selected):
+            return None
+        if isinstance(index, Number):
+            return [left.operators[index]]
+        else:
+            return [ReductionOperator(*[left.operators[i]
+                                        for i in selected],
+                                      executor=left.executor)]
+
+    # Cancellation of inverses
+    if _is_inverse_pair(left, right):
+        return []
+
+    return None
+
+
+def _select(sequence, index):
+    """Return the entries of ``sequence`` selected by ``index``."""
+    sequence = list(sequence)
+    if isinstance(index, slice):
+        return sequence[index]
+    else:
+        return [sequence[i] for i in index]
+
+
+def _collapse_matrices(left, right):
+    """Return ``left.dot(right)`` if it is cheaper to apply, else ``None``.
+
+    The product is used only if its number of (stored) entries does not
+    exceed the sum of the numbers of entries of the two factors.
+    """
+    # Lazy import to improve `import odl` time
+    import scipy.sparse
+
+    if scipy.sparse.isspmatrix(left) or scipy.sparse.isspmatrix(right):
+        if not (scipy.sparse.isspmatrix(left) and
+                scipy.sparse.isspmatrix(right)):
+            return None
+        product = left.dot(right)
+        if product.nnz > left.nnz + right.nnz:
+            return None
+        return product
+    else:
+        m, k = left.shape
+        n = right.shape[1]
+        if m * n > (m + n) * k:
+            return None
+        return left.dot(right)
+
+
+def _is_inverse_pair(left, right):
+    """Return ``True`` if ``left * right`` is known to be the identity."""
+    if left.domain != right.range or left.range != right.domain:
+        return False
+
+    if (type(left) is DiagonalOperator and type(right) is DiagonalOperator and
+            len(left.operators) == len(right.operators)):
+        return all(_is_inverse_pair(left_op, right_op)
+                   for left_op, right_op in zip(left.operators,
+                                                right.operators))
+
+    for op, other in ((left, right), (right, left)):
+        if not _has_exact_inverse(op):
+            continue
+        try:
+            inverse = op.inverse
+        except _RULE_EXCEPTIONS:
+            continue
+        if _same_operator(inverse, other):
+            return True
+
+    return False
+
+
+def _has_exact_inverse(op):
+    """Return ``True`` if ``op.inverse`` is a two-sided inverse of ``op``.
+
+    Many operators only implement pseudo-inverses or approximate inverses,
+    hence this is decided from a list of known operators. Matrix inverses
+    are computed numerically and are not considered exact.
+    """
+    # Lazy import to avoid circular imports
+    from odl.trafos.fourier import (
+        DiscreteFourierTransform, DiscreteFourierTransformInverse)
+
+    if isinstance(op, ScalingOperator):
+        return op.scalar != 0
+    elif isinstance(op, (DiscreteFourierTransform,
+                         DiscreteFourierTransformInverse)):
+        # Transforms of real data only have a one-sided inverse
+        return op.domain.is_cn and op.range.is_cn
+    else:
+        return False
+
+
+def _same_operator(op1, op2):
+    """Return ``True`` if ``op1`` and ``op2`` are equal by construction.
+
+    This is a conservative check: the operators must be of the same
+    type and all their attributes must match.
+    """
+    if op1 is op2:
+        return True
+    if type(op1) is not type(op2):
+        return False
+    if op1.domain != op2.domain or op1.range != op2.range:
+        return False
+
+    try:
+        attrs1, attrs2 = vars(op1), vars(op2)
+    except TypeError:
+        return False
+    if set(attrs1) != set(attrs2):
+        return False
+    return all(_same_value(attrs1[key], attrs2[key]) for key in attrs1)
+
+
+def _same_value(val1, val2):
+    """Return ``True`` if two operator attributes are equal."""
+    if val1 is val2:
+        return True
+    elif isinstance(val1, Operator):
+        return isinstance(val2, Operator) and _same_operator(val1, val2)
+    elif isinstance(val1, _Workspace):
+        # Temporaries do not influence the result
+        return isinstance(val2, _Workspace) and val1.space == val2.space
+    elif isinstance(val1, np.ndarray) or isinstance(val2, np.ndarray):
+        return (type(val1) is type(val2) and
+                val1.shape == val2.shape and
+                val1.dtype == val2.dtype and
+                np.array_equal(val1, val2))
+    elif isinstance(val1, (tuple, list)):
+        return (type(val1) is type(val2) and
+                len(val1) == len(val2) and
+                all(_same_value(v1, v2) for v1, v2 in zip(val1, val2)))
+    elif isinstance(val1, (Number, str, np.generic, Set,
+                           LinearSpaceElement)):
+        return type(val1) is type(val2) and bool(val1 == val2)
+    else:
+        return False
+
+
+# --- Sums --- #
+
+
+def _optimize_sum(op):
+    """Optimize a sum of two operators."""
+    left, right = optimize(op.left), optimize(op.right)
+
+    if isinstance(left, ZeroOperator) and left.range == right.range:
+        return right
+    elif isinstance(right, ZeroOperator) and left.range == right.range:
+        return left
+    elif (isinstance(left, ScalingOperator) and
+          isinstance(right, ScalingOperator)):
+        scalar = left.scalar + right.scalar
+        if scalar == 1:
+            return IdentityOperator(op.domain)
+        else:
+            return ScalingOperator(op.domain, scalar)
+    elif (isinstance(left, MatrixOperator) and
+          isinstance(right, MatrixOperator)):
+        # Lazy import to improve `import odl` time
+        import scipy.sparse
+
+        matrix = left.matrix + right.matrix
+        if not scipy.sparse.isspmatrix(matrix):
+            matrix = np.asarray(matrix)
+        try:
+            return MatrixOperator(matrix, domain=op.domain, range=op.range)
+        except _RULE_EXCEPTIONS:
+            pass
+
+    if left is op.left and right is op.right:
+        return op
+    else:
+        return OperatorSum(left, right)
+
+
+if __name__ == '__main__':
+    # pylint: disable=wrong-import-position
+    from odl.util.testutils import run_doctests
+    run_doctests()
@@ -25,6 +25,12 @@ __all__ = ('PointwiseNorm', 'PointwiseInner', 'PointwiseSum', 'MatrixOperator')
 
 _SUPPORTED_DIFF_METHODS = ('central', 'forward', 'backward')
 
+# Number of points processed at once by the vectorized kernels of the
+# point-wise operators. The blocks of all components are reduced in one
+# NumPy call, and distributed over threads if multi-threading is enabled
+# via ``odl.space.npy_ntuples.NUM_THREADS``.
+POINTWISE_BLOCK_SIZE = 2 ** 14
+
 
 class PointwiseTensorFieldOperator(Operator):
 
@@ -220,7 +226,12 @@ class PointwiseNorm(PointwiseTensorFieldOperator):
 
     def _call(self, f, out):
         """Implement ``self(f, out)``."""
-        if self.exponent == 1.0:
+        arrs = _real_numpy_data(f)
+        out_arr = _real_numpy_data([out])
+        if arrs is not None and out_arr is not None:
+            weights = self.weights if self.is_weighted else None
+            _pointwise_norm_impl(arrs, weights, self.exponent, out_arr[0])
+        elif self.exponent == 1.0:
             self._call_vecfield_1(f, out)
         elif self.exponent == float('inf'):
             self._call_vecfield_inf(f, out)
@@ -500,6 +511,15 @@ class PointwiseInner(PointwiseInnerBase):
 
     def _call(self, vf, out):
         """Implement ``self(vf, out)``."""
+        arrs = _real_numpy_data(vf)
+        vecfield_arrs = _real_numpy_data(self.vecfield)
+        out_arr = _real_numpy_data([out])
+        if (arrs is not None and vecfield_arrs is not None and
+                out_arr is not None):
+            weights = self.weights if self.is_weighted else None
+            _pointwise_inner_impl(arrs, vecfield_arrs, weights, out_arr[0])
+            return
+
         if self.domain.field == ComplexNumbers():
             vf[0].multiply(self._vecfield[0].conj(), out=out)
         else:
@@ -900,6 +920,170 @@ class MatrixOperator(Operator):
         return repr(self)
 
 
+def _real_numpy_data(elems):
+    """Return the flat data arrays of ``elems``, or ``None``.
+
+    ``None`` is returned unless all elements are stored in NumPy arrays
+    of the same real floating point data type.
+    """
+    arrs = []
+    for elem in elems:
+        ntuple = getattr(elem, 'ntuple', elem)
+        data = getattr(ntuple, 'data', None)
+        if (getattr(ntuple.space, 'impl', None) != 'numpy' or
+                not isinstance(data, np.ndarray) or data.ndim != 1 or
+                data.dtype.kind != 'f'):
+            return None
+        arrs.append(data)
+
+    if any(arr.dtype != arrs[0].dtype for arr in arrs):
+        return None
+    return arrs
+
+
+def _stacked_view(arrs):
+    """Return ``arrs`` as one 2D array without copying, or ``None``.
+
+    This is possible if the 1D arrays are contiguous and stored one after
+    the other, e.g., if they are views of the rows of a 2D array.
+    """
+    size = arrs[0].size
+    itemsize = arrs[0].itemsize
+    start = arrs[0].__array_interface__['data'][0]
+    for i, arr in enumerate(arrs):
+        if (not arr.flags.c_contiguous or arr.size != size or
+                arr.__array_interface__['data'][0] !=
+                start + i * size * itemsize):
+            return None
+
+    # All rows lie in memory that belongs to the same buffer
+    return np.lib.stride_tricks.as_strided(
+        arrs[0], shape=(len(arrs), size), strides=(size * itemsize, itemsize))
+
+
+def _map_pointwise_blocks(func, size):
+    """Apply ``func`` to blocks of ``range(size)``, possibly in threads."""
+    # Lazy import to avoid circular imports
+    from odl.space import npy_ntuples
+
+    slices = [slice(start, min(start + POINTWISE_BLOCK_SIZE, size))
+              for start in range(0, size, POINTWISE_BLOCK_SIZE)]
+    if npy_ntuples._use_threads(size):
+        npy_ntuples._map_blocks(func, slices)
+    else:
+        for slc in slices:
+            func(slc)
+
+
+def _pointwise_norm_impl(arrs, weights, exponent, out):
+    """Compute the point-wise norm of the vector field ``arrs``.
+
+    Parameters
+    ----------
+    arrs : sequence of `numpy.ndarray`
+        Flat real arrays of the vector field components.
+    weights : `numpy.ndarray` or None
+        Weights of the components, ``None`` for no weighting.
+    exponent : float
+        Exponent of the norm, ``1 <= exponent <= inf``.
+    out : `numpy.ndarray`
+        Flat array to which the result is written. It may be the same
+        as the first component.
+    """
+    # Components stored as one 2D array are reduced in a single call
+    stacked = None
+    if exponent == 2.0 and not np.may_share_memory(out, arrs[0]):
+        stacked = _stacked_view(arrs)
+    if weights is not None:
+        weights = weights.astype(out.dtype)
+
+    def norm_block(slc):
+        out_blk = out[slc]
+        if stacked is not None:
+            block = stacked[:, slc]
+            if weights is None:
+                np.einsum('ij,ij->j', block, block, out=out_blk)
+            else:
+                np.einsum('i,ij,ij->j', weights, block, block, out=out_blk)
+            np.sqrt(out_blk, out=out_blk)
+            return
+
+        # Otherwise, accumulate over the components block by block, such
+        # that the temporary stays in cache
+        tmp = np.empty_like(out_blk)
+        for i, arr in enumerate(arrs):
+            arr_blk = arr[slc]
+            res = out_blk if i == 0 else tmp
+            if exponent == 2.0:
+                np.multiply(arr_blk, arr_blk, out=res)
+            else:
+                np.abs(arr_blk, out=res)
+                if exponent not in (1.0, float('inf')):
+                    np.power(res, exponent, out=res)
+            if weights is not None:
+                res *= weights[i]
+
+            if i == 0:
+                continue
+            elif exponent == float('inf'):
+                np.maximum(out_blk, tmp, out=out_blk)
+            else:
+                out_blk += tmp
+
+        if exponent == 2.0:
+            np.sqrt(out_blk, out=out_blk)
+        elif exponent not in (1.0, float('inf')):
+            np.power(out_blk, 1 / exponent, out=out_blk)
+
+    _map_pointwise_blocks(norm_block, out.size)
+
+
+def _pointwise_inner_impl(arrs, vecfield_arrs, weights, out):
+    """Compute the point-wise inner product of ``arrs`` and ``vecfield_arrs``.
+
+    Parameters
+    ----------
+    arrs, vecfield_arrs : sequence of `numpy.ndarray`
+        Flat real arrays of the vector field components.
+    weights : `numpy.ndarray` or None
+        Weights of the components, ``None`` for no weighting.
+    out : `numpy.ndarray`
+        Flat array to which the result is written. It may be the same
+        as the first component of one of the vector fields.
+    """
+    # Components stored as one 2D array are reduced in a single call
+    stacked = vecfield_stacked = None
+    if not (np.may_share_memory(out, arrs[0]) or
+            np.may_share_memory(out, vecfield_arrs[0])):
+        stacked = _stacked_view(arrs)
+        vecfield_stacked = _stacked_view(vecfield_arrs)
+    if weights is not None:
+        weights = weights.astype(out.dtype)
+
+    def inner_block(slc):
+        out_blk = out[slc]
+        if stacked is not None and vecfield_stacked is not None:
+            block = stacked[:, slc]
+            vf_block = vecfield_stacked[:, slc]
+            if weights is None:
+                np.einsum('ij,ij->j', block, vf_block, out=out_blk)
+            else:
+                np.einsum('i,ij,ij->j', weights, block, vf_block,
+                          out=out_blk)
+            return
+
+        tmp = np.empty_like(out_blk)
+        for i, (arr, vf_arr) in enumerate(zip(arrs, vecfield_arrs)):
+            res = out_blk if i == 0 else tmp
+            np.multiply(arr[slc], vf_arr[slc], out=res)
+            if weights is not None:
+                res *= weights[i]
+            if i > 0:
+                out_blk += tmp
+
+    _map_pointwise_blocks(inner_block, out.size)
+
+
 if __name__ == '__main__':
     # pylint: disable=wrong-import-position
     from odl.util.testutils import run_doctests
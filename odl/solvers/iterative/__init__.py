@@ -17,3 +17,6 @@ __all__ += iterative.__all__
 
 from .statistical import *
 __all__ += statistical.__all__
+
+from .preconditioners import *
+__all__ += preconditioners.__all__
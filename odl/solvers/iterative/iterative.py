@@ -12,18 +12,45 @@
 from __future__ import print_function, division, absolute_import
 
 import numpy as np
-from odl.operator import IdentityOperator, OperatorComp, OperatorSum
-from odl.util import normalized_scalar_param_list
+from odl.operator import (
+    DiagonalOperator, IdentityOperator, OperatorComp, OperatorSum)
+from odl.solvers.util import SolverInfo
+from odl.space import ProductSpace
+from odl.space.weighting import ConstWeighting
+from odl.util import executor_map, normalized_scalar_param_list
 
 
 __all__ = ('landweber', 'conjugate_gradient', 'conjugate_gradient_normal',
-           'gauss_newton', 'kaczmarz')
+           'block_conjugate_gradient', 'block_conjugate_gradient_normal',
+           'gauss_newton', 'kaczmarz', 'block_kaczmarz')
 
 
 # TODO: update all docs
 
 
-def landweber(op, x, rhs, niter, omega=1, projection=None, callback=None):
+def _real_inner(x1, x2):
+    """Return the real part of ``x1.inner(x2)``."""
+    return float(np.real(x1.inner(x2)))
+
+
+def _landweber_preconditioners(op, preconditioner):
+    """Return the domain and range preconditioners for `landweber`."""
+    if preconditioner is None:
+        return None, None
+    elif (preconditioner.domain == op.domain and
+            preconditioner.range == op.domain):
+        return preconditioner, None
+    elif (preconditioner.domain == op.range and
+            preconditioner.range == op.range):
+        return None, preconditioner
+    else:
+        raise ValueError('`preconditioner` {!r} must map either the domain '
+                         'or the range of `op` {!r} to itself'
+                         ''.format(preconditioner, op))
+
+
+def landweber(op, x, rhs, niter, omega=1, projection=None, callback=None,
+              tol=None, stopping_rule=None, preconditioner=None):
     """Optimized implementation of Landweber's method.
 
     Solves the inverse problem::
@@ -51,6 +78,26 @@ def landweber(op, x, rhs, niter, omega=1, projection=None, callback=None):
         argument and modify it in-place.
     callback : callable, optional
         Object executing code per iteration, e.g. plotting each iterate.
+    tol : non-negative float, optional
+        Stop as soon as the residual ``omega * ||A'(x)^* (A(x) - rhs)||``,
+        i.e., the norm of the (preconditioned) step, is at most ``tol``.
+    stopping_rule : callable, optional
+        Function called as ``stopping_rule(info)`` with the `SolverInfo`
+        of the run after each iteration. The iteration stops if it
+        returns ``True``.
+    preconditioner : linear `Operator`, optional
+        Positive definite operator ``M`` applied in each step. If it maps
+        ``op.domain`` to itself, the step is
+        ``-omega * M(A'(x)^* (A(x) - rhs))``, otherwise it must map
+        ``op.range`` to itself, and the step is
+        ``-omega * A'(x)^* M(A(x) - rhs)``. Examples are
+        `jacobi_preconditioner` and the FBP filter
+        `odl.tomo.fbp_filter_op` as data space preconditioner.
+
+    Returns
+    -------
+    info : `SolverInfo`
+        Number of iterations, residuals and timings of the run.
 
     Notes
     -----
@@ -99,14 +146,28 @@ def landweber(op, x, rhs, niter, omega=1, projection=None, callback=None):
         raise TypeError('`x` {!r} is not in the domain of `op` {!r}'
                         ''.format(x, op.domain))
 
+    precon_dom, precon_ran = _landweber_preconditioners(op, preconditioner)
+
     # Reusable temporaries
     tmp_ran = op.range.element()
     tmp_dom = op.domain.element()
+    if precon_ran is not None:
+        precon_tmp_ran = op.range.element()
+    if precon_dom is not None:
+        precon_tmp_dom = op.domain.element()
 
+    info = SolverInfo(tol, stopping_rule)
     for _ in range(niter):
         op(x, out=tmp_ran)
         tmp_ran -= rhs
-        op.derivative(x).adjoint(tmp_ran, out=tmp_dom)
+        if precon_ran is not None:
+            precon_ran(tmp_ran, out=precon_tmp_ran)
+            op.derivative(x).adjoint(precon_tmp_ran, out=tmp_dom)
+        else:
+            op.derivative(x).adjoint(tmp_ran, out=tmp_dom)
+        if precon_dom is not None:
+            precon_dom(tmp_dom, out=precon_tmp_dom)
+            tmp_dom, precon_tmp_dom = precon_tmp_dom, tmp_dom
         x.lincomb(1, x, -omega, tmp_dom)
 
         if projection is not None:
@@ -115,8 +176,15 @@ def landweber(op, x, rhs, niter, omega=1, projection=None, callback=None):
         if callback is not None:
             callback(x)
 
+        residual = abs(omega) * tmp_dom.norm() if info.monitoring else None
+        if info.update(residual):
+            break
+
+    return info
+
 
-def conjugate_gradient(op, x, rhs, niter, callback=None):
+def conjugate_gradient(op, x, rhs, niter, callback=None, tol=None,
+                       stopping_rule=None, preconditioner=None):
     """Optimized implementation of CG for self-adjoint operators.
 
     This method solves the inverse problem (of the first kind)::
@@ -148,6 +216,24 @@ def conjugate_gradient(op, x, rhs, niter, callback=None):
         Number of iterations.
     callback : callable, optional
         Object executing code per iteration, e.g. plotting each iterate.
+    tol : non-negative float, optional
+        Stop as soon as the residual ``||rhs - A(x)||`` is at most ``tol``.
+    stopping_rule : callable, optional
+        Function called as ``stopping_rule(info)`` with the `SolverInfo`
+        of the run after each iteration. The iteration stops if it
+        returns ``True``.
+    preconditioner : linear `Operator`, optional
+        Self-adjoint and positive definite operator ``M`` on
+        ``op.domain`` approximating the inverse of ``op``, e.g., from
+        `jacobi_preconditioner` or `circulant_preconditioner` with
+        ``normal=False``. The latter is only valid for positive definite
+        ``op`` whose circulant approximation is positive definite as well.
+        The preconditioned CG method is used in this case.
+
+    Returns
+    -------
+    info : `SolverInfo`
+        Number of iterations, residuals and timings of the run.
 
     See Also
     --------
@@ -165,13 +251,21 @@ def conjugate_gradient(op, x, rhs, niter, callback=None):
 
     r = op(x)
     r.lincomb(1, rhs, -1, r)       # r = rhs - A x
-    p = r.copy()
     d = op.domain.element()  # Extra storage for storing A x
 
-    sqnorm_r_old = r.norm() ** 2  # Only recalculate norm after update
+    info = SolverInfo(tol, stopping_rule)
+    if r.norm() == 0:  # Return if no step forward
+        info.converged = True
+        return info
 
-    if sqnorm_r_old == 0:  # Return if no step forward
-        return
+    # Only recalculate inner products after update
+    if preconditioner is None:
+        z = r
+        inner_r_z_old = r.norm() ** 2
+    else:
+        z = preconditioner(r)      # z = M r
+        inner_r_z_old = _real_inner(r, z)
+    p = z.copy()
 
     for _ in range(niter):
         op(p, out=d)  # d = A p
@@ -179,25 +273,37 @@ def conjugate_gradient(op, x, rhs, niter, callback=None):
         inner_p_d = p.inner(d)
 
         if inner_p_d == 0.0:  # Return if step is 0
-            return
+            return info
 
-        alpha = sqnorm_r_old / inner_p_d
+        alpha = inner_r_z_old / inner_p_d
 
         x.lincomb(1, x, alpha, p)            # x = x + alpha*p
         r.lincomb(1, r, -alpha, d)           # r = r - alpha*d
 
-        sqnorm_r_new = r.norm() ** 2
+        if preconditioner is None:
+            inner_r_z_new = r.norm() ** 2
+            residual = np.sqrt(inner_r_z_new)
+        else:
+            preconditioner(r, out=z)         # z = M r
+            inner_r_z_new = _real_inner(r, z)
+            residual = r.norm() if info.monitoring else None
 
-        beta = sqnorm_r_new / sqnorm_r_old
-        sqnorm_r_old = sqnorm_r_new
+        beta = inner_r_z_new / inner_r_z_old
+        inner_r_z_old = inner_r_z_new
 
-        p.lincomb(1, r, beta, p)                       # p = s + b * p
+        p.lincomb(1, z, beta, p)                       # p = z + b * p
 
         if callback is not None:
             callback(x)
 
+        if info.update(residual):
+            break
 
-def conjugate_gradient_normal(op, x, rhs, niter=1, callback=None):
+    return info
+
+
+def conjugate_gradient_normal(op, x, rhs, niter=1, callback=None, tol=None,
+                              stopping_rule=None, preconditioner=None):
     """Optimized implementation of CG for the normal equation.
 
     This method solves the inverse problem (of the first kind) ::
@@ -233,6 +339,23 @@ Conjugate_gradient_on_the_normal_equations>`_.
         Number of iterations.
     callback : callable, optional
         Object executing code per iteration, e.g. plotting each iterate.
+    tol : non-negative float, optional
+        Stop as soon as the residual ``||A^*(rhs - A(x))||`` of the normal
+        equation is at most ``tol``.
+    stopping_rule : callable, optional
+        Function called as ``stopping_rule(info)`` with the `SolverInfo`
+        of the run after each iteration. The iteration stops if it
+        returns ``True``.
+    preconditioner : linear `Operator`, optional
+        Self-adjoint and positive definite operator ``M`` on
+        ``op.domain`` approximating the inverse of ``A^* A``, e.g., from
+        `jacobi_preconditioner` or `circulant_preconditioner`. The normal
+        equation is then solved with the preconditioned CG method.
+
+    Returns
+    -------
+    info : `SolverInfo`
+        Number of iterations, residuals and timings of the run.
 
     See Also
     --------
@@ -248,31 +371,375 @@ Conjugate_gradient_on_the_normal_equations>`_.
 
     d = op(x)
     d.lincomb(1, rhs, -1, d)               # d = rhs - A x
-    p = op.derivative(x).adjoint(d)
-    s = p.copy()
+    s = op.derivative(x).adjoint(d)
+    # Only recalculate inner products after update
+    if preconditioner is None:
+        z = s
+        inner_s_z_old = s.norm() ** 2
+    else:
+        z = preconditioner(s)              # z = M s
+        inner_s_z_old = _real_inner(s, z)
+    p = z.copy()
     q = op.range.element()
-    sqnorm_s_old = s.norm() ** 2  # Only recalculate norm after update
 
+    info = SolverInfo(tol, stopping_rule)
     for _ in range(niter):
         op(p, out=q)                       # q = A p
         sqnorm_q = q.norm() ** 2
         if sqnorm_q == 0.0:  # Return if residual is 0
-            return
+            return info
 
-        a = sqnorm_s_old / sqnorm_q
+        a = inner_s_z_old / sqnorm_q
         x.lincomb(1, x, a, p)               # x = x + a*p
         d.lincomb(1, d, -a, q)              # d = d - a*Ap
         op.derivative(p).adjoint(d, out=s)  # s = A^T d
 
-        sqnorm_s_new = s.norm() ** 2
-        b = sqnorm_s_new / sqnorm_s_old
-        sqnorm_s_old = sqnorm_s_new
+        if preconditioner is None:
+            inner_s_z_new = s.norm() ** 2
+            residual = np.sqrt(inner_s_z_new)
+        else:
+            preconditioner(s, out=z)        # z = M s
+            inner_s_z_new = _real_inner(s, z)
+            residual = s.norm() if info.monitoring else None
+
+        b = inner_s_z_new / inner_s_z_old
+        inner_s_z_old = inner_s_z_new
+
+        p.lincomb(1, z, b, p)               # p = z + b * p
+
+        if callback is not None:
+            callback(x)
+
+        if info.update(residual):
+            break
+
+    return info
+
+
+def _block_data(elems):
+    """Return the flat NumPy data arrays of ``elems``, or ``None``."""
+    arrs = []
+    for elem in elems:
+        ntuple = getattr(elem, 'ntuple', elem)
+        data = getattr(ntuple, 'data', None)
+        if (getattr(ntuple.space, 'impl', None) != 'numpy' or
+                not isinstance(data, np.ndarray) or data.ndim != 1):
+            return None
+        arrs.append(data)
+    return arrs
+
+
+def _block_weight(space):
+    """Return the constant inner product weight of ``space``, or ``None``.
+
+    If a weight is returned, the inner product of ``space`` is the
+    weighted dot product of the flat data arrays.
+    """
+    dspace = getattr(space, 'dspace', space)
+    weighting = getattr(dspace, 'weighting', None)
+    if (getattr(dspace, 'impl', None) == 'numpy' and
+            isinstance(weighting, ConstWeighting) and
+            weighting.exponent == 2.0):
+        return weighting.const
+    else:
+        return None
+
+
+def _block_gram(xs, ys, weight):
+    """Return the matrix ``G[i, j] = ys[j].inner(xs[i])``.
+
+    In matrix notation with the elements as columns, this is
+    ``X^H Y``. For NumPy-based spaces with constant weighting, it is
+    computed with a single matrix product.
+    """
+    if weight is not None:
+        xarrs = _block_data(xs)
+        yarrs = _block_data(ys)
+        if xarrs is not None and yarrs is not None:
+            return weight * np.dot(np.conj(np.stack(xarrs)),
+                                   np.stack(yarrs).T)
+
+    return np.array([[y.inner(x) for y in ys] for x in xs])
+
+
+def _block_update(outs, a, xs, coeffs, weight):
+    """Compute ``outs = a * outs + xs * coeffs`` in-place.
+
+    In matrix notation with the elements as columns, ``coeffs`` has
+    shape ``(len(xs), len(outs))``. ``outs`` must not share elements
+    with ``xs``.
+    """
+    if weight is not None:
+        xarrs = _block_data(xs)
+        oarrs = _block_data(outs)
+        if xarrs is not None and oarrs is not None:
+            upd = np.dot(coeffs.T, np.stack(xarrs))
+            for oarr, uarr in zip(oarrs, upd):
+                if a == 0:
+                    oarr[:] = uarr
+                else:
+                    if a != 1:
+                        oarr *= a
+                    oarr += uarr
+            return
+
+    for j, out in enumerate(outs):
+        if a == 0:
+            out.lincomb(coeffs[0, j], xs[0])
+        else:
+            out.lincomb(a, out, coeffs[0, j], xs[0])
+        for i in range(1, len(xs)):
+            out.lincomb(1, out, coeffs[i, j], xs[i])
+
+
+def _block_orthonormalize(zs, out, weight, rtol=1e-12):
+    """Write an orthonormal basis of ``span(zs)`` to ``out``.
 
-        p.lincomb(1, s, b, p)               # p = s + b * p
+    Directions with relative singular values below ``sqrt(rtol)`` are
+    dropped, and the number of basis elements written to the first
+    entries of ``out`` is returned.
+    """
+    gram = _block_gram(zs, zs, weight)
+    eigvals, eigvecs = np.linalg.eigh(gram)
+    if eigvals[-1] <= 0:
+        return 0
+    keep = eigvals > rtol * eigvals[-1]
+    coeffs = eigvecs[:, keep] / np.sqrt(eigvals[keep])
+    rank = coeffs.shape[1]
+    _block_update(out[:rank], 0, zs, coeffs, weight)
+    return rank
+
+
+def block_conjugate_gradient(op, x, rhs, niter, callback=None, tol=None,
+                             stopping_rule=None, executor=None):
+    """Block conjugate gradient method for several right-hand sides.
+
+    This method solves the inverse problems ::
+
+        A(x[j]) = rhs[j],  j = 0, ..., k - 1
+
+    for a linear and self-adjoint `Operator` ``A`` simultaneously. In
+    each iteration, ``A`` is applied to a block of search directions
+    in one batched call, and the directions are chosen from the joint
+    Krylov space of all residuals. This typically needs considerably
+    fewer iterations than solving the problems one by one with
+    `conjugate_gradient`.
+
+    Parameters
+    ----------
+    op : linear `Operator`
+        Operator in the inverse problems. It must be linear and
+        self-adjoint. This implies in particular that its domain and
+        range are equal.
+    x : `ProductSpaceElement`
+        Element of the power space ``ProductSpace(op.domain, k)`` to
+        which the results are written. Its initial value is used as
+        starting point of the iteration, and its values are updated in
+        each iteration step.
+    rhs : `ProductSpaceElement`
+        Right-hand sides of the inverse problems, an element of the same
+        power space as ``x``.
+    niter : int
+        Maximum number of iterations.
+    callback : callable, optional
+        Object executing code per iteration, e.g. plotting each iterate.
+    tol : non-negative float, optional
+        Tolerance for the residuals ``||rhs[j] - A(x[j])||``. Columns
+        with residual at most ``tol`` are removed from the iteration
+        (deflation), and the iteration stops when all are converged.
+    stopping_rule : callable, optional
+        Function called as ``stopping_rule(info)`` with the `SolverInfo`
+        of the run after each iteration. The iteration stops if it
+        returns ``True``.
+    executor : optional
+        Executor with a ``map`` method used to apply ``op`` to the
+        search directions in parallel, see `DiagonalOperator`.
+
+    Returns
+    -------
+    info : `SolverInfo`
+        Number of iterations, maximum residual norms and timings of the
+        run.
+
+    See Also
+    --------
+    conjugate_gradient : Solver for a single right-hand side
+    block_conjugate_gradient_normal : Solver for nonsymmetric operators
+
+    Notes
+    -----
+    This is the breakdown-free block CG method of [JL2017]. The search
+    directions are orthonormalized in each iteration, which removes
+    linearly dependent directions, such that the method also works for
+    linearly dependent right-hand sides. All block operations reduce to
+    Gram matrices of size at most ``k x k`` and linear combinations of
+    the block elements. For NumPy-based spaces with constant weighting,
+    they are evaluated as dense matrix products.
+
+    References
+    ----------
+    [JL2017] Ji, H, and Li, Y. *A breakdown-free block conjugate gradient
+    method*. BIT Numerical Mathematics, 57 (2017), pp 379-403.
+    """
+    if op.domain != op.range:
+        raise ValueError('operator needs to be self-adjoint')
+
+    pspace = getattr(x, 'space', None)
+    if (not isinstance(pspace, ProductSpace) or
+            any(spc != op.domain for spc in pspace)):
+        raise TypeError('`x` {!r} is not in a power space of the domain of '
+                        '`op` {!r}'.format(x, op.domain))
+    if rhs not in pspace:
+        raise TypeError('`rhs` {!r} is not in the space of `x` {!r}'
+                        ''.format(rhs, pspace))
+
+    num = len(pspace)
+    weight = _block_weight(op.domain)
+    info = SolverInfo(tol, stopping_rule)
+
+    # Batched application of `op` to the first `n` elements of a block
+    diag_ops = {}
+
+    def apply_op(xs, out):
+        n = len(xs)
+        if n not in diag_ops:
+            diag_ops[n] = DiagonalOperator(op, n, executor=executor)
+        diag_op = diag_ops[n]
+        diag_op(diag_op.domain.element(xs), out=diag_op.range.element(out))
+
+    # r = rhs - A x
+    r = [op.domain.element() for _ in range(num)]
+    apply_op(list(x), r)
+    for rj, rhsj in zip(r, rhs):
+        rj.lincomb(1, rhsj, -1, rj)
+
+    # Blocks of search directions, their images and new directions
+    p = [op.domain.element() for _ in range(num)]
+    q = [op.domain.element() for _ in range(num)]
+    z = [op.domain.element() for _ in range(num)]
+
+    def converged(rj):
+        return tol is not None and rj.norm() <= tol
+
+    active = [j for j in range(num) if not converged(r[j])]
+    if not active:
+        info.converged = True
+        return info
+
+    rank = _block_orthonormalize([r[j] for j in active], p, weight)
+
+    for _ in range(niter):
+        if rank == 0:
+            break
+
+        xs = [x[j] for j in active]
+        rs = [r[j] for j in active]
+        ps = p[:rank]
+        qs = q[:rank]
+
+        # q = A p, alpha = (p^H q)^-1 p^H r
+        apply_op(ps, qs)
+        pq = _block_gram(ps, qs, weight)
+        alpha = np.linalg.solve(pq, _block_gram(ps, rs, weight))
+
+        # x = x + p alpha, r = r - q alpha
+        _block_update(xs, 1, ps, alpha, weight)
+        _block_update(rs, 1, qs, -alpha, weight)
 
         if callback is not None:
             callback(x)
 
+        # Deflation of converged columns
+        if info.monitoring:
+            norms = [rj.norm() for rj in rs]
+            residual = max(norms)
+            if tol is not None:
+                active = [j for j, nrm in zip(active, norms) if nrm > tol]
+                rs = [r[j] for j in active]
+        else:
+            residual = None
+
+        if info.update(residual) or not active:
+            break
+
+        # z = r + p beta with beta = -(p^H q)^-1 q^H r, then p = orth(z)
+        beta = -np.linalg.solve(pq, _block_gram(qs, rs, weight))
+        zs = z[:len(active)]
+        for zj, rj in zip(zs, rs):
+            zj.assign(rj)
+        _block_update(zs, 1, ps, beta, weight)
+        rank = _block_orthonormalize(zs, p, weight)
+
+    return info
+
+
+def block_conjugate_gradient_normal(op, x, rhs, niter, callback=None,
+                                    tol=None, stopping_rule=None,
+                                    executor=None):
+    """Block conjugate gradient method for several normal equations.
+
+    This method solves the inverse problems ::
+
+        A(x[j]) = rhs[j],  j = 0, ..., k - 1
+
+    with a linear `Operator` ``A`` in the least-squares sense by applying
+    `block_conjugate_gradient` to the normal equations ::
+
+        A^*(A(x[j])) = A^*(rhs[j])
+
+    Parameters
+    ----------
+    op : linear `Operator`
+        Operator in the inverse problems. It must implement
+        `Operator.adjoint`.
+    x : `ProductSpaceElement`
+        Element of the power space ``ProductSpace(op.domain, k)`` to
+        which the results are written. Its initial value is used as
+        starting point of the iteration, and its values are updated in
+        each iteration step.
+    rhs : `ProductSpaceElement`
+        Right-hand sides of the inverse problems, an element of the power
+        space ``ProductSpace(op.range, k)``.
+    niter : int
+        Maximum number of iterations.
+    callback : callable, optional
+        Object executing code per iteration, e.g. plotting each iterate.
+    tol : non-negative float, optional
+        Tolerance for the residuals ``||A^*(rhs[j] - A(x[j]))||`` of the
+        normal equations, see `block_conjugate_gradient`.
+    stopping_rule : callable, optional
+        Function called as ``stopping_rule(info)`` with the `SolverInfo`
+        of the run after each iteration. The iteration stops if it
+        returns ``True``.
+    executor : optional
+        Executor with a ``map`` method used to apply ``op`` to the
+        search directions in parallel, see `DiagonalOperator`.
+
+    Returns
+    -------
+    info : `SolverInfo`
+        Number of iterations, maximum residual norms and timings of the
+        run.
+
+    See Also
+    --------
+    conjugate_gradient_normal : Solver for a single right-hand side
+    """
+    rhs_space = getattr(rhs, 'space', None)
+    if (not isinstance(rhs_space, ProductSpace) or
+            any(spc != op.range for spc in rhs_space)):
+        raise TypeError('`rhs` {!r} is not in a power space of the range '
+                        'of `op` {!r}'.format(rhs, op.range))
+
+    adjoint = op.adjoint
+    normal_op = OperatorComp(adjoint, op)
+    normal_rhs = DiagonalOperator(adjoint, len(rhs_space),
+                                  executor=executor)(rhs)
+    return block_conjugate_gradient(normal_op, x, normal_rhs, niter,
+                                    callback=callback, tol=tol,
+                                    stopping_rule=stopping_rule,
+                                    executor=executor)
+
 
 def exp_zero_seq(base):
     """Default exponential zero sequence.
@@ -468,6 +935,7 @@ def kaczmarz(ops, x, rhs, niter, omega=1, projection=None, random=False,
     See Also
     --------
     landweber
+    block_kaczmarz : Parallel variant with several operators per update.
     """
     domain = ops[0].domain
     if any(domain != opi.domain for opi in ops):
@@ -491,6 +959,9 @@ def kaczmarz(ops, x, rhs, niter, omega=1, projection=None, random=False,
     # Single reusable element in the domain
     tmp_dom = domain.element()
 
+    # Adjoints of linear operators are only created once
+    adjoints = [opi.adjoint if opi.is_linear else None for opi in ops]
+
     # Iteratively find solution
     for _ in range(niter):
         if random:
@@ -505,7 +976,10 @@ def kaczmarz(ops, x, rhs, niter, omega=1, projection=None, random=False,
             tmp_ran -= rhs[i]
 
             # Update x
-            ops[i].derivative(x).adjoint(tmp_ran, out=tmp_dom)
+            if adjoints[i] is not None:
+                adjoints[i](tmp_ran, out=tmp_dom)
+            else:
+                ops[i].derivative(x).adjoint(tmp_ran, out=tmp_dom)
             x.lincomb(1, x, -omega[i], tmp_dom)
 
             if projection is not None:
@@ -517,6 +991,201 @@ def kaczmarz(ops, x, rhs, niter, omega=1, projection=None, random=False,
             callback(x)
 
 
+def block_kaczmarz(ops, x, rhs, niter, block_size=None, omega=None, relax=1,
+                   sampling='uniform', block_norms=None, seed=None,
+                   projection=None, callback=None, executor=None, tol=None,
+                   stopping_rule=None):
+    """Block-parallel Kaczmarz method with averaged updates.
+
+    In each iteration, ``block_size`` of the equations ::
+
+        A_i(x) = rhs_i
+
+    are selected, their Kaczmarz updates are computed concurrently, and
+    the average is applied to ``x``. This is the block-iterative Cimmino,
+    or block-iterative projection (BIP), variant of `kaczmarz`, with equal
+    weights of the operators in a block. For ``block_size=1``, it is the
+    randomized Kaczmarz method, and for ``block_size=len(ops)``, the
+    Cimmino method.
+
+    Parameters
+    ----------
+    ops : sequence of `Operator`'s
+        Operators in the inverse problem. ``op[i].derivative(x).adjoint`` must
+        be well-defined for ``x`` in the operator domain and for all ``i``.
+    x : ``op.domain`` element
+        Element to which the result is written. Its initial value is
+        used as starting point of the iteration, and its values are
+        updated in each iteration step.
+    rhs : sequence of ``ops[i].range`` elements
+        Right-hand side of the equation defining the inverse problem.
+    niter : int
+        Number of iterations, each updating ``x`` with ``block_size``
+        operators.
+    block_size : positive int, optional
+        Number of operators used in parallel in one iteration. For
+        ``None``, all operators are used.
+    omega : positive float or sequence of positive floats, optional
+        Relaxation parameters of the single operators. For ``None``,
+        ``1 / block_norms[i] ** 2`` is used, which is the projection onto
+        the solutions of ``A_i(x) = rhs_i`` for matrices with one row.
+    relax : float, optional
+        Relaxation of the averaged update, convergence requires
+        ``0 < relax < 2`` for the default ``omega``.
+    sampling : {'uniform', 'importance', 'cyclic'}, optional
+        Selection of the operators in each iteration. They are drawn
+        without replacement with uniform probabilities or with
+        probabilities proportional to ``block_norms[i] ** 2``, or taken
+        as consecutive blocks of ``ops``.
+    block_norms : sequence of positive floats, optional
+        Operator norms ``||A_i||``. For ``None``, they are computed with
+        ``ops[i].norm(estimate=True)`` if needed.
+    seed : int, optional
+        Seed for the random sampling.
+    projection : callable, optional
+        Function that can be used to modify the iterates in each iteration,
+        for example enforcing positivity. The function should take one
+        argument and modify it in-place.
+    callback : callable, optional
+        Function called with the current iterate after each iteration.
+    executor : optional
+        Executor with a ``map`` method used to compute the updates of the
+        operators in one iteration in parallel, e.g., a
+        `multiprocessing.pool.ThreadPool`, see `DiagonalOperator`.
+        Since ``x`` is updated only after all updates of an iteration are
+        computed, the result does not depend on the executor.
+    tol : non-negative float, optional
+        Stop as soon as the residual ``||x_{k+1} - x_k||``, without
+        ``projection``, is at most ``tol``.
+    stopping_rule : callable, optional
+        Function called as ``stopping_rule(info)`` with the `SolverInfo`
+        of the run after each iteration. The iteration stops if it
+        returns ``True``.
+
+    Returns
+    -------
+    info : `SolverInfo`
+        Number of iterations, residuals and timings of the run.
+
+    Notes
+    -----
+    With the index set :math:`I_k` of :math:`m` selected operators in
+    iteration :math:`k`, the update is
+
+    .. math::
+        x_{k+1} = x_k - \\frac{\\lambda}{m} \\sum_{i \\in I_k} \\omega_i
+        \\partial \\mathcal{A}_i(x_k)^* (\\mathcal{A}_i(x_k) - y_i).
+
+    Importance sampling with probabilities proportional to
+    :math:`\\|\\mathcal{A}_i\\|^2` gives the randomized Kaczmarz method of
+    `[SV2009]`_ for ``block_size=1``, which converges linearly in
+    expectation for consistent linear systems.
+
+    References
+    ----------
+    .. _[SV2009]: https://doi.org/10.1007/s00041-008-9030-4
+
+    See Also
+    --------
+    kaczmarz : Sequential variant.
+    landweber : Variant with a single operator.
+    """
+    domain = ops[0].domain
+    if any(domain != opi.domain for opi in ops):
+        raise ValueError('`opi[i].domain` are not all equal')
+
+    if x not in domain:
+        raise TypeError('`x` {!r} is not in the domain of `ops` {!r}'
+                        ''.format(x, domain))
+
+    nops = len(ops)
+    if nops != len(rhs):
+        raise ValueError('`number of `ops` {} does not match number of '
+                         '`rhs` {}'.format(nops, len(rhs)))
+
+    if block_size is None:
+        block_size = nops
+    block_size, block_size_in = int(block_size), block_size
+    if not 0 < block_size <= nops or block_size != block_size_in:
+        raise ValueError('`block_size` must be an integer in [1, {}], got '
+                         '{}'.format(nops, block_size_in))
+
+    sampling, sampling_in = str(sampling).lower(), sampling
+    if sampling not in ('uniform', 'importance', 'cyclic'):
+        raise ValueError('`sampling` {!r} not understood'
+                         ''.format(sampling_in))
+
+    if omega is None or sampling == 'importance':
+        if block_norms is None:
+            block_norms = [opi.norm(estimate=True) for opi in ops]
+        block_norms = np.array(block_norms, dtype=float)
+        if block_norms.shape != (nops,) or np.any(block_norms <= 0):
+            raise ValueError('`block_norms` must be {} positive values, got '
+                             '{!r}'.format(nops, block_norms))
+
+    if omega is None:
+        omega = list(1 / block_norms ** 2)
+    else:
+        omega = normalized_scalar_param_list(omega, nops, param_conv=float)
+
+    if sampling == 'importance':
+        prob = block_norms ** 2 / np.sum(block_norms ** 2)
+    else:
+        prob = None
+    rng = np.random.RandomState(seed)
+
+    info = SolverInfo(tol, stopping_rule)
+
+    # Reusable elements for the concurrently computed updates, the ranges
+    # are shared by operators with equal range
+    tmp_rans = [{ran: ran.element() for ran in set(opi.range for opi in ops)}
+                for _ in range(block_size)]
+    tmp_doms = [domain.element() for _ in range(block_size)]
+
+    # Adjoints of linear operators are only created once
+    adjoints = [opi.adjoint if opi.is_linear else None for opi in ops]
+
+    def compute_update(slot_and_index):
+        """Compute ``A_i'(x)^* (A_i(x) - rhs_i)`` in temporary ``slot``."""
+        slot, i = slot_and_index
+        tmp_ran = tmp_rans[slot][ops[i].range]
+        ops[i](x, out=tmp_ran)
+        tmp_ran -= rhs[i]
+        if adjoints[i] is not None:
+            adjoints[i](tmp_ran, out=tmp_doms[slot])
+        else:
+            ops[i].derivative(x).adjoint(tmp_ran, out=tmp_doms[slot])
+
+    for k in range(niter):
+        if sampling == 'cyclic':
+            start = (k * block_size) % nops
+            blocks = [(start + j) % nops for j in range(block_size)]
+        else:
+            blocks = rng.choice(nops, block_size, replace=False, p=prob)
+
+        executor_map(executor, compute_update, enumerate(blocks))
+
+        # Sum the weighted updates in a fixed order
+        update = tmp_doms[0]
+        update *= omega[blocks[0]]
+        for slot in range(1, len(blocks)):
+            update.lincomb(1, update, omega[blocks[slot]], tmp_doms[slot])
+        step = relax / len(blocks)
+        x.lincomb(1, x, -step, update)
+
+        if projection is not None:
+            projection(x)
+
+        if callback is not None:
+            callback(x)
+
+        residual = step * update.norm() if info.monitoring else None
+        if info.update(residual):
+            break
+
+    return info
+
+
 if __name__ == '__main__':
     # pylint: disable=wrong-import-position
     from odl.util.testutils import run_doctests
@@ -0,0 +1,217 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Preconditioners for the iterative solvers.
+
+Filtering operators for analytic reconstruction, e.g., the ramp filter
+from `odl.tomo.fbp_filter_op`, can be used as data space preconditioners
+in `landweber` without further wrapping.
+"""
+
+# Imports for common Python 2/3 codebase
+from __future__ import print_function, division, absolute_import
+from builtins import super
+
+import numpy as np
+
+from odl.operator import MultiplyOperator, Operator
+
+
+__all__ = ('jacobi_preconditioner', 'circulant_preconditioner',
+           'CirculantPreconditioner')
+
+
+def _normal_response(op, x, normal):
+    """Return ``op.adjoint(op(x))`` if ``normal``, else ``op(x)``."""
+    if normal:
+        return op.adjoint(op(x))
+    else:
+        if op.domain != op.range:
+            raise ValueError('`op` {!r} must have equal domain and range '
+                             'for `normal=False`'.format(op))
+        return op(x)
+
+
+def jacobi_preconditioner(op, normal=True, eps=1e-8):
+    """Return a diagonal preconditioner for ``op``.
+
+    The diagonal is approximated by the row sums ``A^*(A(1))`` of the
+    normal operator, or ``A(1)`` for ``normal=False``. This is exact for
+    diagonal operators and a good approximation for operators with
+    nonnegative kernel, e.g., ray transforms. With `landweber`, it
+    scales the normal operator by its diagonal approximation. This is
+    not the SIRT method, which also weights the data by the inverse row
+    sums ``A(1)`` of ``A``.
+
+    Parameters
+    ----------
+    op : linear `Operator`
+        Operator ``A`` to be preconditioned.
+    normal : bool, optional
+        If ``True``, precondition the normal operator ``A^* A`` as used in
+        `landweber` and `conjugate_gradient_normal`. Otherwise, ``A``
+        must be self-adjoint as in `conjugate_gradient`.
+    eps : positive float, optional
+        Values of the diagonal below ``eps`` times its maximum are
+        raised to that value to keep the preconditioner bounded.
+
+    Returns
+    -------
+    preconditioner : `MultiplyOperator`
+        Multiplication with the inverse of the diagonal.
+
+    Examples
+    --------
+    >>> space = odl.rn(3)
+    >>> op = odl.MultiplyOperator(space.element([1, 2, 4]))
+    >>> precon = jacobi_preconditioner(op)
+    >>> precon(space.one())
+    rn(3).element([1.0, 0.25, 0.0625])
+    """
+    diag = _normal_response(op, op.domain.one(), normal)
+    max_val = diag.ufuncs.max()
+    if not max_val > 0:
+        raise ValueError('diagonal of `op` {!r} is not positive'.format(op))
+
+    diag.ufuncs.maximum(eps * max_val, out=diag)
+    return MultiplyOperator(diag.ufuncs.reciprocal(), domain=op.domain,
+                            range=op.domain)
+
+
+class CirculantPreconditioner(Operator):
+
+    """Inverse of a circulant approximation of an operator.
+
+    The operator is applied with the fast Fourier transform as ::
+
+        M(x) = ifft(fft(x) / symbol)
+
+    See `circulant_preconditioner` for how ``symbol`` is determined.
+    """
+
+    def __init__(self, domain, symbol):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        domain : `DiscreteLp` or `FnBase`
+            Domain and range of the operator. It must be based on NumPy.
+        symbol : `numpy.ndarray`
+            Nonzero real eigenvalues of the circulant operator that is
+            inverted, with shape ``domain.shape``.
+        """
+        super().__init__(domain, domain, linear=True)
+        self.__symbol = np.asarray(symbol, dtype=float)
+        if self.symbol.shape != self._shape:
+            raise ValueError('`symbol` has shape {}, expected {}'
+                             ''.format(self.symbol.shape, self._shape))
+
+    @property
+    def _shape(self):
+        """Array shape of the elements in `domain`."""
+        return getattr(self.domain, 'shape', (self.domain.size,))
+
+    @property
+    def symbol(self):
+        """Eigenvalues of the inverted circulant operator."""
+        return self.__symbol
+
+    def _call(self, x, out):
+        """Implement ``self(x, out)``."""
+        arr = x.asarray().reshape(self._shape)
+        result = np.fft.ifftn(np.fft.fftn(arr) / self.symbol)
+        if not np.iscomplexobj(out.asarray()):
+            result = result.real
+        out[:] = result.reshape(out.shape)
+
+    @property
+    def adjoint(self):
+        """Adjoint of this operator, equal to ``self``."""
+        return self
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}({!r}, symbol=...)'.format(self.__class__.__name__,
+                                             self.domain)
+
+
+def circulant_preconditioner(op, normal=True, eps=1e-8):
+    """Return an FFT-based preconditioner for a convolution operator.
+
+    The normal operator ``A^* A`` (or ``A`` for ``normal=False``) is
+    approximated by the circulant operator with the same impulse
+    response at the center of the grid, i.e., by a periodic convolution.
+    Its inverse is applied with two FFTs. This is exact for periodic
+    convolutions and a good approximation for convolutions with small
+    kernels, e.g., blurring or finite difference operators.
+
+    Parameters
+    ----------
+    op : linear `Operator`
+        Operator ``A`` to be preconditioned. Its domain must be a
+        NumPy-based `DiscreteLp` or `FnBase` space.
+    normal : bool, optional
+        If ``True``, precondition the normal operator ``A^* A`` as used in
+        `landweber` and `conjugate_gradient_normal`. Otherwise, ``A``
+        must be self-adjoint. The sign of the eigenvalues is kept, hence
+        the preconditioner is only positive definite, as required by
+        `conjugate_gradient`, if the circulant approximation of ``A`` is,
+        e.g., for positive definite periodic convolutions.
+    eps : positive float, optional
+        Eigenvalues below ``eps`` times the largest eigenvalue are raised
+        to that value, which regularizes the inverse. For
+        ``normal=False``, this applies to their absolute values.
+
+    Returns
+    -------
+    preconditioner : `CirculantPreconditioner`
+        Inverse of the circulant approximation.
+
+    Examples
+    --------
+    For a periodic convolution, the preconditioner is the exact inverse
+    (up to the regularization):
+
+    >>> space = odl.uniform_discr(0, 1, 8)
+    >>> op = (odl.IdentityOperator(space) -
+    ...       odl.Laplacian(space, pad_mode='periodic'))
+    >>> precon = circulant_preconditioner(op, normal=False)
+    >>> x = odl.phantom.white_noise(space)
+    >>> (precon(op(x)) - x).norm() < 1e-10
+    True
+    """
+    domain = op.domain
+    shape = getattr(domain, 'shape', (domain.size,))
+    center = tuple(n // 2 for n in shape)
+    impulse = np.zeros(shape)
+    impulse[center] = 1
+    response = _normal_response(op, domain.element(impulse), normal)
+
+    # Shift the impulse response to the origin, away from the boundary
+    kernel = np.roll(response.asarray().reshape(shape),
+                     [-c for c in center], axis=tuple(range(len(shape))))
+    symbol = np.fft.fftn(kernel).real
+    if normal:
+        max_val = np.max(symbol)
+        if not max_val > 0:
+            raise ValueError('normal operator of `op` {!r} is zero'
+                             ''.format(op))
+        symbol = np.maximum(symbol, eps * max_val)
+    else:
+        # Keep the sign of the eigenvalues
+        max_val = np.max(np.abs(symbol))
+        small = np.abs(symbol) < eps * max_val
+        symbol[small] = np.where(symbol[small] < 0, -1, 1) * eps * max_val
+
+    return CirculantPreconditioner(domain, symbol)
+
+
+if __name__ == '__main__':
+    # pylint: disable=wrong-import-position
+    from odl.util.testutils import run_doctests
+    run_doctests()
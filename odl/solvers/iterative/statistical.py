@@ -10,6 +10,8 @@
 
 # Imports for common Python 2/3 codebase
 from __future__ import print_function, division, absolute_import
+from past.builtins import basestring
+import weakref
 
 import numpy as np
 
@@ -17,6 +19,11 @@ __all__ = ('mlem', 'osmlem', 'loglikelihood')
 
 
 AVAILABLE_MLEM_NOISE = ('poisson',)
+AVAILABLE_SUBSET_ORDERS = ('sequential', 'bit_reversal', 'random')
+
+# Inverse sensitivities ``1 / max(A^* 1, eps)`` per operator and ``eps``,
+# released together with the operator
+_INVERSE_SENSITIVITY_CACHE = weakref.WeakKeyDictionary()
 
 
 def mlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
@@ -60,6 +67,15 @@ def mlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
         Usable with ``noise='poisson'``. The algorithm contains a ``A^T 1``
         term, if this parameter is given, it is replaced by it.
         Default: ``op.adjoint(op.range.one())``
+    background : float or ``op.range`` `element-like`, optional
+        Expected additive background, e.g., scatter and randoms, such
+        that ``op(x) + background`` approximates ``data``.
+    eps : positive float, optional
+        Lower bound for the sensitivities and the expected data.
+        Default: 1e-8
+    state : `SolverState`, optional
+        Stores ``x`` and the sensitivities for checkpointing and resuming
+        the iteration, see `osmlem`.
 
     Notes
     -----
@@ -72,13 +88,21 @@ def mlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
     With 'poisson' noise the algorithm is given by:
 
     .. math::
-       x_{n+1} = \\frac{x_n}{A^* 1} A^* (g / A(x_n))
+       x_{n+1} = \\frac{x_n}{A^* 1} A^* (g / (A(x_n) + b))
+
+    with background :math:`b`.
 
     See Also
     --------
     osmlem : Ordered subsets MLEM
     loglikelihood : Function for calculating the logarithm of the likelihood
     """
+    sensitivities = kwargs.pop('sensitivities', None)
+    if sensitivities is not None:
+        kwargs['sensitivities'] = [sensitivities]
+    background = kwargs.pop('background', None)
+    if background is not None:
+        kwargs['background'] = [background]
     osmlem([op], x, [data], niter=niter, noise=noise, callback=callback,
            **kwargs)
 
@@ -115,14 +139,41 @@ def osmlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
         For ``'poisson'``, the initial value of ``x`` should be
         non-negative.
     callback : callable, optional
-        Function called with the current iterate after each iteration.
+        Function called with the current iterate after each subset update.
 
     Other Parameters
     ----------------
-    sensitivities : float or ``op.domain`` `element-like`, optional
+    sensitivities : float, ``op[0].domain`` element or sequence, optional
         Usable with ``noise='poisson'``. The algorithm contains an ``A^T 1``
-        term, if this parameter is given, it is replaced by it.
-        Default: ``op[i].adjoint(op[i].range.one())``
+        term, if this parameter is given, it is replaced by it. A sequence
+        contains one float or ``op[i].domain`` `element-like` per operator.
+        Default: ``op[i].adjoint(op[i].range.one())``, computed once per
+        operator and cached as long as the operator exists.
+    background : sequence of float or ``op[i].range`` `element-like`, optional
+        Expected additive background per operator, e.g., scatter and
+        randoms, such that ``op[i](x) + background[i]`` approximates
+        ``data[i]``.
+    eps : positive float, optional
+        Lower bound for the sensitivities and the expected data.
+        Default: 1e-8
+    subset_order : str or sequence of int, optional
+        Order in which the subsets are used in each iteration.
+
+        - ``'sequential'``: ``0, 1, ..., n-1``.
+        - ``'bit_reversal'``: Bit-reversed indices, such that successive
+          subsets are far apart, e.g., for projection angles.
+        - ``'random'``: A new random permutation in each iteration.
+        - A sequence of subset indices.
+
+        Default: ``'sequential'``
+    seed : int, optional
+        Seed for ``subset_order='random'``. With a seed, the permutation
+        only depends on the seed and the iteration number, such that
+        resuming from ``state`` is reproducible.
+    state : `SolverState`, optional
+        Stores ``x``, the position of the next subset and the inverse
+        default sensitivities for checkpointing and resuming the
+        iteration.
 
     Notes
     -----
@@ -137,9 +188,12 @@ def osmlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
 
     .. math::
        x_{n + m/M} =
-       \\frac{x_{n + (m - 1)/M}}{A_i^* 1} A_i^* (g_i / A_i(x_{n + (m - 1)/M}))
+       \\frac{x_{n + (m - 1)/M}}{A_i^* 1}
+       A_i^* (g_i / (A_i(x_{n + (m - 1)/M}) + b_i))
 
-    for :math:`m = 1, ..., M` and :math:`x_{n+1} = x_{n + M/M}`.
+    for :math:`m = 1, ..., M`, where :math:`i` is the :math:`m`-th subset in
+    the order given by ``subset_order``, and :math:`x_{n+1} = x_{n + M/M}`.
+    The background :math:`b_i` is zero unless given.
 
     The algorithm is not guaranteed to converge, but works for many practical
     problems.
@@ -168,44 +222,156 @@ def osmlem(op, x, data, niter, noise='poisson', callback=None, **kwargs):
     # Convert data to range elements
     data = [op[i].range.element(data[i]) for i in range(len(op))]
 
+    state = kwargs.pop('state', None)
+    if state is not None:
+        state.iterate(x)
+
     if noise == 'poisson':
-        # Parameter used to enforce positivity.
-        # TODO: let users give this.
-        eps = 1e-8
+        # Parameter used to enforce positivity
+        eps = float(kwargs.pop('eps', 1e-8))
+        if eps <= 0:
+            raise ValueError('`eps` must be positive, got {}'.format(eps))
 
         if np.any(np.less(x, 0)):
             raise ValueError('`x` must be non-negative')
 
-        # Extract the sensitivites parameter
+        # Multiplication with the reciprocal of the sensitivities is
+        # cheaper than division in each update
         sensitivities = kwargs.pop('sensitivities', None)
-        if sensitivities is None:
-            sensitivities = [np.maximum(opi.adjoint(opi.range.one()), eps)
-                             for opi in op]
+        if sensitivities is None and state is not None:
+            inv_sens = [
+                state.element('inverse_sensitivities.{}'.format(i),
+                              opi.domain,
+                              default=lambda: _inverse_sensitivity(opi, eps))
+                for i, opi in enumerate(op)]
+        elif sensitivities is None:
+            inv_sens = [_inverse_sensitivity(opi, eps) for opi in op]
         else:
-            # Make sure the sensitivities is a list of the correct size.
-            try:
-                list(sensitivities)
-            except TypeError:
+            if np.isscalar(sensitivities) or sensitivities in op[0].domain:
                 sensitivities = [sensitivities] * n_ops
-
+            elif len(sensitivities) != n_ops:
+                raise ValueError('number of sensitivities ({}) does not '
+                                 'match number of operators ({})'
+                                 ''.format(len(sensitivities), n_ops))
+            inv_sens = [1.0 / max(float(si), eps) if np.isscalar(si)
+                        else opi.domain.element(si).ufuncs.maximum(
+                            eps).ufuncs.reciprocal()
+                        for opi, si in zip(op, sensitivities)]
+
+        background = kwargs.pop('background', None)
+        if background is not None:
+            if len(background) != n_ops:
+                raise ValueError('number of backgrounds ({}) does not '
+                                 'match number of operators ({})'
+                                 ''.format(len(background), n_ops))
+            background = [float(bi) if np.isscalar(bi)
+                          else opi.range.element(bi)
+                          for opi, bi in zip(op, background)]
+
+        order = _subset_order(n_ops, kwargs.pop('subset_order', 'sequential'),
+                              kwargs.pop('seed', None))
+
+        if kwargs:
+            raise TypeError('unexpected keyword arguments {}'
+                            ''.format(list(kwargs)))
+
+        # Temporaries, shared by operators with the same range
         tmp_dom = op[0].domain.element()
-        tmp_ran = [opi.range.element() for opi in op]
+        tmp_ran_by_space = {}
+        tmp_ran = [tmp_ran_by_space.setdefault(opi.range,
+                                               opi.range.element())
+                   for opi in op]
+
+        # Resume with the next subset
+        if state is None:
+            cycle, pos = 0, 0
+        else:
+            cycle, pos = state.niter, state.get('subset', 0)
+        subsets = order(cycle)
+
+        for _ in range(niter * len(subsets)):
+            i = subsets[pos]
+
+            # tmp = data / max(A x + b, eps)
+            op[i](x, out=tmp_ran[i])
+            if background is not None:
+                tmp_ran[i] += background[i]
+            tmp_ran[i].ufuncs.maximum(eps, out=tmp_ran[i])
+            data[i].divide(tmp_ran[i], out=tmp_ran[i])
+
+            # x *= A^* tmp / s
+            op[i].adjoint(tmp_ran[i], out=tmp_dom)
+            tmp_dom *= inv_sens[i]
+            x *= tmp_dom
+
+            pos += 1
+            if pos == len(subsets):
+                pos = 0
+                cycle += 1
+                subsets = order(cycle)
+            if state is not None:
+                state.update(subset=pos, niter=cycle)
+
+            if callback is not None:
+                callback(x)
+    else:
+        raise RuntimeError('unknown noise model')
+
 
-        for _ in range(niter):
-            for i in range(n_ops):
-                op[i](x, out=tmp_ran[i])
-                tmp_ran[i].ufuncs.maximum(eps, out=tmp_ran[i])
-                data[i].divide(tmp_ran[i], out=tmp_ran[i])
+def _inverse_sensitivity(op, eps):
+    """Return ``1 / max(A^* 1, eps)`` for ``op``, cached per operator."""
+    try:
+        cache = _INVERSE_SENSITIVITY_CACHE.setdefault(op, {})
+    except TypeError:
+        # Operator without weak references
+        cache = {}
 
-                op[i].adjoint(tmp_ran[i], out=tmp_dom)
-                tmp_dom /= sensitivities[i]
+    inv_sens = cache.get(eps)
+    if inv_sens is None:
+        inv_sens = op.adjoint(op.range.one())
+        inv_sens.ufuncs.maximum(eps, out=inv_sens)
+        inv_sens.ufuncs.reciprocal(out=inv_sens)
+        cache[eps] = inv_sens
+    return inv_sens
 
-                x *= tmp_dom
 
-                if callback is not None:
-                    callback(x)
+def _subset_order(n, order, seed=None):
+    """Return a function mapping an iteration to the order of the subsets.
+
+    Examples
+    --------
+    >>> _subset_order(6, 'bit_reversal')(0)
+    [0, 4, 2, 1, 5, 3]
+    >>> _subset_order(3, [2, 0])(5)
+    [2, 0]
+    """
+    if isinstance(order, basestring):
+        order, order_in = order.lower(), order
+        if order not in AVAILABLE_SUBSET_ORDERS:
+            raise ValueError('`subset_order` {!r} not understood'
+                             ''.format(order_in))
     else:
-        raise RuntimeError('unknown noise model')
+        subsets = [int(i) for i in order]
+        if not subsets or min(subsets) < 0 or max(subsets) >= n:
+            raise ValueError('`subset_order` {!r} must contain indices in '
+                             '[0, {})'.format(order, n))
+        return lambda cycle: subsets
+
+    if order == 'sequential':
+        subsets = list(range(n))
+        return lambda cycle: subsets
+    elif order == 'bit_reversal':
+        nbits = max(int(np.ceil(np.log2(n))), 1)
+        rev = [int('{:0{}b}'.format(i, nbits)[::-1], 2)
+               for i in range(2 ** nbits)]
+        subsets = [i for i in rev if i < n]
+        return lambda cycle: subsets
+    else:
+        if seed is None:
+            return lambda cycle: list(np.random.permutation(n))
+        else:
+            return lambda cycle: list(
+                np.random.RandomState([seed, cycle]).permutation(n))
 
 
 def loglikelihood(x, data, noise='poisson'):
@@ -18,6 +18,9 @@ __all__ += proximal_operators.__all__
 from .chambolle_pock import *
 __all__ += chambolle_pock.__all__
 
+from .stochastic_primal_dual import *
+__all__ += stochastic_primal_dual.__all__
+
 from .douglas_rachford import *
 __all__ += douglas_rachford.__all__
 
@@ -18,9 +18,10 @@ from __future__ import print_function, division, absolute_import
 import numpy as np
 
 from odl.operator import Operator
+from odl.solvers.util import SolverInfo
 
 
-__all__ = ('chambolle_pock_solver',)
+__all__ = ('chambolle_pock_solver', 'adaptive_pdhg')
 
 
 # TODO: add dual gap as convergence measure
@@ -86,6 +87,21 @@ def chambolle_pock_solver(x, f, g, L, tau, sigma, niter, **kwargs):
         Required to resume iteration. For ``None``, ``op.range.zero()``
         is used.
         Default: ``None``
+    tol : non-negative float, optional
+        Stop as soon as the residual ``||x_{k+1} - x_k||`` is at most ``tol``.
+    stopping_rule : callable, optional
+        Function called as ``stopping_rule(info)`` with the `SolverInfo`
+        of the run after each iteration. The iteration stops if it
+        returns ``True``.
+    state : `SolverState`, optional
+        Stores ``x``, ``x_relax``, ``y``, ``tau``, ``sigma`` and
+        ``theta`` for checkpointing and resuming the iteration. Values in
+        the state override the corresponding arguments.
+
+    Returns
+    -------
+    info : `SolverInfo`
+        Number of iterations, residuals and timings of the run.
 
     Notes
     -----
@@ -208,6 +224,11 @@ def chambolle_pock_solver(x, f, g, L, tau, sigma, niter, **kwargs):
         raise TypeError('`callback` {} is not callable'
                         ''.format(callback))
 
+    # Restore the iterate from the solver state
+    state = kwargs.pop('state', None)
+    if state is not None:
+        state.iterate(x)
+
     # Initialize the relaxation variable
     x_relax = kwargs.pop('x_relax', None)
     if x_relax is None:
@@ -224,6 +245,17 @@ def chambolle_pock_solver(x, f, g, L, tau, sigma, niter, **kwargs):
         raise TypeError('`y` {} is not in the range of `L` '
                         '{}'.format(y.space, L.range))
 
+    # Resume from the solver state
+    if state is not None:
+        x_relax = state.element('x_relax', L.domain, default=lambda: x_relax)
+        y = state.element('y', L.range, default=lambda: y)
+        tau = state.setdefault('tau', tau)
+        sigma = state.setdefault('sigma', sigma)
+        theta = state.setdefault('theta', theta)
+
+    info = SolverInfo(kwargs.pop('tol', None),
+                      kwargs.pop('stopping_rule', None))
+
     # Get the proximals
     proximal_dual = f.convex_conj.proximal
     proximal_primal = g.proximal
@@ -273,9 +305,359 @@ def chambolle_pock_solver(x, f, g, L, tau, sigma, niter, **kwargs):
         # Over-relaxation in the primal variable x
         x_relax.lincomb(1 + theta, x, -theta, x_old)
 
+        if state is not None:
+            state.update(tau=tau, sigma=sigma, theta=theta,
+                         niter=state.niter + 1)
+
         if callback is not None:
             callback(x)
 
+        if info.monitoring:
+            primal_tmp.lincomb(1, x, -1, x_old)
+            residual = primal_tmp.norm()
+        else:
+            residual = None
+        if info.update(residual):
+            break
+
+    return info
+
+
+def adaptive_pdhg(x, f, g, L, niter, tau=None, sigma=None, **kwargs):
+    """Adaptive primal-dual hybrid gradient method with backtracking.
+
+    Variant of `chambolle_pock_solver` for the problem ::
+
+        min_{x in X} f(L x) + g(x)
+
+    that chooses the step sizes ``tau`` and ``sigma`` automatically. In
+    each iteration, the ratio ``tau / sigma`` is adapted such that the
+    primal and dual residuals are balanced, and the product
+    ``tau * sigma`` is decreased by backtracking if it is too large
+    for the (unknown) norm of ``L``. Optionally, the adaptivity and the
+    relaxation are restarted if the residuals grow.
+
+    Parameters
+    ----------
+    x : ``L.domain`` element
+        Starting point of the iteration, updated in-place.
+    f : `Functional`
+        The function ``f`` in the problem definition. Needs to have
+        ``f.convex_conj.proximal``.
+    g : `Functional`
+        The function ``g`` in the problem definition. Needs to have
+        ``g.proximal``.
+    L : linear `Operator`
+        The linear operator that should be applied before ``f``. Its range
+        must match the domain of ``f`` and its domain must match the
+        domain of ``g``. Needs to have ``L.adjoint``.
+    niter : non-negative int
+        Maximum number of iterations.
+    tau, sigma : positive float, optional
+        Initial step sizes for the primal and dual updates. For
+        ``None``, both are set to ``1 / L.norm(estimate=True)``.
+
+    Other Parameters
+    ----------------
+    callback : callable, optional
+        Function called with the current iterate after each iteration.
+    y : ``L.range`` element, optional
+        Dual variable, updated in-place. Required to resume iteration.
+        For ``None``, ``L.range.zero()`` is used.
+    tol : non-negative float, optional
+        Stop as soon as the norms of the primal and dual residuals are
+        both at most ``tol``.
+    stopping_rule : callable, optional
+        Function called as ``stopping_rule(info)`` with the `SolverInfo`
+        of the run after each iteration. The iteration stops if it
+        returns ``True``.
+    state : `SolverState`, optional
+        Stores ``x``, ``y``, ``tau``, ``sigma``, ``alpha`` and the
+        variables of the restarts for checkpointing and resuming the
+        iteration. Values in the state override the corresponding
+        arguments.
+    alpha : float, optional
+        Initial adaptivity level, required to fulfill ``0 < alpha < 1``.
+        Each change of the step size ratio multiplies it by ``eta``.
+        Default: 0.5
+    eta : float, optional
+        Decay of the adaptivity level, required to fulfill
+        ``0 < eta < 1``.
+        Default: 0.95
+    delta : float, optional
+        Tolerance for the imbalance of the residuals before the step
+        sizes are adapted, required to fulfill ``delta > 1``.
+        Default: 1.5
+    scale : positive float, optional
+        Expected ratio between the primal and dual residual norms.
+        Default: 1
+    backtrack : float, optional
+        Safety factor for the backtracking condition, required to fulfill
+        ``0 < backtrack < 1``.
+        Default: 0.9
+    restart : float, optional
+        Restart the adaptivity and the relaxation if the sum of the
+        residual norms grows by more than this factor in one iteration,
+        required to fulfill ``restart >= 1``. For ``None``, the method is
+        never restarted.
+        Default: ``None``
+
+    Returns
+    -------
+    info : `SolverInfo`
+        Number of iterations, residuals and timings of the run. The
+        residual of an iteration is the larger of the norms of the primal
+        and dual residuals, see Notes. The step sizes after the last
+        iteration are stored in the attributes ``tau`` and ``sigma`` and
+        can be used to resume the iteration.
+
+    Notes
+    -----
+    With :math:`x_k, y_k` the iterates of the method (see
+    `chambolle_pock_solver` for the details), the primal and dual
+    residuals are given by
+
+    .. math::
+        p_{k+1} = \\frac{x_k - x_{k+1}}{\\tau_k} -
+                  L^*(y_k - y_{k+1}), \\quad
+        d_{k+1} = \\frac{y_k - y_{k+1}}{\\sigma_k} -
+                  \\theta_k L(x_k - x_{k+1}),
+
+    where :math:`\\theta_k \\in \\{0, 1\\}` is the relaxation parameter of
+    the dual step. They are both zero exactly at a saddle point. If
+    :math:`\|p_{k+1}\| > s \\Delta \|d_{k+1}\|`, the primal step
+    :math:`\\tau` is increased by the factor :math:`1 / (1 - \\alpha)`
+    and :math:`\\sigma` decreased by :math:`1 - \\alpha`, and vice
+    versa. The adaptivity :math:`\\alpha` decays with each change to
+    ensure convergence. Since ``L x`` and ``L^* y`` are kept from the
+    previous iteration, each iteration applies ``L`` and ``L.adjoint``
+    only once, which is the same cost as `chambolle_pock_solver`.
+
+    An iteration is rejected and repeated with smaller steps if
+
+    .. math::
+        2 \\tau \\sigma \\langle L(x_k - x_{k+1}), y_k - y_{k+1}
+        \\rangle > c (\\sigma \|x_k - x_{k+1}\|^2 +
+                      \\tau \|y_k - y_{k+1}\|^2),
+
+    which can only happen if :math:`\\tau \\sigma \|L\|^2 > c`. Rejected
+    iterations count towards ``niter``, but not towards ``info.niter``.
+
+    The method is restarted if
+    :math:`\\|p_{k+1}\\| + \\|d_{k+1}\\| > r (\\|p_k\\| + \\|d_k\\|)` with
+    the factor :math:`r` given by ``restart``. The next dual step is then
+    computed without relaxation, i.e., with :math:`\\theta_{k+1} = 0`
+    instead of 1, and the adaptivity :math:`\\alpha` is reset to its
+    initial value, multiplied by :math:`\\eta` once per restart. This
+    keeps the total adaptivity finite while allowing the step sizes to
+    be rebalanced when the iteration enters a new regime, e.g., a
+    change of the active set of a non-smooth ``f`` or ``g``. Whether
+    this reduces the number of iterations depends on the problem, hence
+    restarts are disabled by default.
+
+    The method is described in [GLYEB2015], the restarts are an addition
+    of this implementation.
+
+    References
+    ----------
+    [GLYEB2015] Goldstein, T, Li, M, Yuan, X, Esser, E, and Baraniuk, R.
+    *Adaptive Primal-Dual Splitting Methods for Statistical Learning and
+    Image Processing*. Advances in Neural Information Processing Systems
+    28 (2015), pp 2089-2097.
+    """
+    # Forward operator
+    if not isinstance(L, Operator):
+        raise TypeError('`op` {!r} is not an `Operator` instance'
+                        ''.format(L))
+    if not L.is_linear:
+        raise ValueError('`L` {!r} is not linear'.format(L))
+
+    # Starting point
+    if x not in L.domain:
+        raise TypeError('`x` {!r} is not in the domain of `op` {!r}'
+                        ''.format(x, L.domain))
+
+    # Number of iterations
+    if not isinstance(niter, int) or niter < 0:
+        raise ValueError('`niter` {} not understood'
+                         ''.format(niter))
+
+    # Step size parameters
+    if tau is None or sigma is None:
+        step = 1.0 / L.norm(estimate=True)
+        if tau is None:
+            tau = step
+        if sigma is None:
+            sigma = step
+
+    tau, tau_in = float(tau), tau
+    if tau <= 0:
+        raise ValueError('`tau` must be positive, got {}'.format(tau_in))
+
+    sigma, sigma_in = float(sigma), sigma
+    if sigma <= 0:
+        raise ValueError('`sigma` must be positive, got {}'.format(sigma_in))
+
+    # Adaptivity parameters
+    alpha = float(kwargs.pop('alpha', 0.5))
+    if not 0 < alpha < 1:
+        raise ValueError('`alpha` {} not in (0, 1)'.format(alpha))
+    eta = float(kwargs.pop('eta', 0.95))
+    if not 0 < eta < 1:
+        raise ValueError('`eta` {} not in (0, 1)'.format(eta))
+    delta = float(kwargs.pop('delta', 1.5))
+    if not delta > 1:
+        raise ValueError('`delta` must be larger than 1, got {}'
+                         ''.format(delta))
+    scale = float(kwargs.pop('scale', 1))
+    if not scale > 0:
+        raise ValueError('`scale` must be positive, got {}'.format(scale))
+    backtrack = float(kwargs.pop('backtrack', 0.9))
+    if not 0 < backtrack < 1:
+        raise ValueError('`backtrack` {} not in (0, 1)'.format(backtrack))
+    restart = kwargs.pop('restart', None)
+    if restart is not None:
+        restart = float(restart)
+        if not restart >= 1:
+            raise ValueError('`restart` must be at least 1, got {}'
+                             ''.format(restart))
+
+    # Callback object
+    callback = kwargs.pop('callback', None)
+    if callback is not None and not callable(callback):
+        raise TypeError('`callback` {} is not callable'
+                        ''.format(callback))
+
+    # Initialize the dual variable
+    y = kwargs.pop('y', None)
+    if y is None:
+        y = L.range.zero()
+    elif y not in L.range:
+        raise TypeError('`y` {} is not in the range of `L` '
+                        '{}'.format(y.space, L.range))
+
+    # Resume from the solver state
+    state = kwargs.pop('state', None)
+    if state is not None:
+        state.iterate(x)
+        y = state.element('y', L.range, default=lambda: y)
+        tau = state.setdefault('tau', tau)
+        sigma = state.setdefault('sigma', sigma)
+        alpha = state.setdefault('alpha', alpha)
+        alpha_restart = state.setdefault('alpha_restart', alpha)
+        residual_old = state.setdefault('residual', float('inf'))
+        theta = state.setdefault('theta', 1)
+    else:
+        alpha_restart = alpha
+        residual_old = float('inf')
+        theta = 1
+
+    info = SolverInfo(kwargs.pop('tol', None),
+                      kwargs.pop('stopping_rule', None))
+    if kwargs:
+        raise TypeError('unexpected keyword arguments {}'
+                        ''.format(list(kwargs)))
+
+    proximal_dual = f.convex_conj.proximal
+    proximal_primal = g.proximal
+    L_adjoint = L.adjoint
+
+    # Previous iterates
+    x_old = L.domain.element()
+    y_old = L.range.element()
+
+    # `L x` and `L^* y` of the current and the previous iterates
+    Lx = L(x)
+    Lx_old = L.range.element()
+    Ly = L_adjoint(y)
+    Ly_old = L.domain.element()
+
+    # Temporaries
+    primal_tmp = L.domain.element()
+    dual_tmp = L.range.element()
+
+    for _ in range(niter):
+        x_old.assign(x)
+        y_old.assign(y)
+
+        # Primal step x = prox[tau * g](x - tau * L^*(y))
+        primal_tmp.lincomb(1, x_old, -tau, Ly)
+        proximal_primal(tau)(primal_tmp, out=x)
+        Lx, Lx_old = Lx_old, Lx
+        L(x, out=Lx)
+
+        # Dual step y = prox[sigma * f^*](y + sigma * L(x_relax)) with
+        # x_relax = x + theta * (x - x_old)
+        dual_tmp.lincomb(1 + theta, Lx, -theta, Lx_old)
+        dual_tmp.lincomb(1, y_old, sigma, dual_tmp)
+        proximal_dual(sigma)(dual_tmp, out=y)
+        Ly, Ly_old = Ly_old, Ly
+        L_adjoint(y, out=Ly)
+
+        # Differences of the iterates
+        primal_tmp.lincomb(1, x_old, -1, x)
+        dual_tmp.lincomb(1, y_old, -1, y)
+        primal_diff_sq = primal_tmp.norm() ** 2
+        dual_diff_sq = dual_tmp.norm() ** 2
+        cross = (dual_tmp.inner(Lx_old) - dual_tmp.inner(Lx)).real
+
+        # Backtracking, reject the iteration if the steps are too large
+        denom = backtrack * (sigma * primal_diff_sq + tau * dual_diff_sq)
+        if 2 * tau * sigma * cross > denom:
+            ratio = denom / (2 * tau * sigma * cross)
+            tau *= ratio
+            sigma *= ratio
+            x.assign(x_old)
+            y.assign(y_old)
+            Lx, Lx_old = Lx_old, Lx
+            Ly, Ly_old = Ly_old, Ly
+            if state is not None:
+                state.update(tau=tau, sigma=sigma)
+            continue
+
+        # Residuals, computed from the differences in-place
+        primal_tmp.lincomb(1 / tau, primal_tmp, -1, Ly_old)
+        primal_tmp += Ly
+        dual_tmp.lincomb(1 / sigma, dual_tmp, -theta, Lx_old)
+        dual_tmp.lincomb(1, dual_tmp, theta, Lx)
+        primal_res = primal_tmp.norm()
+        dual_res = dual_tmp.norm()
+
+        if callback is not None:
+            callback(x)
+
+        # Restart the adaptivity and the relaxation if the residual grows
+        residual = primal_res + dual_res
+        if restart is not None and residual > restart * residual_old:
+            alpha_restart *= eta
+            alpha = alpha_restart
+            theta = 0
+        else:
+            theta = 1
+        residual_old = residual
+
+        # Balance the residuals
+        if primal_res > scale * delta * dual_res:
+            tau /= 1 - alpha
+            sigma *= 1 - alpha
+            alpha *= eta
+        elif primal_res < scale * dual_res / delta:
+            tau *= 1 - alpha
+            sigma /= 1 - alpha
+            alpha *= eta
+
+        if state is not None:
+            state.update(tau=tau, sigma=sigma, alpha=alpha,
+                         alpha_restart=alpha_restart, residual=residual,
+                         theta=theta, niter=state.niter + 1)
+
+        if info.update(max(primal_res, dual_res)):
+            break
+
+    info.tau = tau
+    info.sigma = sigma
+    return info
+
 
 if __name__ == '__main__':
     # pylint: disable=wrong-import-position
@@ -12,6 +12,7 @@
 from __future__ import print_function, division, absolute_import
 
 from odl.operator import Operator
+from odl.solvers.util import SolverInfo
 
 
 __all__ = ('douglas_rachford_pd',)
@@ -67,6 +68,24 @@ def douglas_rachford_pd(x, f, g, L, tau, sigma, niter,
     lam : float or callable, optional
         Overrelaxation step size. If callable, it should take an index
         (starting at zero) and return the corresponding step size.
+    tol : non-negative float, optional
+        Stop as soon as the residual ``||x_{k+1} - x_k||`` of the
+        governing sequence ``x`` of the method is at most ``tol``.
+    stopping_rule : callable, optional
+        Function called as ``stopping_rule(info)`` with the `SolverInfo`
+        of the run after each iteration. The iteration stops if it
+        returns ``True``.
+    state : `SolverState`, optional
+        Stores the iterate ``x`` and the dual variables for checkpointing
+        and resuming the iteration. The governing sequence of the method,
+        which differs from the returned ``x``, is stored under the key
+        ``'x_gov'``. The index passed to ``lam`` continues from
+        ``state.niter``.
+
+    Returns
+    -------
+    info : `SolverInfo`
+        Number of iterations, residuals and timings of the run.
 
     Notes
     -----
@@ -149,12 +168,28 @@ def douglas_rachford_pd(x, f, g, L, tau, sigma, niter,
         raise ValueError('`lam` must callable or a number between 0 and 2')
     lam = lam_in if callable(lam_in) else lambda _: lam_in
 
+    info = SolverInfo(kwargs.pop('tol', None),
+                      kwargs.pop('stopping_rule', None))
+
+    state = kwargs.pop('state', None)
+
     # Check for unused parameters
     if kwargs:
         raise TypeError('unexpected keyword argument: {}'.format(kwargs))
 
     # Pre-allocate values
-    v = [Li.range.zero() for Li in L]
+    x_out = x
+    if state is None:
+        v = [Li.range.zero() for Li in L]
+        k_start = 0
+    else:
+        # The governing sequence is kept in the state since the result is
+        # written to `x` at the end
+        state.iterate(x_out)
+        x = state.element('x_gov', x.space, default=x_out.copy)
+        v = [state.element('v.{}'.format(i), Li.range)
+             for i, Li in enumerate(L)]
+        k_start = state.niter
     p1 = x.space.zero()
     p2 = [Li.range.zero() for Li in L]
     z1 = x.space.zero()
@@ -165,7 +200,7 @@ def douglas_rachford_pd(x, f, g, L, tau, sigma, niter,
     # Temporaries (not in original article)
     tmp_domain = x.space.zero()
 
-    for k in range(niter):
+    for k in range(k_start, k_start + niter):
         lam_k = lam(k)
 
         if len(L) > 0:
@@ -200,8 +235,12 @@ def douglas_rachford_pd(x, f, g, L, tau, sigma, niter,
         z1.lincomb(1.0, w1, - (tau / 2.0), tmp_domain)
 
         # Compute x += lam(k) * (z1 - p1)
-        x.lincomb(1, x, lam_k, z1)
-        x.lincomb(1, x, -lam_k, p1)
+        tmp_domain.lincomb(1, z1, -1, p1)
+        x.lincomb(1, x, lam_k, tmp_domain)
+        if info.monitoring:
+            residual = abs(lam_k) * tmp_domain.norm()
+        else:
+            residual = None
 
         tmp_domain.lincomb(2, z1, -1, w1)
         for i in range(m):
@@ -219,9 +258,16 @@ def douglas_rachford_pd(x, f, g, L, tau, sigma, niter,
             v[i].lincomb(1, v[i], lam_k, z2[i])
             v[i].lincomb(1, v[i], -lam_k, p2[i])
 
+        if state is not None:
+            state['niter'] = k + 1
+
         if callback is not None:
             callback(p1)
 
+        if info.update(residual):
+            break
+
     # The final result is actually in p1 according to the algorithm, so we need
     # to assign here.
-    x.assign(p1)
+    x_out.assign(p1)
+    return info
@@ -13,6 +13,7 @@
 from __future__ import print_function, division, absolute_import
 
 from odl.operator import Operator
+from odl.solvers.util import SolverInfo
 
 
 __all__ = ('forward_backward_pd',)
@@ -70,6 +71,17 @@ def forward_backward_pd(x, f, g, L, h, tau, sigma, niter,
     l : sequence of `Functional`'s, optional
         The functionals ``l_i``. Needs to have ``g_i.convex_conj.gradient``.
         If omitted, the simpler problem without ``l_i``  will be considered.
+    tol : non-negative float, optional
+        Stop as soon as the residual ``||x_{k+1} - x_k||`` is at most ``tol``.
+    stopping_rule : callable, optional
+        Function called as ``stopping_rule(info)`` with the `SolverInfo`
+        of the run after each iteration. The iteration stops if it
+        returns ``True``.
+
+    Returns
+    -------
+    info : `SolverInfo`
+        Number of iterations, residuals and timings of the run.
 
     Notes
     -----
@@ -163,14 +175,21 @@ def forward_backward_pd(x, f, g, L, h, tau, sigma, niter,
             raise ValueError('`grad_cc_l` not same length as `L`')
         grad_cc_l = [li.convex_conj.gradient for li in l]
 
+    info = SolverInfo(kwargs.pop('tol', None),
+                      kwargs.pop('stopping_rule', None))
+
     if kwargs:
         raise TypeError('unexpected keyword argument: {}'.format(kwargs))
 
     # Pre-allocate values
     v = [Li.range.zero() for Li in L]
     y = x.space.zero()
+    if info.monitoring:
+        x_prev = x.space.element()
 
     for k in range(niter):
+        if info.monitoring:
+            x_prev.assign(x)
         x_old = x
 
         tmp_1 = grad_h(x) + sum(Li.adjoint(vi) for Li, vi in zip(L, v))
@@ -190,3 +209,13 @@ def forward_backward_pd(x, f, g, L, h, tau, sigma, niter,
 
         if callback is not None:
             callback(x)
+
+        if info.monitoring:
+            x_prev.lincomb(1, x, -1, x_prev)
+            residual = x_prev.norm()
+        else:
+            residual = None
+        if info.update(residual):
+            break
+
+    return info
@@ -13,6 +13,8 @@ from __future__ import print_function, division, absolute_import
 
 import numpy as np
 
+from odl.solvers.util import SolverInfo
+
 
 __all__ = ('proximal_gradient', 'accelerated_proximal_gradient')
 
@@ -52,6 +54,17 @@ def proximal_gradient(x, f, g, gamma, niter, callback=None, **kwargs):
         Overrelaxation step size. If callable, it should take an index
         (starting at zero) and return the corresponding step size.
         Default: 1.0
+    tol : non-negative float, optional
+        Stop as soon as the residual ``||x_{k+1} - x_k||`` is at most ``tol``.
+    stopping_rule : callable, optional
+        Function called as ``stopping_rule(info)`` with the `SolverInfo`
+        of the run after each iteration. The iteration stops if it
+        returns ``True``.
+
+    Returns
+    -------
+    info : `SolverInfo`
+        Number of iterations, residuals and timings of the run.
 
     Notes
     -----
@@ -99,6 +112,9 @@ def proximal_gradient(x, f, g, gamma, niter, callback=None, **kwargs):
     lam_in = kwargs.pop('lam', 1.0)
     lam = lam_in if callable(lam_in) else lambda _: float(lam_in)
 
+    info = SolverInfo(kwargs.pop('tol', None),
+                      kwargs.pop('stopping_rule', None))
+
     # Get the proximal and gradient
     f_prox = f.proximal(gamma)
     g_grad = g.gradient
@@ -112,12 +128,19 @@ def proximal_gradient(x, f, g, gamma, niter, callback=None, **kwargs):
         # x - gamma grad_g (x)
         tmp.lincomb(1, x, -gamma, g_grad(x))
 
-        # Update x
-        x.lincomb(1 - lam_k, x, lam_k, f_prox(tmp))
+        # Update x = x + lam_k * (prox(tmp) - x)
+        tmp.lincomb(1, f_prox(tmp), -1, x)
+        x.lincomb(1, x, lam_k, tmp)
 
         if callback is not None:
             callback(x)
 
+        residual = abs(lam_k) * tmp.norm() if info.monitoring else None
+        if info.update(residual):
+            break
+
+    return info
+
 
 def accelerated_proximal_gradient(x, f, g, gamma, niter, callback=None,
                                   **kwargs):
@@ -142,13 +165,51 @@ def accelerated_proximal_gradient(x, f, g, gamma, niter, callback=None,
     g : `Functional`
         The function ``g`` in the problem definition. Needs to have
         ``g.gradient``.
-    gamma : positive float
-        Step size parameter.
+    gamma : positive float or None
+        Step size parameter, the initial step size if ``backtracking`` is
+        used. For ``None``, ``1 / g.grad_lipschitz`` is used if it is
+        finite, otherwise 1.0 if ``backtracking`` is used.
     niter : non-negative int, optional
         Number of iterations.
     callback : callable, optional
         Function called with the current iterate after each iteration.
 
+    Other Parameters
+    ----------------
+    backtracking : float, optional
+        If given, the step size is multiplied with this factor in
+        ``(0, 1)`` until the sufficient decrease condition
+
+        ``g(z) <= g(y) + <grad g(y), z - y> + ||z - y||^2 / (2 * gamma)``
+
+        holds for the new point ``z``, see `[Beck2009]`_. This costs one
+        evaluation of ``g`` per iteration plus one per reduction of the
+        step size. The step size is never increased again.
+        Default: No backtracking
+    restart : {None, 'function', 'gradient'}, optional
+        Adaptive restart scheme of `[ODonoghue2015]`_. The momentum is
+        reset if the objective increases (``'function'``, one extra
+        evaluation of ``f + g`` per iteration), or if the momentum points
+        in an ascent direction (``'gradient'``, no extra evaluations).
+        Default: No restart
+    monotone : bool, optional
+        If ``True``, use monotone FISTA `[Beck2009b]`_, which only accepts
+        points that do not increase the objective. This costs one extra
+        evaluation of ``f + g`` per iteration. Default: ``False``
+    tol : non-negative float, optional
+        Stop as soon as the residual ``||z_k - x_k||`` is at most ``tol``,
+        where ``z_k`` is the result of the proximal gradient step. It is
+        the next iterate ``x_{k+1}`` unless ``monotone`` rejects it.
+    stopping_rule : callable, optional
+        Function called as ``stopping_rule(info)`` with the `SolverInfo`
+        of the run after each iteration. The iteration stops if it
+        returns ``True``.
+
+    Returns
+    -------
+    info : `SolverInfo`
+        Number of iterations, residuals and timings of the run.
+
     Notes
     -----
     The problem of interest is
@@ -166,9 +227,15 @@ def accelerated_proximal_gradient(x, f, g, gamma, niter, callback=None,
     .. math::
        0 < \\gamma < 2 \\beta.
 
+    With ``backtracking``, :math:`\\beta` does not need to be known.
+
     References
     ----------
     .. _[Beck2009]: http://epubs.siam.org/doi/abs/10.1137/080716542
+
+    .. _[Beck2009b]: https://doi.org/10.1109/TIP.2009.2028250
+
+    .. _[ODonoghue2015]: https://doi.org/10.1007/s10208-013-9150-3
     """
     # Get and validate input
     if x not in f.domain:
@@ -178,6 +245,32 @@ def accelerated_proximal_gradient(x, f, g, gamma, niter, callback=None,
         raise TypeError('`x` {!r} is not in the domain of `g` {!r}'
                         ''.format(x, g.domain))
 
+    backtracking = kwargs.pop('backtracking', None)
+    if backtracking is not None:
+        backtracking, backtracking_in = float(backtracking), backtracking
+        if not 0 < backtracking < 1:
+            raise ValueError('`backtracking` must lie in (0, 1), got {}'
+                             ''.format(backtracking_in))
+
+    restart, restart_in = kwargs.pop('restart', None), None
+    if restart is not None:
+        restart, restart_in = str(restart).lower(), restart
+        if restart not in ('function', 'gradient'):
+            raise ValueError('`restart` {!r} not understood'
+                             ''.format(restart_in))
+
+    monotone = bool(kwargs.pop('monotone', False))
+
+    if gamma is None:
+        lipschitz = float(getattr(g, 'grad_lipschitz', np.nan))
+        if 0 < lipschitz < np.inf:
+            gamma = 1 / lipschitz
+        elif backtracking is not None:
+            gamma = 1.0
+        else:
+            raise ValueError('`gamma` must be given since `g` {!r} has no '
+                             'finite `grad_lipschitz` constant'.format(g))
+
     gamma, gamma_in = float(gamma), gamma
     if gamma <= 0:
         raise ValueError('`gamma` must be positive, got {}'.format(gamma_in))
@@ -185,35 +278,93 @@ def accelerated_proximal_gradient(x, f, g, gamma, niter, callback=None,
     if int(niter) != niter:
         raise ValueError('`niter` {} not understood'.format(niter))
 
+    info = SolverInfo(kwargs.pop('tol', None),
+                      kwargs.pop('stopping_rule', None))
+    if kwargs:
+        raise TypeError('unexpected keyword arguments {}'
+                        ''.format(list(kwargs)))
+
     # Get the proximal
     f_prox = f.proximal(gamma)
     g_grad = g.gradient
 
-    # Create temporary
+    # Create temporaries
     tmp = x.space.element()
+    grad_y = x.space.element()
+    z = x.space.element()
     y = x.copy()
     t = 1
 
+    # The objective value of the current iterate is cached between the
+    # iterations, and values of `g` from backtracking are reused
+    use_objective = monotone or restart == 'function'
+    if use_objective:
+        obj_x = (f(x) + g(x)).real
+
     for k in range(niter):
+        # Proximal gradient step z = prox(y - gamma grad_g (y))
+        g_grad(y, out=grad_y)
+        if backtracking is not None:
+            g_y = g(y).real
+
+        while True:
+            tmp.lincomb(1, y, -gamma, grad_y)
+            f_prox(tmp, out=z)
+            if backtracking is None:
+                g_z = None
+                break
+
+            tmp.lincomb(1, z, -1, y)
+            g_z = g(z).real
+            if (g_z <= g_y + grad_y.inner(tmp).real +
+                    tmp.norm() ** 2 / (2 * gamma)):
+                break
+
+            gamma *= backtracking
+            f_prox = f.proximal(gamma)
+
         # Update t
         t, t_old = (1 + np.sqrt(1 + 4 * t ** 2)) / 2, t
-        alpha = (t_old - 1) / t
 
-        # x - gamma grad_g (y)
-        tmp.lincomb(1, y, -gamma, g_grad(y))
-
-        # Store old x value in y
-        y.assign(x)
-
-        # Update x
-        f_prox(tmp, out=x)
-
-        # Update y
-        y.lincomb(1 + alpha, x, -alpha, y)
+        # Step and residual
+        tmp.lincomb(1, z, -1, x)
+        residual = tmp.norm() if info.monitoring else None
+
+        if use_objective:
+            obj_z = (f(z) + (g(z) if g_z is None else g_z)).real
+            decrease = obj_z <= obj_x
+        else:
+            decrease = True
+
+        if restart == 'function':
+            do_restart = not decrease
+        elif restart == 'gradient':
+            do_restart = (y.inner(tmp) - z.inner(tmp)).real > 0
+        else:
+            do_restart = False
+
+        if decrease or not monotone:
+            # Accept z, then y = z + (t_old - 1) / t * (z - x_old)
+            x.assign(z)
+            y.lincomb(1, z, (t_old - 1) / t, tmp)
+            if use_objective:
+                obj_x = obj_z
+        else:
+            # Keep x, then y = x + t_old / t * (z - x)
+            y.lincomb(1, x, t_old / t, tmp)
+
+        if do_restart:
+            t = 1
+            y.assign(x)
 
         if callback is not None:
             callback(x)
 
+        if info.update(residual):
+            break
+
+    return info
+
 
 if __name__ == '__main__':
     # pylint: disable=wrong-import-position
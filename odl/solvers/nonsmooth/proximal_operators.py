@@ -31,7 +31,7 @@ from odl.operator import (Operator, IdentityOperator, ScalingOperator,
                           ConstantOperator, DiagonalOperator)
 from odl.space import ProductSpace
 from odl.set import LinearSpaceElement
-from odl.util import cache_arguments
+from odl.util import cache_arguments, temporary_element
 
 
 __all__ = ('combine_proximals', 'proximal_convex_conj', 'proximal_translation',
@@ -1038,10 +1038,10 @@ def proximal_convex_conj_l1(space, lam=1, g=None, isotropic=False):
                 # Calculate |x| = pointwise 2-norm of x
 
                 tmp = diff[0] ** 2
-                sq_tmp = x[0].space.element()
-                for x_i in diff[1:]:
-                    x_i.multiply(x_i, out=sq_tmp)
-                    tmp += sq_tmp
+                with temporary_element(x[0].space) as sq_tmp:
+                    for x_i in diff[1:]:
+                        x_i.multiply(x_i, out=sq_tmp)
+                        tmp += sq_tmp
                 tmp.ufuncs.sqrt(out=tmp)
 
                 # Pointwise maximum of |x| and lambda
@@ -0,0 +1,364 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Stochastic primal-dual hybrid gradient method.
+
+The method is a randomized variant of the Chambolle-Pock algorithm that
+only updates a few blocks of the dual variable in each iteration.
+"""
+
+# Imports for common Python 2/3 codebase
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+
+from odl.operator import BroadcastOperator, Operator
+from odl.solvers.util import SolverInfo
+
+
+__all__ = ('spdhg',)
+
+
+def _spdhg_blocks(f, L):
+    """Return the dual functionals and block operators as lists."""
+    if isinstance(L, BroadcastOperator):
+        ops = list(L.operators)
+    elif isinstance(L, Operator):
+        raise TypeError('`L` {!r} is neither a `BroadcastOperator` nor a '
+                        'sequence of operators'.format(L))
+    else:
+        ops = list(L)
+
+    # `SeparableSum` cannot be imported here due to circular imports
+    funcs = getattr(f, 'functionals', None)
+    if funcs is None:
+        funcs = list(f)
+    else:
+        funcs = list(funcs)
+
+    if len(ops) != len(funcs):
+        raise ValueError('number of operators {} does not match the number '
+                         'of functionals {}'.format(len(ops), len(funcs)))
+    if not ops:
+        raise ValueError('need at least one block')
+
+    for i, (op, func) in enumerate(zip(ops, funcs)):
+        if not isinstance(op, Operator) or not op.is_linear:
+            raise TypeError('block {} of `L` {!r} is not a linear '
+                            '`Operator`'.format(i, op))
+        if op.domain != ops[0].domain:
+            raise ValueError('block {} of `L` has domain {!r}, expected '
+                             '{!r}'.format(i, op.domain, ops[0].domain))
+        if func.domain != op.range:
+            raise ValueError('block {} of `f` has domain {!r}, expected '
+                             '{!r}'.format(i, func.domain, op.range))
+
+    return funcs, ops
+
+
+def spdhg(x, f, g, L, niter, tau=None, sigma=None, **kwargs):
+    """Stochastic primal-dual hybrid gradient method.
+
+    Solves problems of the form ::
+
+        min_{x in X} sum_i f_i(L_i x) + g(x)
+
+    where each iteration only evaluates a random subset of the blocks
+    ``L_i`` and their adjoints. If ``L`` consists of ``n`` blocks of
+    similar cost, this reduces the cost per iteration by a factor of
+    about ``n / batch_size`` compared to `chambolle_pock_solver`.
+
+    Parameters
+    ----------
+    x : ``L.domain`` element
+        Starting point of the iteration, updated in-place.
+    f : `SeparableSum` or sequence of `Functional`
+        The functionals ``f_i`` in the problem definition. Each needs to
+        have ``f_i.convex_conj.proximal``.
+    g : `Functional`
+        The function ``g`` in the problem definition. Needs to have
+        ``g.proximal``.
+    L : `BroadcastOperator` or sequence of `Operator`
+        The linear operators ``L_i``. They must have a common domain
+        matching the domain of ``g``, and ``L_i.range`` must match the
+        domain of ``f_i``. Each needs to have ``L_i.adjoint``.
+    niter : non-negative int
+        Number of iterations.
+    tau : positive float, optional
+        Step size for the update of the primal variable. For ``None``,
+        it is computed from the block norms, see Notes.
+    sigma : sequence of positive float, optional
+        Step sizes for the updates of the dual blocks. For ``None``,
+        they are computed from the block norms, see Notes.
+
+    Other Parameters
+    ----------------
+    sampling : {'uniform', 'importance'}, optional
+        Strategy for selecting the dual blocks. ``'uniform'`` selects
+        ``batch_size`` distinct blocks with equal probability, and
+        ``'importance'`` selects one block with probability proportional
+        to its norm.
+        Default: ``'uniform'``
+    batch_size : positive int, optional
+        Number of dual blocks updated per iteration. Only supported for
+        ``sampling='uniform'``.
+        Default: 1
+    prob : sequence of float, optional
+        Probabilities for selecting the blocks, overriding ``sampling``.
+        Only supported for ``batch_size=1``.
+    block_norms : sequence of positive float, optional
+        Norms of the blocks ``L_i`` used to compute default step sizes and
+        the importance sampling probabilities. For ``None``, they are
+        computed with ``L_i.norm(estimate=True)`` if needed.
+    gamma : float, optional
+        Factor for the default step sizes, required to fulfill
+        ``0 < gamma < 1``.
+        Default: 0.99
+    theta : float, optional
+        Extrapolation parameter, required to fulfill ``0 <= theta <= 1``.
+        Default: 1
+    y : ``L.range`` element, optional
+        Dual variable, updated in-place. Required to resume iteration.
+        For ``None``, ``L.range.zero()`` is used.
+    seed : int, optional
+        Seed for the random selection of the blocks. For ``None``, the
+        global numpy random state is used.
+    callback : callable, optional
+        Function called with the current iterate after each iteration.
+    tol : non-negative float, optional
+        Stop as soon as the residual
+        ``||x_{k+1} - x_k|| + tau * ||z_{k+1} - z_k||`` is at most ``tol``,
+        where ``z`` is the aggregate of the dual variables, see Notes.
+    stopping_rule : callable, optional
+        Function called as ``stopping_rule(info)`` with the `SolverInfo`
+        of the run after each iteration. The iteration stops if it
+        returns ``True``.
+
+    Returns
+    -------
+    info : `SolverInfo`
+        Number of iterations, residuals and timings of the run.
+
+    Notes
+    -----
+    In each iteration, the primal variable is updated as
+
+    .. math::
+        x_{k+1} = \\mathrm{prox}_{\\tau g}(x_k - \\tau \\bar{z}_k),
+
+    and for the selected blocks :math:`i \\in S_k`, the dual variables as
+
+    .. math::
+        y_{k+1, i} = \\mathrm{prox}_{\\sigma_i f_i^*}(
+            y_{k, i} + \\sigma_i L_i x_{k+1}).
+
+    The aggregate :math:`z_k = \\sum_i L_i^* y_{k, i}` is updated
+    incrementally with :math:`\\Delta z = \\sum_{i \\in S_k}
+    L_i^*(y_{k+1, i} - y_{k, i})`, and the extrapolation is
+    :math:`\\bar{z}_{k+1} = z_{k+1} + \\theta \\sum_{i \\in S_k}
+    L_i^*(y_{k+1, i} - y_{k, i}) / p_i` with the probability :math:`p_i`
+    that block :math:`i` is selected.
+
+    Convergence is guaranteed if :math:`\\tau \\sigma_i \\|L_i\\|^2 < p_i / b`
+    for all :math:`i`, where :math:`b` is ``batch_size``. The default step
+    sizes are :math:`\\sigma_i = \\gamma / \\|L_i\\|` and
+    :math:`\\tau = \\gamma \\min_i p_i / (b \\|L_i\\|)`, which reduces to
+    :math:`\\tau = \\gamma / \\sum_i \\|L_i\\|` for importance sampling.
+
+    The method is described in [CERS2018].
+
+    References
+    ----------
+    [CERS2018] Chambolle, A, Ehrhardt, M J, Richtarik, P, and Schoenlieb,
+    C-B. *Stochastic Primal-Dual Hybrid Gradient Algorithm with Arbitrary
+    Sampling and Imaging Applications*. SIAM Journal on Optimization, 28
+    (2018), pp 2783-2808.
+    """
+    funcs, ops = _spdhg_blocks(f, L)
+    nblocks = len(ops)
+    domain = ops[0].domain
+
+    # Starting point
+    if x not in domain:
+        raise TypeError('`x` {!r} is not in the domain of `L` {!r}'
+                        ''.format(x, domain))
+
+    # Number of iterations
+    if not isinstance(niter, int) or niter < 0:
+        raise ValueError('`niter` {} not understood'
+                         ''.format(niter))
+
+    # Sampling
+    sampling = str(kwargs.pop('sampling', 'uniform')).lower()
+    if sampling not in ('uniform', 'importance'):
+        raise ValueError('`sampling` {!r} not understood'.format(sampling))
+
+    batch_size = int(kwargs.pop('batch_size', 1))
+    if not 1 <= batch_size <= nblocks:
+        raise ValueError('`batch_size` must be in [1, {}], got {}'
+                         ''.format(nblocks, batch_size))
+
+    prob = kwargs.pop('prob', None)
+    if batch_size > 1 and (sampling != 'uniform' or prob is not None):
+        raise ValueError('`batch_size > 1` is only supported for uniform '
+                         'sampling')
+
+    gamma = float(kwargs.pop('gamma', 0.99))
+    if not 0 < gamma < 1:
+        raise ValueError('`gamma` {} not in (0, 1)'.format(gamma))
+
+    theta = float(kwargs.pop('theta', 1))
+    if not 0 <= theta <= 1:
+        raise ValueError('`theta` {} not in [0, 1]'.format(theta))
+
+    # Block norms, only computed if needed
+    block_norms = kwargs.pop('block_norms', None)
+    need_norms = (tau is None or sigma is None or
+                  (sampling == 'importance' and prob is None))
+    if block_norms is not None:
+        block_norms = np.array(block_norms, dtype=float)
+        if block_norms.shape != (nblocks,) or np.any(block_norms <= 0):
+            raise ValueError('`block_norms` must be {} positive values, got '
+                             '{!r}'.format(nblocks, block_norms))
+    elif need_norms:
+        block_norms = np.array([op.norm(estimate=True) for op in ops])
+
+    # Selection probabilities
+    if prob is not None:
+        prob = np.array(prob, dtype=float)
+        if (prob.shape != (nblocks,) or np.any(prob <= 0) or
+                not np.isclose(np.sum(prob), 1)):
+            raise ValueError('`prob` must be {} positive values summing '
+                             'to 1, got {!r}'.format(nblocks, prob))
+        choice_prob = prob
+    elif sampling == 'importance':
+        prob = choice_prob = block_norms / np.sum(block_norms)
+    else:
+        prob = np.full(nblocks, batch_size / nblocks)
+        choice_prob = None
+
+    # Step sizes
+    if sigma is None:
+        sigma = gamma / block_norms
+    else:
+        sigma = np.array(sigma, dtype=float)
+        if sigma.shape != (nblocks,) or np.any(sigma <= 0):
+            raise ValueError('`sigma` must be {} positive values, got {!r}'
+                             ''.format(nblocks, sigma))
+    if tau is None:
+        tau = gamma * np.min(prob / block_norms) / batch_size
+    tau, tau_in = float(tau), tau
+    if tau <= 0:
+        raise ValueError('`tau` must be positive, got {}'.format(tau_in))
+
+    # Callback object
+    callback = kwargs.pop('callback', None)
+    if callback is not None and not callable(callback):
+        raise TypeError('`callback` {} is not callable'
+                        ''.format(callback))
+
+    # Initialize the dual variable
+    y = kwargs.pop('y', None)
+    if y is None:
+        y = [op.range.zero() for op in ops]
+    elif len(y) != nblocks or any(yi not in op.range
+                                  for yi, op in zip(y, ops)):
+        raise TypeError('`y` {!r} is not in the range of `L`'.format(y))
+
+    seed = kwargs.pop('seed', None)
+    if seed is None:
+        rng = np.random
+    else:
+        rng = np.random.RandomState(seed)
+
+    info = SolverInfo(kwargs.pop('tol', None),
+                      kwargs.pop('stopping_rule', None))
+    if kwargs:
+        raise TypeError('unexpected keyword arguments {}'
+                        ''.format(list(kwargs)))
+
+    # Pre-compute the proximals and adjoints for efficiency
+    proximal_primal_tau = g.proximal(tau)
+    proximal_duals = [func.convex_conj.proximal(sig)
+                      for func, sig in zip(funcs, sigma)]
+    adjoints = [op.adjoint for op in ops]
+
+    # Aggregate z = sum_i L_i^* y_i and its extrapolation
+    z = domain.zero()
+    primal_tmp = domain.element()
+    for adj, yi in zip(adjoints, y):
+        adj(yi, out=primal_tmp)
+        z += primal_tmp
+    z_relax = z.copy()
+    dz = domain.element()
+
+    # Previous iterate, only needed for the residual
+    if info.monitoring:
+        x_old = domain.element()
+
+    # Dual temporaries, shared between blocks with the same range
+    dual_tmps = {}
+    for op in ops:
+        if op.range not in dual_tmps:
+            dual_tmps[op.range] = (op.range.element(), op.range.element())
+
+    for _ in range(niter):
+        if info.monitoring:
+            x_old.assign(x)
+
+        # Primal step x = prox[tau * g](x - tau * z_relax)
+        primal_tmp.lincomb(1, x, -tau, z_relax)
+        proximal_primal_tau(primal_tmp, out=x)
+
+        # Select the dual blocks
+        if batch_size == 1:
+            blocks = [rng.choice(nblocks, p=choice_prob)]
+        else:
+            blocks = rng.choice(nblocks, batch_size, replace=False)
+
+        # Dual step and incremental update of the aggregate, the primal
+        # temporary accumulates its change for the residual
+        z_relax.assign(z)
+        if info.monitoring:
+            primal_tmp.set_zero()
+        for i in blocks:
+            y_old, dual_tmp = dual_tmps[ops[i].range]
+            y_old.assign(y[i])
+
+            # y_i = prox[sigma_i * f_i^*](y_i + sigma_i * L_i(x))
+            ops[i](x, out=dual_tmp)
+            dual_tmp.lincomb(1, y_old, sigma[i], dual_tmp)
+            proximal_duals[i](dual_tmp, out=y[i])
+
+            # dz = L_i^*(y_i - y_old_i)
+            dual_tmp.lincomb(1, y[i], -1, y_old)
+            adjoints[i](dual_tmp, out=dz)
+
+            z += dz
+            z_relax.lincomb(1, z_relax, 1 + theta / prob[i], dz)
+            if info.monitoring:
+                primal_tmp += dz
+
+        if callback is not None:
+            callback(x)
+
+        if info.monitoring:
+            x_old.lincomb(1, x, -1, x_old)
+            residual = x_old.norm() + tau * primal_tmp.norm()
+        else:
+            residual = None
+        if info.update(residual):
+            break
+
+    return info
+
+
+if __name__ == '__main__':
+    # pylint: disable=wrong-import-position
+    from odl.util.testutils import run_doctests
+    run_doctests()
@@ -19,8 +19,13 @@ from odl.solvers.iterative.iterative import conjugate_gradient
 __all__ = ('newtons_method', 'bfgs_method', 'broydens_method')
 
 
-def _bfgs_direction(s, y, x, hessinv_estimate=None):
-    """Compute ``Hn^-1(x)`` for the L-BFGS method.
+def _bfgs_direction(s, y, rhos, order, x, out, hessinv_estimate=None,
+                    tmp=None):
+    """Compute ``-Hn^-1(x)`` for the L-BFGS method in-place.
+
+    This is the two-loop recursion, see [NW2006], Algorithm 7.4. It
+    only uses ``out`` (and ``tmp`` if ``hessinv_estimate`` is given) as
+    work memory, hence no new space elements are created.
 
     Parameters
     ----------
@@ -28,15 +33,25 @@ def _bfgs_direction(s, y, x, hessinv_estimate=None):
         The ``s`` coefficients in the BFGS update, see Notes.
     y : sequence of `LinearSpaceElement`
         The ``y`` coefficients in the BFGS update, see Notes.
+    rhos : `numpy.ndarray`
+        The cached values ``1 / <y[i], s[i]>``.
+    order : sequence of int
+        Indices of the stored pairs, from oldest to newest.
     x : `LinearSpaceElement`
         Point in which to evaluate the product.
+    out : `LinearSpaceElement`
+        Element to which the result ``-Hn^-1(x)`` is written. Must not
+        be aliased with ``x``.
     hessinv_estimate : `Operator`, optional
         Initial estimate of the hessian ``H0^-1``.
+    tmp : `LinearSpaceElement`, optional
+        Temporary used for the evaluation of ``hessinv_estimate``.
+        Required if ``hessinv_estimate`` is given.
 
     Returns
     -------
-    r : ``x.space`` element
-        The result of ``Hn^-1(x)``.
+    out : ``x.space`` element
+        The result of ``-Hn^-1(x)``.
 
     Notes
     -----
@@ -50,26 +65,31 @@ def _bfgs_direction(s, y, x, hessinv_estimate=None):
         \\frac{s_n s_n^T}{y_n^T \, s_n}
 
     With :math:`H_0^{-1}` given by ``hess_estimate``.
+
+    References
+    ----------
+    [NW2006] Nocedal, J, and Wright, S. *Numerical optimization*.
+    Springer, 2006.
     """
-    assert len(s) == len(y)
+    assert len(s) == len(y) == len(rhos)
 
-    r = x.copy()
-    alphas = np.zeros(len(s))
-    rhos = np.zeros(len(s))
+    # Work with r = -x to get the negated direction without extra memory
+    out.lincomb(-1, x)
+    alphas = {}
 
-    for i in reversed(range(len(s))):
-        rhos[i] = 1.0 / y[i].inner(s[i])
-        alphas[i] = rhos[i] * (s[i].inner(r))
-        r.lincomb(1, r, -alphas[i], y[i])
+    for i in reversed(order):
+        alphas[i] = rhos[i] * s[i].inner(out)
+        out.lincomb(1, out, -alphas[i], y[i])
 
     if hessinv_estimate is not None:
-        r = hessinv_estimate(r)
+        hessinv_estimate(out, out=tmp)
+        out.assign(tmp)
 
-    for i in range(len(s)):
-        beta = rhos[i] * (y[i].inner(r))
-        r.lincomb(1, r, alphas[i] - beta, s[i])
+    for i in order:
+        beta = rhos[i] * y[i].inner(out)
+        out.lincomb(1, out, alphas[i] - beta, s[i])
 
-    return r
+    return out
 
 
 def _broydens_direction(s, y, x, hessinv_estimate=None, impl='first'):
@@ -292,7 +312,10 @@ Goldfarb%E2%80%93Shanno_algorithm>`_
     num_store : int, optional
         Maximum number of correction factors to store. For ``None``, the method
         is the regular BFGS method. For an integer, the method becomes the
-        Limited Memory BFGS method.
+        Limited Memory BFGS method. In this case, at most ``2 * num_store``
+        correction elements are allocated and then reused in a ring
+        buffer, such that the memory usage is bounded and no new
+        elements are created after the first ``num_store`` iterations.
     hessinv_estimate : `Operator`, optional
         Initial estimate of the inverse of the Hessian operator. Needs to be an
         operator from ``f.domain`` to ``f.domain``.
@@ -313,26 +336,79 @@ Goldfarb%E2%80%93Shanno_algorithm>`_
     if not callable(line_search):
         line_search = ConstantLineSearch(line_search)
 
-    ys = []
+    if num_store is not None:
+        num_store, num_store_in = int(num_store), num_store
+        if num_store != num_store_in or num_store < 0:
+            raise ValueError('`num_store` must be a nonnegative integer or '
+                             '`None`, got {!r}'.format(num_store_in))
+
+    # Correction pairs are kept in a ring buffer: `ss[i]`, `ys[i]` and
+    # `rhos[i] = 1 / <ys[i], ss[i]>` for i in `order`, oldest first. The
+    # buffer grows up to `num_store` pairs, after which the slot of the
+    # oldest pair is overwritten by the newest one.
+    space = x.space
     ss = []
+    ys = []
+    rhos = np.empty(0)
+    start = 0
+    count = 0
 
+    search_dir = space.element()
     grad_x = grad(x)
+    grad_old = space.element()
+    if hessinv_estimate is not None:
+        tmp = space.element()
+    else:
+        tmp = None
+
     for i in range(maxiter):
         # Determine a stepsize using line search
-        search_dir = -_bfgs_direction(ss, ys, grad_x, hessinv_estimate)
+        order = [(start + k) % len(ss) for k in range(count)]
+        _bfgs_direction(ss, ys, rhos, order, grad_x, out=search_dir,
+                        hessinv_estimate=hessinv_estimate, tmp=tmp)
         dir_deriv = search_dir.inner(grad_x)
         if np.abs(dir_deriv) == 0:
             return  # we found an optimum
         step = line_search(x, direction=search_dir, dir_derivative=dir_deriv)
 
+        # Choose the slot for the new correction pair. Nothing is stored
+        # yet, so overwriting the oldest pair is safe since the memory
+        # is either updated or cleared below.
+        if count < len(ss):
+            new = (start + count) % len(ss)
+        elif num_store is None or len(ss) < num_store:
+            ss.append(space.element())
+            ys.append(space.element())
+            rhos = np.append(rhos, 0.0)
+            new = len(ss) - 1
+        elif num_store > 0:
+            new = start
+        else:
+            new = None
+
         # Update x
-        x_update = search_dir
-        x_update *= step
+        if new is None:
+            x_update = search_dir
+            x_update *= step
+        else:
+            x_update = ss[new]
+            x_update.lincomb(step, search_dir)
         x += x_update
 
-        grad_x, grad_diff = grad(x), grad_x
-        # grad_diff = grad(x) - grad(x_old)
-        grad_diff.lincomb(-1, grad_diff, 1, grad_x)
+        grad_x, grad_old = grad_old, grad_x
+        grad(x, out=grad_x)
+
+        if new is None:
+            # Memoryless method, only the gradient norm is needed
+            if grad_x.norm() < tol:
+                return
+            if callback is not None:
+                callback(x)
+            continue
+
+        # y = grad(x) - grad(x_old)
+        grad_diff = ys[new]
+        grad_diff.lincomb(1, grad_x, -1, grad_old)
 
         y_inner_s = grad_diff.inner(x_update)
 
@@ -342,17 +418,16 @@ Goldfarb%E2%80%93Shanno_algorithm>`_
                 return
             else:
                 # Reset if needed
-                ys = []
-                ss = []
+                start = count = 0
                 continue
 
         # Update Hessian
-        ys.append(grad_diff)
-        ss.append(x_update)
-        if num_store is not None:
-            # Throw away factors if they are too many.
-            ss = ss[-num_store:]
-            ys = ys[-num_store:]
+        rhos[new] = 1.0 / y_inner_s
+        if count < len(ss):
+            count += 1
+        else:
+            # Throw away the oldest factor
+            start = (start + 1) % len(ss)
 
         if callback is not None:
             callback(x)
@@ -0,0 +1,236 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Checkpointing and warm starts of iterative methods."""
+
+# Imports for common Python 2/3 codebase
+from __future__ import print_function, division, absolute_import
+from past.builtins import basestring
+import os
+
+import numpy as np
+
+from odl.space.pspace import ProductSpace
+
+
+__all__ = ('SolverState',)
+
+
+# Separator in the keys of the parts of product space elements
+_PART_SEP = '.'
+
+
+class SolverState(dict):
+
+    """Internal variables of an iterative method.
+
+    Solvers with a ``state`` parameter store all variables needed to
+    continue the iteration in this dictionary, e.g., dual variables, step
+    sizes and the number of performed iterations. The space elements in
+    the state are the ones the solver works with, hence keeping a state
+    causes no extra copies.
+
+    Calling the solver again with the same state continues the iteration
+    exactly where it stopped, with the same result as one long run.
+    A state can be saved with `save` at any time between two calls and
+    restored with `load`, e.g., to survive the interruption of a long
+    reconstruction. Passing the state of a solved problem to a similar
+    problem, e.g., the next time frame of a dynamic reconstruction, warm
+    starts the solver with the old iterate and auxiliary variables.
+
+    The iterate ``x`` of the solvers is stored under the key ``'x'``. If
+    present, it overrides the ``x`` given to the solver. Remove the key
+    to warm start only the auxiliary variables.
+    """
+
+    @property
+    def niter(self):
+        """Total number of iterations performed with this state."""
+        return self.get('niter', 0)
+
+    def element(self, key, space, default=None):
+        """Return the value of ``key`` as an element of ``space``.
+
+        Values that are not in ``space``, e.g., arrays from `load`, are
+        converted and replaced by the element, such that in-place updates
+        of the element are reflected in the state.
+
+        Parameters
+        ----------
+        key : str
+            Name of the variable.
+        space : `LinearSpace`
+            Space the variable is an element of.
+        default : callable, optional
+            Function without arguments returning the initial value of the
+            variable if ``key`` is not in the state. Its value is stored.
+            For ``None``, ``space.zero`` is used.
+
+        Returns
+        -------
+        element : ``space`` element
+            The stored element.
+
+        Examples
+        --------
+        >>> state = SolverState()
+        >>> y = state.element('y', odl.rn(3))
+        >>> y += 1
+        >>> state['y']
+        rn(3).element([1.0, 1.0, 1.0])
+        >>> state['y'] = [1, 2, 3]
+        >>> state.element('y', odl.rn(3))
+        rn(3).element([1.0, 2.0, 3.0])
+        """
+        if key in self:
+            value = self[key]
+        elif (isinstance(space, ProductSpace) and
+              _part_key(key, 0) in self):
+            # Parts of a product space element from `load`
+            value = space.element(
+                [self.element(_part_key(key, i), space[i])
+                 for i in range(len(space))])
+            for i in range(len(space)):
+                del self[_part_key(key, i)]
+        elif default is None:
+            value = space.zero()
+        else:
+            value = default()
+
+        if value not in space:
+            if isinstance(value, np.memmap) or (
+                    isinstance(value, np.ndarray) and
+                    not value.flags.writeable):
+                # Do not write to memory-mapped files
+                value = np.array(value)
+            value = space.element(value)
+        self[key] = value
+        return value
+
+    def iterate(self, x):
+        """Store the iterate ``x`` of a solver under the key ``'x'``.
+
+        If the state already contains an iterate, it is first assigned to
+        ``x``.
+
+        Parameters
+        ----------
+        x : `LinearSpaceElement`
+            Iterate of the solver, updated in-place.
+        """
+        if 'x' in self and self['x'] is not x:
+            x.assign(self.element('x', x.space))
+        self['x'] = x
+
+    def save(self, file):
+        """Save the state to a file or directory.
+
+        Space elements are stored as arrays, and elements of product
+        spaces as one array per part.
+
+        Parameters
+        ----------
+        file : str or file-like
+            If a string ending with ``'.npz'`` or a file-like object, the
+            state is saved with `numpy.savez`. Otherwise, ``file`` is a
+            directory to which each variable is saved with `numpy.save`.
+            Such states can be loaded with memory mapping.
+        """
+        arrays = {}
+        for key, value in self.items():
+            _add_arrays(arrays, key, value)
+
+        if not isinstance(file, basestring) or file.endswith('.npz'):
+            np.savez(file, **arrays)
+        else:
+            if not os.path.isdir(file):
+                os.makedirs(file)
+            for key, arr in arrays.items():
+                np.save(os.path.join(file, key + '.npy'), arr)
+
+    @classmethod
+    def load(cls, file, mmap_mode=None):
+        """Return a state saved with `save`.
+
+        Parameters
+        ----------
+        file : str or file-like
+            File or directory passed to `save`.
+        mmap_mode : {None, 'r+', 'r', 'c'}, optional
+            Memory mapping of the arrays, see `numpy.load`. Only used for
+            states saved to a directory. The arrays are copied into space
+            elements when the state is used by a solver.
+
+        Returns
+        -------
+        state : `SolverState`
+            The loaded state. Space elements are arrays until they are
+            requested with `element`.
+
+        Examples
+        --------
+        >>> import io
+        >>> state = SolverState(niter=2, tau=0.5)
+        >>> state.element('y', odl.rn(2) ** 2)
+        ProductSpace(rn(2), 2).element([
+            [0.0, 0.0],
+            [0.0, 0.0]
+        ])
+        >>> file = io.BytesIO()
+        >>> state.save(file)
+        >>> _ = file.seek(0)
+        >>> loaded = SolverState.load(file)
+        >>> loaded.niter, loaded['tau']
+        (2, 0.5)
+        >>> loaded.element('y', odl.rn(2) ** 2) == state['y']
+        True
+        """
+        state = cls()
+        if not isinstance(file, basestring) or not os.path.isdir(file):
+            with np.load(file) as arrays:
+                for key in arrays.files:
+                    state[key] = _from_array(arrays[key])
+        else:
+            for name in sorted(os.listdir(file)):
+                if name.endswith('.npy'):
+                    arr = np.load(os.path.join(file, name),
+                                  mmap_mode=mmap_mode)
+                    state[name[:-len('.npy')]] = _from_array(arr)
+        return state
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return '{}({})'.format(self.__class__.__name__, dict.__repr__(self))
+
+
+def _part_key(key, i):
+    """Return the key of part ``i`` of a product space element."""
+    return '{}{}{}'.format(key, _PART_SEP, i)
+
+
+def _add_arrays(arrays, key, value):
+    """Add ``value`` as array(s) to the dictionary ``arrays``."""
+    if isinstance(getattr(value, 'space', None), ProductSpace):
+        for i, part in enumerate(value):
+            _add_arrays(arrays, _part_key(key, i), part)
+    else:
+        arrays[key] = np.asarray(value)
+
+
+def _from_array(arr):
+    """Return scalars from `numpy.load` as Python scalars."""
+    if arr.ndim == 0:
+        return arr.item()
+    else:
+        return arr
+
+
+if __name__ == '__main__':
+    # pylint: disable=wrong-import-position
+    from odl.util.testutils import run_doctests
+    run_doctests()
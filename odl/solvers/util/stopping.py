@@ -0,0 +1,131 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Stopping criteria and run information for iterative methods."""
+
+# Imports for common Python 2/3 codebase
+from __future__ import print_function, division, absolute_import
+from builtins import object
+import time
+
+
+__all__ = ('SolverInfo',)
+
+
+class SolverInfo(object):
+
+    """Information about the run of an iterative method.
+
+    Solvers with ``tol`` and ``stopping_rule`` parameters return an
+    instance of this class. During the iteration, `update` is called
+    after each step. It records the residual and the time of the step,
+    and it decides whether the iteration should stop.
+
+    The meaning of the residual depends on the solver and is given in
+    its documentation, typically it is the norm of the change of the
+    iterate. Residuals are only computed if ``tol`` or ``stopping_rule``
+    is given, otherwise `residuals` stays empty.
+    """
+
+    def __init__(self, tol=None, stopping_rule=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        tol : non-negative float, optional
+            Stop as soon as the residual is at most ``tol``.
+        stopping_rule : callable, optional
+            Function called as ``stopping_rule(info)`` after each
+            iteration. The iteration stops if it returns ``True``.
+
+        Examples
+        --------
+        Stop when the residual has decreased by a factor of 10:
+
+        >>> info = SolverInfo(
+        ...     stopping_rule=lambda info: (info.residuals[-1] <
+        ...                                 0.1 * info.residuals[0]))
+        >>> for residual in [1.0, 0.5, 0.2, 0.05, 0.01]:
+        ...     if info.update(residual):
+        ...         break
+        >>> info.niter
+        4
+        >>> info.converged
+        True
+        >>> info.residuals
+        [1.0, 0.5, 0.2, 0.05]
+        """
+        if tol is not None:
+            tol, tol_in = float(tol), tol
+            if tol < 0:
+                raise ValueError('`tol` must be non-negative, got {}'
+                                 ''.format(tol_in))
+        if stopping_rule is not None and not callable(stopping_rule):
+            raise TypeError('`stopping_rule` {!r} is not callable'
+                            ''.format(stopping_rule))
+
+        self.tol = tol
+        self.stopping_rule = stopping_rule
+        self.niter = 0
+        self.converged = False
+        self.residuals = []
+        self.times = []
+        self.__last_time = time.time()
+
+    @property
+    def monitoring(self):
+        """``True`` if the solver needs to compute residuals."""
+        return self.tol is not None or self.stopping_rule is not None
+
+    @property
+    def time(self):
+        """Total time in seconds spent in the recorded iterations."""
+        return sum(self.times)
+
+    def update(self, residual=None):
+        """Record one iteration and return ``True`` if the solver should stop.
+
+        Parameters
+        ----------
+        residual : float, optional
+            Residual of the iteration. Required if `monitoring` is
+            ``True``, otherwise ignored.
+
+        Returns
+        -------
+        stop : bool
+            ``True`` if the residual is at most ``tol`` or if
+            ``stopping_rule`` returns ``True``.
+        """
+        now = time.time()
+        self.times.append(now - self.__last_time)
+        self.__last_time = now
+        self.niter += 1
+
+        if not self.monitoring:
+            return False
+
+        residual = float(residual)
+        self.residuals.append(residual)
+        if self.tol is not None and residual <= self.tol:
+            self.converged = True
+        elif self.stopping_rule is not None and self.stopping_rule(self):
+            self.converged = True
+        return self.converged
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        return ('{}(niter={}, converged={}, time={:.3g})'
+                ''.format(self.__class__.__name__, self.niter,
+                          self.converged, self.time))
+
+
+if __name__ == '__main__':
+    # pylint: disable=wrong-import-position
+    from odl.util.testutils import run_doctests
+    run_doctests()
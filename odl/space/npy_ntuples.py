@@ -15,7 +15,11 @@ from builtins import super
 
 import ctypes
 from functools import partial
+from math import fsum
+from multiprocessing.pool import ThreadPool
 from numbers import Integral
+import os
+import threading
 import numpy as np
 import scipy.linalg as linalg
 from scipy.sparse.base import isspmatrix
@@ -42,12 +46,25 @@ _BLAS_DTYPES = (np.dtype('float32'), np.dtype('float64'),
 THRESHOLD_SMALL = 100
 THRESHOLD_MEDIUM = 50000
 
+# Number of entries processed at once in blockwise evaluation. Larger
+# vectors are reduced blockwise to avoid full-size temporaries.
+BLOCK_SIZE = 2 ** 18
+
+# Number of threads used for element-wise operations and reductions on
+# vectors with more than THRESHOLD_THREADS entries. Both can be changed at
+# runtime, the default 1 means single-threaded evaluation.
+NUM_THREADS = 1
+THRESHOLD_THREADS = 2 ** 17
+
+_THREAD_POOL = None
+_THREAD_POOL_LOCK = threading.Lock()
+
 
 class NumpyNtuples(NtuplesBase):
 
     """Set of n-tuples of arbitrary type."""
 
-    def element(self, inp=None, data_ptr=None):
+    def element(self, inp=None, data_ptr=None, memmap=None):
         """Create a new element.
 
         Parameters
@@ -60,8 +77,21 @@ class NumpyNtuples(NtuplesBase):
 
             If ``inp`` is a `numpy.ndarray` of shape ``(size,)``
             and the same data type as this space, the array is wrapped,
-            not copied.
+            not copied. This includes `numpy.memmap` arrays.
             Other `array-like` objects are copied.
+        data_ptr : int, optional
+            Memory address of existing data to be wrapped by the new
+            element. Cannot be combined with ``inp``.
+        memmap : str or file-like, optional
+            File in which the data of the new element is stored as a
+            `numpy.memmap`. An existing file is opened in ``'r+'`` mode
+            and must be large enough to hold ``size`` entries, otherwise
+            the file is created. If ``inp`` is given, it is written to
+            the file block by block.
+
+            Arithmetic, reductions and ufuncs on memory-mapped elements
+            are evaluated in blocks of `BLOCK_SIZE` entries, such that
+            no full in-memory copy is made.
 
         Returns
         -------
@@ -92,7 +122,28 @@ class NumpyNtuples(NtuplesBase):
         >>> y[0] = 5
         >>> print(x)
         [5, 2, 3]
+
+        Storage in a memory-mapped file:
+
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile() as f:
+        ...     x = int3.element([1, 2, 3], memmap=f)
+        ...     print(x)
+        ...     print(isinstance(x.data, np.memmap))
+        [1, 2, 3]
+        True
         """
+        if memmap is not None:
+            if data_ptr is not None:
+                raise ValueError('cannot provide both `memmap` and '
+                                 '`data_ptr`')
+            arr = _open_memmap(memmap, self.size, self.dtype)
+            if inp is not None:
+                inp = self.element(inp)
+                for slc in _block_slices(self.size):
+                    arr[slc] = inp.data[slc]
+            return self.element_type(self, arr)
+
         if inp is None:
             if data_ptr is None:
                 arr = np.empty(self.size, dtype=self.dtype)
@@ -482,11 +533,167 @@ def _blas_is_applicable(*args):
                 for x in args))
 
 
+def _open_memmap(filename, size, dtype):
+    """Return a `numpy.memmap` of shape ``(size,)`` stored in ``filename``.
+
+    An existing file is opened for reading and writing, otherwise a new
+    file is created.
+    """
+    try:
+        exists = os.path.getsize(filename) > 0
+    except (TypeError, OSError):
+        # File-like object or non-existing file
+        exists = False
+    mode = 'r+' if exists else 'w+'
+    return np.memmap(filename, dtype=dtype, mode=mode, shape=(size,))
+
+
+def _is_memmap(*args):
+    """Whether any of the vectors is backed by a memory-mapped file.
+
+    Parameters
+    ----------
+    x1,...,xN : `NumpyNtuplesVector`
+        The vectors to be tested
+    """
+    for x in args:
+        arr = x.data
+        while isinstance(arr, np.ndarray):
+            if isinstance(arr, np.memmap):
+                return True
+            arr = arr.base
+    return False
+
+
+def _block_slices(size, block_size=None):
+    """Yield slices partitioning ``range(size)`` into contiguous blocks.
+
+    Parameters
+    ----------
+    size : int
+        Total number of entries
+    block_size : positive int, optional
+        Number of entries per block, the last block may be smaller.
+        ``None`` means `BLOCK_SIZE`.
+    """
+    if block_size is None:
+        block_size = BLOCK_SIZE
+    for start in range(0, size, block_size):
+        yield slice(start, min(start + block_size, size))
+
+
+def _block_views(slc, *args):
+    """Return the views ``x[slc]`` for all vectors ``x`` in ``args``.
+
+    Identical vectors are mapped to identical views, such that aliasing
+    between the vectors is preserved.
+    """
+    views = {}
+    for x in args:
+        if id(x) not in views:
+            views[id(x)] = x[slc]
+    return [views[id(x)] for x in args]
+
+
+def _use_threads(size):
+    """Whether operations on ``size`` entries should be multi-threaded."""
+    return NUM_THREADS > 1 and size > THRESHOLD_THREADS
+
+
+def _thread_pool():
+    """Return a thread pool with `NUM_THREADS` worker threads.
+
+    The pool is created on first use and re-created if `NUM_THREADS`
+    has changed in the meantime.
+    """
+    global _THREAD_POOL
+    with _THREAD_POOL_LOCK:
+        if _THREAD_POOL is None or _THREAD_POOL[0] != NUM_THREADS:
+            if _THREAD_POOL is not None:
+                _THREAD_POOL[1].close()
+            _THREAD_POOL = (NUM_THREADS, ThreadPool(NUM_THREADS))
+        return _THREAD_POOL[1]
+
+
+def _map_blocks(func, slices):
+    """Return ``[func(slc) for slc in slices]``, possibly multi-threaded.
+
+    ``func`` must only call NumPy or BLAS routines releasing the GIL on
+    disjoint parts of the data to benefit from multiple threads, and it
+    must not call `_map_blocks` itself.
+    """
+    slices = list(slices)
+    if NUM_THREADS > 1 and len(slices) > 1:
+        return _thread_pool().map(func, slices)
+    else:
+        return [func(slc) for slc in slices]
+
+
+def _elementwise_slices(*args):
+    """Return slices for blockwise element-wise evaluation, or ``None``.
+
+    Memory-mapped data is split into blocks of `BLOCK_SIZE` entries.
+    Otherwise, if multi-threading is enabled and the vectors are large,
+    they are split into `NUM_THREADS` contiguous chunks, one per thread.
+    For all other cases, ``None`` is returned.
+
+    Parameters
+    ----------
+    x1,...,xN : `NumpyNtuplesVector`
+        The vectors involved in the operation
+    """
+    size = args[0].size
+    if size <= min(BLOCK_SIZE, THRESHOLD_THREADS):
+        # Shortcut for the common case of small vectors
+        return None
+    elif any(x.dtype.kind not in 'biufc' for x in args):
+        # Non-numeric data, NumPy does not release the GIL
+        return None
+    elif size > BLOCK_SIZE and _is_memmap(*args):
+        return list(_block_slices(size))
+    elif _use_threads(size):
+        return list(_block_slices(size, -(-size // NUM_THREADS)))
+    else:
+        return None
+
+
 def _lincomb_impl(a, x1, b, x2, out, dtype):
     """Raw linear combination depending on data type."""
+    # Split large problems into parts. Memory-mapped data is processed
+    # block by block such that each block is read from and written to disk
+    # only once, otherwise the parts are distributed over multiple threads.
+    slices = _elementwise_slices(x1, x2, out)
+    if slices is None:
+        _lincomb_impl_serial(a, x1, b, x2, out, dtype)
+    else:
+        def lincomb_block(slc):
+            x1_blk, x2_blk, out_blk = _block_views(slc, x1, x2, out)
+            _lincomb_impl_serial(a, x1_blk, b, x2_blk, out_blk, dtype)
+
+        _map_blocks(lincomb_block, slices)
+
+
+def _elementwise_impl(ufunc, x1, x2, out):
+    """Evaluate ``ufunc(x1, x2, out)``, split into blocks if useful."""
+    slices = _elementwise_slices(x1, x2, out)
+    if slices is None:
+        ufunc(x1.data, x2.data, out=out.data)
+    else:
+        _map_blocks(lambda slc: ufunc(x1.data[slc], x2.data[slc],
+                                      out=out.data[slc]),
+                    slices)
+
+
+def _lincomb_impl_serial(a, x1, b, x2, out, dtype):
+    """Single-threaded linear combination depending on data type."""
     # Convert to native since BLAS needs it
     size = native(x1.size)
 
+    if a == 0 and b == 0:
+        # Zero assignment, independent of the (possibly non-finite) inputs
+        out.data[:] = 0
+        return
+
     # Shortcut for small problems
     if size <= THRESHOLD_SMALL:  # small array optimization
         out.data[:] = a * x1.data + b * x2.data
@@ -520,7 +727,7 @@ def _lincomb_impl(a, x1, b, x2, out, dtype):
 
     if x1 is x2 and b != 0:
         # x1 is aligned with x2 -> out = (a+b)*x1
-        _lincomb_impl(a + b, x1, 0, x1, out, dtype)
+        _lincomb_impl_serial(a + b, x1, 0, x1, out, dtype)
     elif out is x1 and out is x2:
         # All the vectors are aligned -> out = (a+b)*out
         scal(a + b, out.data, size)
@@ -946,7 +1153,7 @@ class NumpyFn(FnBase, NumpyNtuples):
         >>> out
         cn(3).element([(5+1j), (6+3j), (4-8j)])
         """
-        np.multiply(x1.data, x2.data, out=out.data)
+        _elementwise_impl(np.multiply, x1, x2, out)
 
     def _divide(self, x1, x2, out):
         """Entry-wise division of two vectors, assigned to out.
@@ -973,7 +1180,7 @@ class NumpyFn(FnBase, NumpyNtuples):
         >>> out
         rn(3).element([3.0, 2.5, 3.0])
         """
-        np.divide(x1.data, x2.data, out=out.data)
+        _elementwise_impl(np.divide, x1, x2, out)
 
     def __eq__(self, other):
         """Return ``self == other``.
@@ -1400,6 +1607,8 @@ def _norm_default(x):
     if _blas_is_applicable(x):
         nrm2 = linalg.blas.get_blas_funcs('nrm2', dtype=x.dtype)
         norm = partial(nrm2, n=native(x.size))
+    elif x.size > BLOCK_SIZE:
+        return _pnorm_blocks(x.data, 2.0)
     else:
         norm = np.linalg.norm
     return norm(x.data)
@@ -1407,11 +1616,144 @@ def _norm_default(x):
 
 def _pnorm_default(x, p):
     """Default p-norm implementation."""
+    if x.size > BLOCK_SIZE:
+        return _pnorm_blocks(x.data, p)
     return np.linalg.norm(x.data, ord=p)
 
 
+def _fsum(partials):
+    """Return an accurate sum of real or complex partial sums.
+
+    The summation is exact up to the final rounding, see `math.fsum`.
+    """
+    partials = list(partials)
+    if any(isinstance(s, complex) for s in partials):
+        return complex(fsum(s.real for s in partials),
+                       fsum(s.imag for s in partials))
+    else:
+        return fsum(partials)
+
+
+def _reduction_chunks(size):
+    """Return slices of the chunks processed by the individual threads."""
+    if _use_threads(size):
+        return list(_block_slices(size, -(-size // NUM_THREADS)))
+    else:
+        return [slice(0, size)]
+
+
+def _pnorm_blocks(arr, p, w=None, arr2=None):
+    """Blockwise (weighted) p-norm of ``arr`` or ``arr - arr2``.
+
+    The data is processed in blocks of `BLOCK_SIZE` entries, such that
+    the temporary arrays stay in cache and are independent of the size
+    of ``arr``. Within the blocks, NumPy's pairwise summation is used,
+    and the partial sums are added with `math.fsum`.
+
+    For large arrays and `NUM_THREADS` larger than 1, the blocks are
+    distributed over multiple threads.
+
+    Parameters
+    ----------
+    arr : `numpy.ndarray`
+        One-dimensional array whose norm should be computed.
+    p : positive float or ``inf``
+        Exponent of the norm.
+    w : `numpy.ndarray`, optional
+        One-dimensional array of weights.
+    arr2 : `numpy.ndarray`, optional
+        If given, the norm of ``arr - arr2`` is computed.
+
+    Returns
+    -------
+    norm : float
+        The (weighted) norm.
+    """
+    real_dtype = np.empty(0, dtype=arr.dtype).real.dtype
+
+    def chunk_partials(chunk):
+        """Return the partial results for all blocks in ``chunk``."""
+        size = chunk.stop - chunk.start
+        tmp_abs = np.empty(min(size, BLOCK_SIZE), dtype=real_dtype)
+        if arr2 is not None:
+            tmp_diff = np.empty(min(size, BLOCK_SIZE), dtype=arr.dtype)
+
+        partials = []
+        for blk_slc in _block_slices(size):
+            slc = slice(chunk.start + blk_slc.start,
+                        chunk.start + blk_slc.stop)
+            n = slc.stop - slc.start
+            blk = arr[slc]
+            if arr2 is not None:
+                blk = np.subtract(blk, arr2[slc], out=tmp_diff[:n])
+            blk_abs = np.abs(blk, out=tmp_abs[:n])
+            if np.isfinite(p):
+                if p == 2.0 and w is None:
+                    partials.append(float(np.dot(blk_abs, blk_abs)))
+                    continue
+                elif p != 1.0:
+                    np.power(blk_abs, p, out=blk_abs)
+                if w is not None:
+                    blk_abs *= w[slc]
+                partials.append(float(np.sum(blk_abs)))
+            else:
+                if w is not None:
+                    blk_abs *= w[slc]
+                partials.append(float(np.max(blk_abs)))
+        return partials
+
+    partials = [s for chunk_result in _map_blocks(
+        chunk_partials, _reduction_chunks(arr.size))
+        for s in chunk_result]
+
+    if not partials:
+        return 0.0
+    elif np.isfinite(p):
+        return _fsum(partials) ** (1 / p)
+    else:
+        return max(partials)
+
+
+def _inner_blocks(x1, x2, w=None):
+    """Blockwise (weighted) inner product of ``x1`` and ``x2``.
+
+    Only one block-sized temporary per thread is needed for the
+    weighting, and the partial inner products are added with
+    `math.fsum`.
+    """
+    if w is not None:
+        tmp_dtype = np.result_type(x1.dtype, w.dtype)
+
+    def chunk_partials(chunk):
+        """Return the partial results for all blocks in ``chunk``."""
+        size = chunk.stop - chunk.start
+        if w is not None:
+            tmp = np.empty(min(size, BLOCK_SIZE), dtype=tmp_dtype)
+
+        partials = []
+        for blk_slc in _block_slices(size):
+            slc = slice(chunk.start + blk_slc.start,
+                        chunk.start + blk_slc.stop)
+            blk = x1.data[slc]
+            if w is not None:
+                blk = np.multiply(blk, w[slc],
+                                  out=tmp[:slc.stop - slc.start])
+            if is_real_dtype(x1.dtype):
+                partials.append(float(np.dot(x2.data[slc], blk)))
+            else:
+                partials.append(complex(np.vdot(x2.data[slc], blk)))
+        return partials
+
+    return _fsum(s for chunk_result in _map_blocks(
+        chunk_partials, _reduction_chunks(x1.size))
+        for s in chunk_result)
+
+
 def _pnorm_diagweight(x, p, w):
     """Diagonally weighted p-norm implementation."""
+    if x.size > BLOCK_SIZE:
+        return _pnorm_blocks(x.data, p, w=np.asarray(w))
+
     # This is faster than first applying the weights and then summing with
     # BLAS dot or nrm2
     xp = np.abs(x.data)
@@ -1518,6 +1860,21 @@ class NumpyFnMatrixWeighting(MatrixWeighting):
 
             Default: False
 
+        precomp_mat_factor : bool, optional
+            If ``True``, precompute the factorization ``W = R^H R``
+            during initialization. For exponent 2.0, norms and distances
+            are then computed as ``||R x||``, which needs only one
+            (sparse) triangular matrix-vector product. This also works
+            for sparse matrices.
+
+            Default: False
+
+        cache_mat_factor : bool, optional
+            If ``True``, cache the factorization ``W = R^H R`` once it
+            has been computed by ``matrix_factor`` or ``is_valid``.
+
+            Default: True
+
         Notes
         -----
         The matrix power ``W ** (1/p)`` is computed with by eigenbasis
@@ -1550,7 +1907,8 @@ class NumpyFnMatrixWeighting(MatrixWeighting):
                                       'exponent != 2 (got {})'
                                       ''.format(self.exponent))
         else:
-            inner = _inner_default(x1.space.element(self.matrix.dot(x1)), x2)
+            inner = _inner_default(
+                x1.space.element(self.matrix.dot(x1.data)), x2)
             if is_real_dtype(x1.dtype):
                 return float(inner)
             else:
@@ -1570,7 +1928,13 @@ class NumpyFnMatrixWeighting(MatrixWeighting):
             The norm of the vector
         """
         if self.exponent == 2.0:
-            norm_squared = self.inner(x, x).real  # TODO: optimize?
+            if self._mat_factor is not None:
+                # ||x||_W^2 = <R^H R x, x> = ||R x||^2
+                return float(_norm_default(
+                    x.space.element(self._mat_factor.dot(x.data))))
+            norm_squared = self.inner(x, x).real
+            if norm_squared < 0:
+                norm_squared = 0.0  # Compensate for numerical error
             return np.sqrt(norm_squared)
 
         if self._mat_pow is None:
@@ -1697,7 +2061,10 @@ class NumpyFnArrayWeighting(ArrayWeighting):
                                       'exponent != 2 (got {})'
                                       ''.format(self.exponent))
         else:
-            inner = _inner_default(x1 * self.array, x2)
+            if x1.size > BLOCK_SIZE:
+                inner = _inner_blocks(x1, x2, w=np.asarray(self.array))
+            else:
+                inner = _inner_default(x1 * self.array, x2)
             if is_real_dtype(x1.dtype):
                 return float(inner)
             else:
@@ -1724,6 +2091,26 @@ class NumpyFnArrayWeighting(ArrayWeighting):
         else:
             return float(_pnorm_diagweight(x, self.exponent, self.array))
 
+    def dist(self, x1, x2):
+        """Calculate the array-weighted distance between two vectors.
+
+        Parameters
+        ----------
+        x1, x2 : `NumpyFnVector`
+            Vectors whose mutual distance is calculated
+
+        Returns
+        -------
+        dist : float
+            The distance between the vectors
+        """
+        if not self.dist_using_inner and x1.size > BLOCK_SIZE:
+            return float(_pnorm_blocks(x1.data, self.exponent,
+                                       w=np.asarray(self.array),
+                                       arr2=x2.data))
+        else:
+            return super().dist(x1, x2)
+
 
 class NumpyFnConstWeighting(ConstWeighting):
 
@@ -1855,6 +2242,12 @@ class NumpyFnConstWeighting(ConstWeighting):
             if dist_squared < 0.0:  # Compensate for numerical error
                 dist_squared = 0.0
             return np.sqrt(self.const) * float(np.sqrt(dist_squared))
+        elif x1.size > BLOCK_SIZE:
+            dist = _pnorm_blocks(x1.data, self.exponent, arr2=x2.data)
+            if self.exponent == float('inf'):
+                return self.const * float(dist)
+            else:
+                return self.const ** (1 / self.exponent) * float(dist)
         elif self.exponent == 2.0:
             return np.sqrt(self.const) * _norm_default(x1 - x2)
         elif self.exponent == float('inf'):
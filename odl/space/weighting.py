@@ -243,6 +243,20 @@ class MatrixWeighting(Weighting):
 
             Default: ``False``
 
+        precomp_mat_factor : bool, optional
+            If ``True``, precompute the factorization ``W = R^H R``
+            during initialization, see `matrix_factor`. If available,
+            the factor is used to compute norms and distances for
+            exponent 2.0.
+
+            Default: ``False``
+
+        cache_mat_factor : bool, optional
+            If ``True``, cache the factorization ``W = R^H R`` once it
+            has been computed, e.g. by `matrix_factor` or `is_valid`.
+
+            Default: ``True``
+
         Notes
         -----
         The matrix power ``W ** (1/p)`` is computed by eigenbasis
@@ -260,6 +274,8 @@ class MatrixWeighting(Weighting):
         precomp_mat_pow = kwargs.pop('precomp_mat_pow', False)
         self._cache_mat_pow = bool(kwargs.pop('cache_mat_pow', True))
         self._cache_mat_decomp = bool(kwargs.pop('cache_mat_decomp', False))
+        precomp_mat_factor = kwargs.pop('precomp_mat_factor', False)
+        self._cache_mat_factor = bool(kwargs.pop('cache_mat_factor', True))
         super().__init__(impl=impl, exponent=exponent,
                          dist_using_inner=dist_using_inner)
 
@@ -300,6 +316,10 @@ class MatrixWeighting(Weighting):
         else:
             self._mat_pow = None
 
+        self._mat_factor = None
+        if precomp_mat_factor:
+            self.matrix_factor(cache=True)
+
     @property
     def matrix(self):
         """Weighting matrix of this inner product."""
@@ -316,21 +336,73 @@ class MatrixWeighting(Weighting):
 
         If the matrix decomposition is available, this test checks
         if all eigenvalues are positive.
-        Otherwise, the test tries to calculate a Cholesky decomposition,
-        which can be very time-consuming for large matrices. Sparse
-        matrices are not supported.
+        Otherwise, the test tries to calculate the factorization
+        ``W = R^H R`` (see `matrix_factor`), which can be very
+        time-consuming for large matrices. The factor is cached if
+        ``cache_mat_factor`` was set during initialization.
         """
         if self.matrix_issparse:
-            raise NotImplementedError('validation not supported for sparse '
-                                      'matrices')
+            if (self.matrix != self.matrix.conj().T).nnz != 0:
+                return False
         elif self._eigval is not None:
             return np.all(np.greater(self._eigval, 0))
+        elif not np.array_equal(self.matrix, self.matrix.conj().T):
+            return False
+
+        try:
+            self.matrix_factor()
+        except np.linalg.LinAlgError:
+            return False
         else:
-            try:
-                np.linalg.cholesky(self.matrix)
-                return np.array_equal(self.matrix, self.matrix.conj().T)
-            except np.linalg.LinAlgError:
-                return False
+            return True
+
+    def matrix_factor(self, cache=None):
+        """Compute a factorization ``W = R^H R`` of the matrix.
+
+        For dense matrices, ``R`` is the upper triangular Cholesky
+        factor. For sparse matrices, a sparse LDL^H factorization with
+        fill-in reducing permutation ``P`` is computed, i.e.,
+        ``P W P^T = L D L^H``, and ``R = D^{1/2} L^H P``.
+
+        Parameters
+        ----------
+        cache : bool or None, optional
+            If ``True``, store the factor internally. For None,
+            the ``cache_mat_factor`` from class initialization is used.
+
+        Returns
+        -------
+        factor : `numpy.ndarray` or `scipy.sparse.spmatrix`
+            The factor ``R``. It is sparse if and only if the matrix
+            is sparse.
+
+        Raises
+        ------
+        numpy.linalg.LinAlgError
+            If the matrix is not positive definite.
+
+        See Also
+        --------
+        scipy.linalg.cholesky : Dense factorization
+        scipy.sparse.linalg.splu : Sparse factorization
+        """
+        # Lazy import to improve `import odl` time
+        import scipy.linalg
+
+        if self._mat_factor is not None:
+            return self._mat_factor
+
+        if cache is None:
+            cache = self._cache_mat_factor
+
+        if self.matrix_issparse:
+            factor = _sparse_ldl_factor(self.matrix)
+        else:
+            factor = scipy.linalg.cholesky(self.matrix, lower=False)
+
+        if cache:
+            self._mat_factor = factor
+        return factor
 
     def matrix_decomp(self, cache=None):
         """Compute a Hermitian eigenbasis decomposition of the matrix.
@@ -359,7 +431,7 @@ class MatrixWeighting(Weighting):
         Raises
         ------
         NotImplementedError
-            if the matrix is sparse (not supported by scipy 0.17)
+            if the matrix is sparse, use `matrix_factor` instead
         """
         # Lazy import to improve `import odl` time
         import scipy.linalg
@@ -367,7 +439,9 @@ class MatrixWeighting(Weighting):
 
         # TODO: fix dead link `scipy.linalg.decomp.eigh`
         if self.matrix_issparse:
-            raise NotImplementedError('sparse matrix not supported')
+            raise NotImplementedError('eigenbasis decomposition not '
+                                      'supported for sparse matrices, '
+                                      'use `matrix_factor` instead')
 
         if cache is None:
             cache = self._cache_mat_decomp
@@ -515,6 +589,41 @@ class MatrixWeighting(Weighting):
                                                             self.matrix)
 
 
+def _sparse_ldl_factor(matrix):
+    """Return ``R`` with ``matrix = R^H R`` for a sparse Hermitian matrix.
+
+    The factor is computed from a sparse LU factorization with symmetric
+    fill-in reducing permutation ``P`` and no pivoting, which yields
+    ``P W P^T = L U = L D L^H`` for Hermitian ``W``.
+
+    Raises
+    ------
+    numpy.linalg.LinAlgError
+        If ``matrix`` is not positive definite.
+    """
+    # Lazy import to improve `import odl` time
+    import scipy.sparse
+    import scipy.sparse.linalg
+
+    n = matrix.shape[0]
+    try:
+        lu = scipy.sparse.linalg.splu(
+            scipy.sparse.csc_matrix(matrix), permc_spec='MMD_AT_PLUS_A',
+            diag_pivot_thresh=0, options={'SymmetricMode': True})
+    except RuntimeError as err:  # singular matrix
+        raise np.linalg.LinAlgError(str(err))
+
+    diag = lu.U.diagonal()
+    if (not np.array_equal(lu.perm_r, lu.perm_c) or
+            not np.all(np.greater(diag.real, 0))):
+        raise np.linalg.LinAlgError('matrix is not positive definite')
+
+    perm = scipy.sparse.csc_matrix((np.ones(n), (lu.perm_r, np.arange(n))))
+    factor = scipy.sparse.diags(np.sqrt(diag.real)).dot(
+        lu.L.conj().T).dot(perm)
+    return factor.tocsr().astype(matrix.dtype)
+
+
 class ArrayWeighting(Weighting):
 
     """Weighting of a space by an array.
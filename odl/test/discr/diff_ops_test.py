@@ -14,7 +14,8 @@ import numpy as np
 
 import odl
 from odl.discr.diff_ops import (
-    finite_diff, PartialDerivative, Gradient, Divergence, Laplacian)
+    finite_diff, PartialDerivative, Gradient, Divergence, Laplacian,
+    SymmetrizedGradient, Hessian)
 from odl.util.testutils import (
     all_equal, all_almost_equal, almost_equal, noise_element, simple_fixture)
 
@@ -424,5 +425,104 @@ def test_laplacian(space, padding):
     assert almost_equal(lhs, rhs, places=4)
 
 
+def test_diff_ops_single_precision(padding):
+    """Operators on float32 spaces agree with float64 and stay float32."""
+    if isinstance(padding, tuple):
+        pad_mode, pad_const = padding
+    else:
+        pad_mode, pad_const = padding, 0
+
+    space = odl.uniform_discr([0, 0], [1, 1], (6, 4), dtype='float64')
+    space_32 = odl.uniform_discr([0, 0], [1, 1], (6, 4), dtype='float32')
+    ops = [Gradient(space, pad_mode=pad_mode, pad_const=pad_const),
+           Divergence(range=space, pad_mode=pad_mode, pad_const=pad_const)]
+    ops_32 = [Gradient(space_32, pad_mode=pad_mode, pad_const=pad_const),
+              Divergence(range=space_32, pad_mode=pad_mode,
+                         pad_const=pad_const)]
+    if pad_mode not in ('order1', 'order2'):
+        ops.append(Laplacian(space, pad_mode=pad_mode, pad_const=pad_const))
+        ops_32.append(Laplacian(space_32, pad_mode=pad_mode,
+                                pad_const=pad_const))
+
+    for op, op_32 in zip(ops, ops_32):
+        x = noise_element(op.domain)
+        x_32 = op_32.domain.element(x)
+        result_32 = op_32(x_32)
+        assert result_32.dtype == 'float32'
+        assert all_almost_equal(result_32, op(x), places=4)
+
+        # In-place evaluation writes to the given element
+        out_32 = op_32.range.element()
+        assert op_32(x_32, out=out_32) is out_32
+        assert all_almost_equal(out_32, result_32)
+
+
+def test_symmetrized_gradient(method, padding):
+    """Symmetrized gradient of vector fields."""
+    if isinstance(padding, tuple):
+        pad_mode, pad_const = padding
+        if pad_const != 0:
+            return  # only zero padding supported
+    else:
+        pad_mode = padding
+
+    for ndim in (1, 2, 3):
+        space = odl.uniform_discr([0] * ndim, [1] * ndim, [4, 5, 6][:ndim])
+        vfspace = odl.ProductSpace(space, ndim)
+        sym_grad = SymmetrizedGradient(vfspace, method=method,
+                                       pad_mode=pad_mode)
+        assert len(sym_grad.range) == ndim * (ndim + 1) // 2
+        assert SymmetrizedGradient(range=sym_grad.range).domain == vfspace
+
+        # Reference assembled from partial derivatives
+        partial = [PartialDerivative(space, axis, method=method,
+                                     pad_mode=pad_mode)
+                   for axis in range(ndim)]
+        v = noise_element(vfspace)
+        result = sym_grad(v)
+        k = 0
+        for i in range(ndim):
+            assert all_almost_equal(result[k], partial[i](v[i]))
+            k += 1
+        for i in range(ndim):
+            for j in range(i + 1, ndim):
+                expected = 0.5 * (partial[i](v[j]) + partial[j](v[i]))
+                assert all_almost_equal(result[k], expected)
+                k += 1
+
+        # The weighted range reproduces the norm of the full tensor
+        full_norm_sq = sum(
+            (0.5 * (partial[i](v[j]) + partial[j](v[i]))).norm() ** 2
+            for i in range(ndim) for j in range(ndim))
+        assert almost_equal(result.norm() ** 2, full_norm_sq)
+
+        # Adjoint
+        w = noise_element(sym_grad.range)
+        assert almost_equal(result.inner(w), v.inner(sym_grad.adjoint(w)),
+                            places=4)
+        assert sym_grad.adjoint.adjoint is sym_grad
+
+
+def test_hessian():
+    """Hessian as symmetrized gradient of the gradient."""
+    space = odl.uniform_discr([0, 0], [1, 1], (5, 6))
+    hess = Hessian(space)
+    assert Hessian(range=hess.range).domain == space
+
+    grad = Gradient(space, method='forward', pad_mode='symmetric')
+    sym_grad = SymmetrizedGradient(grad.range, method='backward',
+                                   pad_mode='symmetric')
+    x = noise_element(space)
+    assert all_almost_equal(hess(x), sym_grad(grad(x)))
+
+    out = hess.range.element()
+    hess(x, out=out)
+    assert all_almost_equal(out, sym_grad(grad(x)))
+
+    y = noise_element(hess.range)
+    assert almost_equal(hess(x).inner(y), x.inner(hess.adjoint(y)),
+                        places=4)
+
+
 if __name__ == '__main__':
     pytest.main([str(__file__.replace('\\', '/')), '-v'])
@@ -369,6 +369,60 @@ def test_linear_composition():
     assert all_almost_equal(C.adjoint(yvec), np.dot(B.T, np.dot(A.T, y)))
 
 
+def test_persistent_tmp(monkeypatch):
+    space = odl.rn(3)
+    Aop = MatrixOperator(np.random.rand(3, 3))
+    Bop = MatrixOperator(np.random.rand(3, 3))
+    x = noise_element(space)
+    out = space.element()
+
+    for op in (OperatorSum(Aop, Bop, persistent_tmp=True),
+               OperatorComp(Aop, Bop, persistent_tmp=True)):
+        workspace = getattr(op, '_{}__workspace'.format(type(op).__name__))
+        expected = op(x)
+        assert not workspace.is_allocated
+        op(x, out=out)
+        assert all_almost_equal(out, expected)
+        assert workspace.is_allocated
+        op(x, out=out)
+        assert all_almost_equal(out, expected)
+
+        # Setting is inherited by the adjoint
+        assert op.adjoint.persistent_tmp
+
+    # Module-level default
+    op = Aop * Bop
+    assert not op.persistent_tmp
+    monkeypatch.setattr(odl.operator.operator, 'PERSISTENT_TMP', True)
+    assert op.persistent_tmp
+    op(x, out=out)
+    assert op._OperatorComp__workspace.is_allocated
+
+    # Re-entrant evaluation must not share the temporary
+    class ReentrantOperator(Operator):
+
+        def __init__(self):
+            super().__init__(space, space, linear=True)
+            self.comp = None
+            self.depth = 0
+
+        def _call(self, x, out):
+            out.assign(x)
+            if self.depth == 0:
+                self.depth += 1
+                tmp = space.element()
+                self.comp(x, out=tmp)
+                out += tmp
+                self.depth -= 1
+
+    inner = ReentrantOperator()
+    comp = OperatorComp(Aop, inner, persistent_tmp=True)
+    inner.comp = comp
+    result = space.element()
+    comp(x, out=result)
+    assert all_almost_equal(result, Aop(x + Aop(x)))
+
+
 def test_type_errors():
     r3 = odl.rn(3)
     r4 = odl.rn(4)
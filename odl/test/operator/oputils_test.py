@@ -8,14 +8,17 @@
 
 from __future__ import division
 from builtins import super
+from multiprocessing.pool import ThreadPool
 import pytest
 import numpy as np
 
 import odl
-from odl.operator.oputils import matrix_representation, power_method_opnorm
+from odl.operator.oputils import (
+    matrix_representation, power_method_opnorm, lanczos_opnorm,
+    clear_opnorm_cache, as_scipy_operator)
 from odl.space.pspace import ProductSpace
 from odl.operator.pspace_ops import ProductSpaceOperator
-from odl.util.testutils import almost_equal
+from odl.util.testutils import almost_equal, all_almost_equal
 
 
 def test_matrix_representation():
@@ -179,6 +182,119 @@ def test_matrix_representation_wrong_range():
         matrix_representation(nonlin_op)
 
 
+@pytest.mark.parametrize('pad_mode', ['constant', 'symmetric', 'periodic',
+                                      'order1', 'order2_adjoint'])
+def test_matrix_representation_sparsity_pattern(pad_mode):
+    space = odl.uniform_discr([0, 0], [1, 1], (6, 7))
+    ops = [odl.Gradient(space, method='central', pad_mode=pad_mode),
+           odl.Divergence(range=space, method='forward', pad_mode=pad_mode),
+           odl.PartialDerivative(space, axis=1, method='backward',
+                                 pad_mode=pad_mode)]
+    if pad_mode in ('constant', 'symmetric', 'periodic'):
+        ops.append(odl.Laplacian(space, pad_mode=pad_mode))
+
+    for op in ops:
+        # Reference by probing with unit vectors one by one
+        full_pattern = np.ones((_total_size(op.range),
+                                _total_size(op.domain)), dtype=bool)
+        dense = matrix_representation(op, sparsity_pattern=full_pattern)
+        assert all_almost_equal(matrix_representation(op), dense)
+
+        sparse = matrix_representation(op, sparse=True)
+        assert sparse.format == 'csr'
+        assert all_almost_equal(sparse.toarray(), dense)
+
+
+class CountingOperator(odl.Operator):
+
+    """Linear operator wrapper that counts its evaluations."""
+
+    def __init__(self, op):
+        super().__init__(op.domain, op.range, linear=True)
+        self.op = op
+        self.num_calls = 0
+
+    def _call(self, x, out):
+        self.num_calls += 1
+        self.op(x, out=out)
+
+
+def _total_size(space):
+    if isinstance(space, ProductSpace):
+        return sum(spc.size for spc in space)
+    else:
+        return space.size
+
+
+def test_matrix_representation_options():
+    space = odl.rn(4)
+    mat = np.random.rand(3, 4)
+    op = odl.MatrixOperator(mat)
+    assert all_almost_equal(matrix_representation(op), mat)
+    assert all_almost_equal(matrix_representation(op, sparse=True).toarray(),
+                            mat)
+
+    # Operator without known pattern, in batches
+    op = odl.OperatorComp(odl.MatrixOperator(mat), odl.IdentityOperator(space))
+    for batch_size in (1, 3, 4):
+        assert all_almost_equal(
+            matrix_representation(op, batch_size=batch_size), mat)
+    assert all_almost_equal(
+        matrix_representation(op, sparse=True, batch_size=3).toarray(), mat)
+
+    # User-provided pattern, a single probe suffices for a diagonal
+    mat = np.diag([1.0, 2.0, 3.0, 4.0])
+    op = CountingOperator(odl.MatrixOperator(mat))
+    assert all_almost_equal(
+        matrix_representation(op, sparsity_pattern=mat != 0), mat)
+    assert op.num_calls == 1
+
+    with pytest.raises(ValueError):
+        matrix_representation(op, sparsity_pattern=np.ones((3, 3)))
+    with pytest.raises(ValueError):
+        matrix_representation(op, batch_size=0)
+
+
+def test_as_scipy_operator():
+    space = odl.uniform_discr([0, 0], [1, 1], (4, 5))
+    grad = odl.Gradient(space, pad_mode='symmetric')
+    matrix = matrix_representation(grad)
+
+    for executor in (None, ThreadPool(2)):
+        scipy_op = as_scipy_operator(grad, executor=executor)
+        assert scipy_op.shape == matrix.shape
+
+        x = np.random.rand(matrix.shape[1])
+        y = np.random.rand(matrix.shape[0])
+        assert all_almost_equal(scipy_op.matvec(x), matrix.dot(x))
+        assert all_almost_equal(scipy_op.rmatvec(y), matrix.T.dot(y))
+
+        mat = np.random.rand(matrix.shape[1], 3)
+        assert all_almost_equal(scipy_op.matmat(mat), matrix.dot(mat))
+        assert all_almost_equal(scipy_op.matmat(np.asfortranarray(mat)),
+                                matrix.dot(mat))
+
+        mat = np.random.rand(matrix.shape[0], 3)
+        assert all_almost_equal(scipy_op.rmatmat(mat), matrix.T.dot(mat))
+
+        # Input of a different data type is converted
+        x = np.arange(matrix.shape[1])
+        assert all_almost_equal(scipy_op.matvec(x), matrix.dot(x))
+
+    # Matrix operators are applied to matrices directly
+    matrix = np.random.rand(3, 4)
+    scipy_op = as_scipy_operator(odl.MatrixOperator(matrix))
+    mat = np.random.rand(4, 2)
+    assert all_almost_equal(scipy_op.matmat(mat), matrix.dot(mat))
+
+    # Complex matrices use the conjugate transpose in `rmatmat`
+    matrix = np.random.rand(3, 4) + 1j * np.random.rand(3, 4)
+    scipy_op = as_scipy_operator(odl.MatrixOperator(matrix))
+    mat = np.random.rand(3, 2) + 1j * np.random.rand(3, 2)
+    assert all_almost_equal(scipy_op.rmatmat(mat),
+                            matrix.conj().T.dot(mat))
+
+
 def test_power_method_opnorm_symm():
     # Test the power method on a matrix operator
 
@@ -251,5 +367,73 @@ def test_power_method_opnorm_exceptions():
 
         power_method_opnorm(op, maxiter=1, xstart=op.domain.one())
 
+
+def test_lanczos_opnorm():
+    # Singular values 5.5 and 6
+    mat = np.array([[-1.52441557, 5.04276365],
+                    [1.90246927, 2.54424763],
+                    [5.32935411, 0.04573162]])
+    op = odl.MatrixOperator(mat)
+    opnorm_est, upper = lanczos_opnorm(op, seed=42, return_bound=True)
+    assert almost_equal(opnorm_est, 6, places=4)
+    assert upper >= opnorm_est
+
+    # Larger operator, the estimate is a lower bound and the upper bound
+    # tightens with the number of iterations
+    space = odl.uniform_discr(0, 1, 100)
+    grad = odl.Gradient(space)
+    true_opnorm = np.linalg.norm(matrix_representation(grad), 2)
+    opnorm_est, upper = lanczos_opnorm(grad, seed=0, rtol=0, maxiter=100,
+                                       return_bound=True)
+    assert opnorm_est <= true_opnorm * (1 + 1e-10)
+    assert almost_equal(opnorm_est, true_opnorm, places=3)
+    assert true_opnorm <= upper < 1.1 * true_opnorm
+    _, loose_upper = lanczos_opnorm(grad, seed=0, rtol=0, maxiter=10,
+                                    return_bound=True)
+    assert loose_upper > upper
+
+    # Invariant subspace is found in the first step, the estimate is exact
+    op = odl.ScalingOperator(odl.rn(3), 2)
+    for seed in range(50):
+        opnorm_est, upper = lanczos_opnorm(op, seed=seed, return_bound=True)
+        assert almost_equal(opnorm_est, 2)
+        assert upper == opnorm_est
+
+    # Operators on product spaces are batched like other operators
+    op = odl.BroadcastOperator(odl.IdentityOperator(odl.rn(3)), 2)
+    assert almost_equal(lanczos_opnorm(op, seed=0), np.sqrt(2))
+
+    with pytest.raises(ValueError):
+        lanczos_opnorm(op, maxiter=0)
+    with pytest.raises(ValueError):
+        lanczos_opnorm(op, num_probes=0)
+    with pytest.raises(ValueError):
+        lanczos_opnorm(op, failure_prob=1)
+    with pytest.raises(ValueError):
+        lanczos_opnorm(odl.PowerOperator(odl.rn(3), 2))
+
+
+def test_opnorm_estimate_cache():
+    clear_opnorm_cache()
+    space = odl.uniform_discr(0, 1, 10)
+    grad = odl.Gradient(space)
+
+    opnorm_est = grad.norm(estimate=True)
+    assert grad.norm(estimate=True) == opnorm_est
+    assert grad.norm(estimate=True, maxiter=1) < opnorm_est
+
+    # Cache is keyed by operator identity
+    mat = odl.MatrixOperator(np.diag([1.0, 2.0]))
+    assert almost_equal(mat.norm(estimate=True), 2)
+    mat.matrix[1, 1] = 3
+    assert almost_equal(mat.norm(estimate=True), 2)
+    clear_opnorm_cache()
+    assert almost_equal(mat.norm(estimate=True), 3)
+
+    # The power method is used for explicit start vectors
+    xstart = odl.rn(2).element([1, 1])
+    assert almost_equal(mat.norm(estimate=True, xstart=xstart), 3, places=2)
+
+
 if __name__ == '__main__':
     pytest.main([str(__file__.replace('\\', '/')), '-v'])
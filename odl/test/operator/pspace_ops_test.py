@@ -7,10 +7,13 @@
 # obtain one at https://mozilla.org/MPL/2.0/.
 
 from __future__ import division
+from builtins import super
+from multiprocessing.pool import ThreadPool
+import numpy as np
 import pytest
 
 import odl
-from odl.util.testutils import all_almost_equal
+from odl.util.testutils import all_almost_equal, noise_element
 
 
 def test_pspace_op_init():
@@ -94,6 +97,21 @@ def test_pspace_op_diagonal_call():
     assert z == op(z, out=op.range.element())
 
 
+def test_pspace_op_of_pspace_ops():
+    r3 = odl.rn(3)
+    I = odl.IdentityOperator(r3)
+    B = odl.BroadcastOperator(I, 2 * I)
+
+    # Blocks on product spaces are not unpacked into their components
+    op = odl.DiagonalOperator(B, 2)
+    x = op.domain.element([[1, 2, 3], [4, 5, 6]])
+    assert all_almost_equal(op(x), [B(x[0]), B(x[1])])
+    assert all_almost_equal(op.adjoint(op(x)), [5 * x[0], 5 * x[1]])
+
+    op = odl.ProductSpaceOperator([[B, 0], [0, B]])
+    assert all_almost_equal(op.adjoint(op(x)), [5 * x[0], 5 * x[1]])
+
+
 def test_pspace_op_swap_call():
     r3 = odl.rn(3)
     I = odl.IdentityOperator(r3)
@@ -187,5 +205,111 @@ def test_comp_proj_adjoint_slice():
     assert result == proj.adjoint(x, out=proj.domain.element())
 
 
+class CountingOperator(odl.Operator):
+
+    """Scaling by 2 (or squaring) that counts its evaluations."""
+
+    def __init__(self, space, linear=True):
+        super().__init__(space, space, linear=linear)
+        self.num_calls = 0
+
+    def _call(self, x, out):
+        self.num_calls += 1
+        if self.is_linear:
+            out.lincomb(2, x)
+        else:
+            x.multiply(x, out=out)
+
+
+def test_pspace_op_execution_plan():
+    r3 = odl.rn(3)
+    pspace = odl.ProductSpace(r3, 2)
+    x = noise_element(pspace)
+
+    # Linear operator repeated in a row is applied once to the sum
+    A = CountingOperator(r3)
+    op = odl.ProductSpaceOperator([[A, A]])
+    assert all_almost_equal(op(x), [2 * (x[0] + x[1])])
+    assert A.num_calls == 1
+
+    # Nonlinear operators must be applied separately
+    B = CountingOperator(r3, linear=False)
+    op = odl.ProductSpaceOperator([[B, B]])
+    assert all_almost_equal(op(x), [x[0] ** 2 + x[1] ** 2])
+    assert B.num_calls == 2
+
+    # Identical rows are computed once
+    A.num_calls = 0
+    op = odl.BroadcastOperator(A, 3)
+    out = op.range.element()
+    op(x[0], out=out)
+    assert all_almost_equal(out, [2 * x[0]] * 3)
+    assert A.num_calls == 1
+
+    # Zero operators are skipped
+    A.num_calls = 0
+    op = odl.ProductSpaceOperator([[A, odl.ZeroOperator(r3)],
+                                   [odl.ZeroOperator(r3), 0]])
+    assert all_almost_equal(op(x), [2 * x[0], r3.zero()])
+    assert A.num_calls == 1
+
+
+def test_pspace_op_executor():
+    r3 = odl.rn(3)
+    pspace = odl.ProductSpace(r3, 2)
+    A = odl.MatrixOperator(np.random.rand(3, 3))
+    B = odl.MatrixOperator(np.random.rand(3, 3))
+    x = noise_element(pspace)
+
+    pool = ThreadPool(2)
+    try:
+        for op_matrix, ran in [([[A, B], [B, A]], pspace),
+                               ([[A, B], [0, 0]], pspace),
+                               ([[A, B]], odl.ProductSpace(r3, 1))]:
+            op = odl.ProductSpaceOperator(op_matrix, range=ran)
+            par_op = odl.ProductSpaceOperator(op_matrix, range=ran,
+                                              executor=pool)
+            assert par_op.executor is pool
+            assert all_almost_equal(par_op(x), op(x))
+
+            # Rows without operators are set to zero in ``out``
+            out = par_op.range.element()
+            for out_i in out:
+                out_i[:] = np.nan
+            par_op(x, out=out)
+            assert all_almost_equal(out, op(x))
+
+            assert par_op.adjoint.executor is pool
+            y = noise_element(op.range)
+            assert all_almost_equal(par_op.adjoint(y), op.adjoint(y))
+
+        bcast = odl.BroadcastOperator(A, B, executor=pool)
+        assert all_almost_equal(bcast(x[0]), [A(x[0]), B(x[0])])
+        assert bcast.adjoint.executor is pool
+
+        red = odl.ReductionOperator(A, B, executor=pool)
+        assert all_almost_equal(red(x), A(x[0]) + B(x[1]))
+        assert red.adjoint.executor is pool
+
+        diag = odl.DiagonalOperator(A, B, executor=pool)
+        assert all_almost_equal(diag(x), [A(x[0]), B(x[1])])
+        assert diag.adjoint.executor is pool
+
+        # Nested operators sharing one worker must not deadlock
+        single = ThreadPool(1)
+        try:
+            inner = (odl.ReductionOperator(A, B, executor=single) *
+                     odl.IdentityOperator(pspace))
+            outer = odl.BroadcastOperator(inner, inner, executor=single)
+            assert all_almost_equal(outer(x), [red(x), red(x)])
+        finally:
+            single.close()
+    finally:
+        pool.close()
+
+    with pytest.raises(TypeError):
+        odl.BroadcastOperator(A, B, exec=pool)
+
+
 if __name__ == '__main__':
     pytest.main([str(__file__.replace('\\', '/')), '-v'])
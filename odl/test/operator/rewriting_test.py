@@ -0,0 +1,209 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import division
+import pytest
+import numpy as np
+import scipy.sparse
+
+import odl
+from odl.operator.rewriting import optimize
+from odl.util.testutils import all_almost_equal, noise_element
+
+
+def check_equivalent(op, opt_op):
+    """Check that ``op`` and ``opt_op`` agree in- and out-of-place."""
+    assert opt_op.domain == op.domain
+    assert opt_op.range == op.range
+
+    x = noise_element(op.domain)
+    expected = op(x)
+    assert all_almost_equal(opt_op(x), expected)
+
+    out = opt_op.range.element()
+    opt_op(x, out=out)
+    assert all_almost_equal(out, expected)
+
+
+def test_optimize_scalars():
+    space = odl.uniform_discr(0, 1, 5)
+    ident = odl.IdentityOperator(space)
+    A = odl.MatrixOperator(np.random.rand(5, 5), domain=space, range=space)
+    x = noise_element(space)
+
+    # Scalars are pulled out and merged
+    op = 2 * ident * 3 * ident * 0.5
+    opt_op = optimize(op)
+    assert isinstance(opt_op, odl.ScalingOperator)
+    assert opt_op.scalar == 3
+    check_equivalent(op, opt_op)
+
+    op = (odl.ScalingOperator(space, 2) * odl.ScalingOperator(space, 0.5))
+    assert isinstance(optimize(op), odl.IdentityOperator)
+
+    # Scalars are folded into matrices
+    op = 2 * A * 3
+    opt_op = optimize(op)
+    assert isinstance(opt_op, odl.MatrixOperator)
+    check_equivalent(op, opt_op)
+
+    # Scalars cannot be moved past nonlinear operators
+    nonlin = odl.PowerOperator(space, 2)
+    op = nonlin * odl.ScalingOperator(space, 2) * A
+    opt_op = optimize(op)
+    assert opt_op(x) == op(x)
+
+    # Nothing to do
+    op = A * nonlin
+    assert optimize(op) is op
+    assert optimize(A) is A
+
+
+def test_optimize_multiply():
+    space = odl.rn(4)
+    x = noise_element(space)
+    y = noise_element(space)
+
+    op = odl.MultiplyOperator(x) * odl.MultiplyOperator(y)
+    opt_op = optimize(op)
+    assert isinstance(opt_op, odl.MultiplyOperator)
+    check_equivalent(op, opt_op)
+
+    # Vector multiplications of operator expressions
+    A = odl.MatrixOperator(np.random.rand(4, 4))
+    op = x * (y * A * x) * 2
+    opt_op = optimize(op)
+    check_equivalent(op, opt_op)
+    assert optimize(opt_op) is opt_op
+
+
+def test_optimize_inverse():
+    space = odl.uniform_discr(0, 1, 8, dtype=complex)
+    A = odl.MatrixOperator(np.random.rand(8, 8), domain=space, range=space)
+    ft = odl.trafos.DiscreteFourierTransform(space)
+
+    op = A * ft.inverse * ft
+    assert optimize(op) is A
+
+    op = ft * A * ft.inverse
+    assert optimize(op) is op
+
+    op = ft.inverse * ft
+    opt_op = optimize(op)
+    assert isinstance(opt_op, odl.IdentityOperator)
+    assert opt_op.domain == space
+
+    diag = odl.DiagonalOperator(ft, odl.ScalingOperator(space, 2))
+    assert isinstance(optimize(diag * diag.inverse), odl.IdentityOperator)
+
+    # Transforms of real data are not surjective
+    real_space = odl.uniform_discr(0, 1, 8)
+    ft = odl.trafos.DiscreteFourierTransform(real_space)
+    op = ft * ft.inverse
+    assert optimize(op) is op
+    check_equivalent(ft.inverse * ft, optimize(ft.inverse * ft))
+
+
+def test_optimize_field_domain():
+    # Scalars are moved over operators defined on fields
+    vec = odl.rn(2).element([1, 2])
+    mult = odl.MultiplyOperator(vec, domain=odl.RealNumbers())
+    op = mult * odl.ScalingOperator(odl.RealNumbers(), 2.0)
+    opt_op = optimize(op)
+    assert opt_op is not op
+    assert all_almost_equal(opt_op(1.5), op(1.5))
+
+
+def test_optimize_pseudo_inverse():
+    # Pseudo-inverses and approximate inverses are not cancelled
+    space = odl.uniform_discr(0, 1, 4)
+    resize = odl.ResizingOperator(space, ran_shp=(2,))
+    op = resize.inverse * resize
+    opt_op = optimize(op)
+    assert opt_op is op
+    assert all_almost_equal(opt_op([1, 2, 3, 4]), [0, 2, 3, 0])
+
+    fine_space = odl.uniform_discr(0, 1, 8)
+    resample = odl.Resampling(space, fine_space)
+    op = resample.inverse * resample
+    assert optimize(op) is op
+
+
+def test_optimize_pspace_ops():
+    space = odl.rn(3)
+    pspace = odl.ProductSpace(space, 3)
+    A = odl.MatrixOperator(np.random.rand(3, 3))
+    B = odl.ScalingOperator(space, 2)
+    C = odl.IdentityOperator(space)
+
+    bcast = odl.BroadcastOperator(A, B, C)
+    op = odl.ComponentProjection(pspace, 0) * bcast
+    assert optimize(op) is A
+
+    op = odl.ComponentProjection(pspace, [0, 2]) * bcast
+    opt_op = optimize(op)
+    assert isinstance(opt_op, odl.BroadcastOperator)
+    assert opt_op.operators == (A, C)
+    check_equivalent(op, opt_op)
+
+    red = odl.ReductionOperator(A, B, C)
+    op = red * odl.ComponentProjectionAdjoint(pspace, 1)
+    assert optimize(op) is B
+
+    # Affine operators in the other components must be kept
+    red = odl.ReductionOperator(A, B, C + space.one())
+    op = red * odl.ComponentProjectionAdjoint(pspace, 1)
+    assert optimize(op) is op
+
+    # Sub-operators are optimized
+    op = odl.BroadcastOperator(A, 2 * B * 0.5)
+    opt_op = optimize(op)
+    assert opt_op.operators[1].scalar == 2
+    check_equivalent(op, opt_op)
+
+
+def test_optimize_matrices():
+    A = odl.MatrixOperator(np.random.rand(3, 4))
+    B = odl.MatrixOperator(np.random.rand(4, 3))
+
+    # Small product is collapsed
+    op = A * B
+    opt_op = optimize(op)
+    assert isinstance(opt_op, odl.MatrixOperator)
+    check_equivalent(op, opt_op)
+
+    # Product that is larger than the factors is kept
+    A = odl.MatrixOperator(np.random.rand(10, 1))
+    B = odl.MatrixOperator(np.random.rand(1, 10))
+    op = A * B
+    assert optimize(op) is op
+
+    # Sparse matrices
+    A = odl.MatrixOperator(scipy.sparse.eye(5, format='csr') * 2)
+    B = odl.MatrixOperator(scipy.sparse.diags([1.0, 2, 3, 4, 5]))
+    op = A * B
+    opt_op = optimize(op)
+    assert opt_op.matrix_issparse
+    check_equivalent(op, opt_op)
+
+    # Sums of matrices
+    A = odl.MatrixOperator(np.random.rand(3, 3))
+    op = A + A * 2
+    opt_op = optimize(op)
+    assert isinstance(opt_op, odl.MatrixOperator)
+    check_equivalent(op, opt_op)
+
+
+def test_optimize_functionals_unchanged():
+    space = odl.rn(3)
+    func = 2 * odl.solvers.L2NormSquared(space) * 3
+    assert optimize(func) is func
+
+
+if __name__ == '__main__':
+    pytest.main([str(__file__.replace('\\', '/')), '-v'])
@@ -203,6 +203,47 @@ def test_pointwise_norm_weighted(exponent):
 # ---- PointwiseInner ----
 
 
+def test_pointwise_norm_inner_blockwise(exponent, monkeypatch):
+    # Small blocks and multiple threads to exercise the block kernels
+    monkeypatch.setattr(odl.operator.tensor_ops, 'POINTWISE_BLOCK_SIZE', 7)
+    monkeypatch.setattr(odl.space.npy_ntuples, 'NUM_THREADS', 2)
+    monkeypatch.setattr(odl.space.npy_ntuples, 'THRESHOLD_THREADS', 10)
+
+    space = odl.uniform_discr([0, 0], [1, 1], (5, 6), dtype='float32')
+    vfspace = ProductSpace(space, 3)
+    weights = [1.0, 2.0, 0.5]
+    arr = np.random.randn(3, 30).astype('float32')
+
+    # Separately stored components and rows of one array
+    vf_sep = vfspace.element(arr.reshape(3, 5, 6))
+    vf_stacked = vfspace.element(
+        [space.element(space.dspace.element(row)) for row in arr])
+    assert np.shares_memory(vf_stacked[1].ntuple.data, arr)
+
+    if exponent == float('inf'):
+        expected = np.max(np.abs(arr) * np.array(weights)[:, None], axis=0)
+    else:
+        expected = np.sum(np.array(weights)[:, None] *
+                          np.abs(arr) ** exponent, axis=0) ** (1 / exponent)
+    expected = expected.reshape(5, 6)
+
+    pwnorm = PointwiseNorm(vfspace, exponent=exponent, weighting=weights)
+    for vf in (vf_sep, vf_stacked):
+        assert all_almost_equal(pwnorm(vf).asarray(), expected, places=4)
+
+    # Result may be written to the first component
+    out = vf_stacked[0]
+    pwnorm(vf_stacked, out=out)
+    assert all_almost_equal(out.asarray(), expected, places=4)
+
+    arr[0] = np.random.randn(30)
+    expected = np.sum(np.array(weights)[:, None] * arr * arr[::-1], axis=0)
+    pwinner = PointwiseInner(vfspace, vf_stacked[::-1], weighting=weights)
+    for vf in (vf_sep.space.element(arr.reshape(3, 5, 6)), vf_stacked):
+        assert all_almost_equal(pwinner(vf).asarray(),
+                                expected.reshape(5, 6), places=4)
+
+
 def test_pointwise_inner_init_properties():
     fspace = odl.uniform_discr([0, 0], [1, 1], (2, 2))
     vfspace = ProductSpace(fspace, 3, exponent=2)
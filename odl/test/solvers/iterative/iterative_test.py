@@ -9,6 +9,7 @@
 """Test iterative solvers."""
 
 from __future__ import division
+from multiprocessing.pool import ThreadPool
 import odl
 from odl.util.testutils import all_almost_equal
 import pytest
@@ -24,7 +25,8 @@ import numpy as np
                         'conjugate_gradient_normal',
                         'mlem',
                         'osmlem',
-                        'kaczmarz'])
+                        'kaczmarz',
+                        'block_kaczmarz'])
 def iterative_solver(request):
     """Return a solver given by a name with interface solve(op, x, rhs)."""
     solver_name = request.param
@@ -62,6 +64,9 @@ def iterative_solver(request):
             norm2 = op.adjoint(op(x)).norm() / x.norm()
             odl.solvers.kaczmarz([op, op], x, [rhs, rhs], niter=20,
                                  omega=0.5 / norm2)
+    elif solver_name == 'block_kaczmarz':
+        def solver(op, x, rhs):
+            odl.solvers.block_kaczmarz([op, op], x, [rhs, rhs], niter=50)
     else:
         raise ValueError('solver not valid')
 
@@ -138,5 +143,104 @@ def test_steepst_descent():
 
     assert all_almost_equal(x, [1, 1, 1], places=2)
 
+
+def test_block_conjugate_gradient():
+    """Test block CG with several (linearly dependent) right-hand sides."""
+    n, k = 20, 4
+    mat = np.random.rand(n, n)
+    mat = mat.T.dot(mat) + np.eye(n)
+    rhs_arr = np.random.rand(k, n)
+    rhs_arr[3] = rhs_arr[0] - 2 * rhs_arr[1]
+
+    for space in [odl.rn(n), odl.uniform_discr(0, 1, n)]:
+        op = odl.MatrixOperator(mat, domain=space, range=space)
+        pspace = odl.ProductSpace(space, k)
+        rhs = pspace.element(rhs_arr)
+        x = pspace.zero()
+
+        info = odl.solvers.block_conjugate_gradient(op, x, rhs, niter=n,
+                                                    tol=1e-10)
+        assert info.converged
+        for xj, rhsj in zip(x, rhs):
+            assert all_almost_equal(op(xj), rhsj)
+
+    # Weighted space where the block operations use inner products, the
+    # operator is self-adjoint also with respect to the weighting
+    space = odl.rn(n, weighting=np.linspace(1, 2, n))
+    op = odl.MultiplyOperator(space.element(np.arange(1, n + 1)))
+    pspace = odl.ProductSpace(space, k)
+    rhs = pspace.element(rhs_arr)
+    x = pspace.zero()
+    iters = []
+    odl.solvers.block_conjugate_gradient(op, x, rhs, niter=n,
+                                         callback=iters.append)
+    assert len(iters) <= n
+    for xj, rhsj in zip(x, rhs):
+        assert all_almost_equal(op(xj), rhsj)
+
+
+def test_block_conjugate_gradient_normal():
+    """Test block CGLS against the least squares solutions."""
+    mat = np.random.rand(15, 10)
+    op = odl.MatrixOperator(mat)
+    rhs_arr = np.random.rand(3, 15)
+    rhs = odl.ProductSpace(op.range, 3).element(rhs_arr)
+    x = odl.ProductSpace(op.domain, 3).zero()
+
+    info = odl.solvers.block_conjugate_gradient_normal(op, x, rhs, niter=20,
+                                                       tol=1e-10)
+    assert info.converged
+    x_lstsq = np.linalg.lstsq(mat, rhs_arr.T)[0].T
+    for xj, xj_lstsq in zip(x, x_lstsq):
+        assert all_almost_equal(xj, xj_lstsq)
+
+    with pytest.raises(TypeError):
+        odl.solvers.block_conjugate_gradient_normal(op, x[0], rhs, niter=1)
+
+
+def test_block_kaczmarz():
+    """Test randomized and parallel block Kaczmarz on a linear system."""
+    mat = np.random.rand(20, 5) * np.linspace(1, 3, 20)[:, None]
+    x_true = np.random.rand(5)
+    rows = [odl.MatrixOperator(mat[i:i + 1]) for i in range(20)]
+    rhs = [op(x_true) for op in rows]
+    norms = np.linalg.norm(mat, axis=1)
+
+    # Randomized Kaczmarz with importance sampling
+    x = rows[0].domain.zero()
+    odl.solvers.block_kaczmarz(rows, x, rhs, niter=3000, block_size=1,
+                               sampling='importance', block_norms=norms,
+                               seed=0)
+    assert all_almost_equal(x, x_true)
+
+    # Parallel updates do not change the result
+    results = []
+    pool = ThreadPool(4)
+    try:
+        for executor in [None, pool]:
+            x = rows[0].domain.zero()
+            odl.solvers.block_kaczmarz(rows, x, rhs, niter=20, block_size=5,
+                                       relax=1.5, seed=1, executor=executor)
+            results.append(x)
+    finally:
+        pool.close()
+    assert all_almost_equal(results[0], results[1], places=12)
+
+    # Cyclic blocks of subsets
+    blocks = [odl.MatrixOperator(mat[4 * i:4 * (i + 1)]) for i in range(5)]
+    x = blocks[0].domain.zero()
+    odl.solvers.block_kaczmarz(blocks, x, [op(x_true) for op in blocks],
+                               niter=2000, block_size=2, sampling='cyclic')
+    assert all_almost_equal(x, x_true, places=4)
+
+    with pytest.raises(ValueError):
+        odl.solvers.block_kaczmarz(rows, x, rhs, niter=1, block_size=21)
+    with pytest.raises(ValueError):
+        odl.solvers.block_kaczmarz(rows, x, rhs, niter=1, sampling='all')
+    with pytest.raises(ValueError):
+        odl.solvers.block_kaczmarz(rows, x, rhs, niter=1,
+                                   block_norms=norms[:3])
+
+
 if __name__ == '__main__':
     pytest.main([str(__file__.replace('\\', '/')), '-v'])
@@ -0,0 +1,120 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test for the preconditioners of the iterative solvers."""
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.solvers import jacobi_preconditioner, circulant_preconditioner
+from odl.util.testutils import all_almost_equal
+
+
+def badly_scaled_problem():
+    """Return a badly scaled diagonal dominant problem and its solution."""
+    scale = np.logspace(0, 3, 20)
+    mat = np.diag(scale) + 0.1 * np.random.rand(20, 20)
+    mat = mat.T.dot(mat)
+    x_expl = np.random.rand(20)
+    op = odl.MatrixOperator(mat)
+    return op, op(x_expl), x_expl
+
+
+def niter_to_tol(solver, op, rhs, x_expl, **kwargs):
+    """Return the number of iterations needed to reach the solution."""
+    x = op.domain.zero()
+    info = solver(op, x, rhs, niter=1000, **kwargs)
+    assert info.converged
+    assert all_almost_equal(x, x_expl, places=3)
+    return info.niter
+
+
+def test_jacobi_preconditioner():
+    """Test that diagonal preconditioning speeds up the solvers."""
+    op, rhs, x_expl = badly_scaled_problem()
+
+    # Self-adjoint system with CG
+    precon = jacobi_preconditioner(op, normal=False)
+    niter_cg = niter_to_tol(odl.solvers.conjugate_gradient,
+                            op, rhs, x_expl, tol=1e-8)
+    niter_pcg = niter_to_tol(odl.solvers.conjugate_gradient,
+                             op, rhs, x_expl, tol=1e-8,
+                             preconditioner=precon)
+    assert niter_pcg < niter_cg
+
+    # Normal equation with CGLS
+    diag_op = odl.MultiplyOperator(op.domain.element(np.logspace(0, 2, 20)))
+    rhs = diag_op(x_expl)
+    precon = jacobi_preconditioner(diag_op)
+    niter_cgn = niter_to_tol(odl.solvers.conjugate_gradient_normal,
+                             diag_op, rhs, x_expl, tol=1e-8)
+    niter_pcgn = niter_to_tol(odl.solvers.conjugate_gradient_normal,
+                              diag_op, rhs, x_expl, tol=1e-8,
+                              preconditioner=precon)
+    assert niter_pcgn == 1 < niter_cgn
+
+    # The diagonal scaling of the normal operator is exact for diagonal `op`,
+    # so Landweber needs only one step
+    niter_lw = niter_to_tol(odl.solvers.landweber, diag_op, rhs, x_expl,
+                            omega=1, preconditioner=precon, tol=1e-8)
+    assert niter_lw <= 2
+
+
+def test_landweber_range_preconditioner():
+    """Test Landweber with a preconditioner in the data space."""
+    mat = np.random.rand(10, 5) + 2 * np.eye(10, 5)
+    op = odl.MatrixOperator(mat)
+    x_expl = np.random.rand(5)
+    rhs = op(x_expl)
+
+    # Weighting the data with the inverse row sums
+    precon = odl.MultiplyOperator(
+        op.range.element(1 / mat.dot(mat.sum(axis=0))))
+    weights = np.sqrt(precon.multiplicand.asarray())
+    omega = 1 / np.linalg.norm(weights[:, None] * mat, 2) ** 2
+    niter_to_tol(odl.solvers.landweber, op, rhs, x_expl, omega=omega,
+                 preconditioner=precon, tol=1e-8)
+
+    with pytest.raises(ValueError):
+        odl.solvers.landweber(op, op.domain.zero(), rhs, niter=1,
+                              preconditioner=odl.IdentityOperator(odl.rn(3)))
+
+
+def test_circulant_preconditioner():
+    """Test FFT-based preconditioning of a deblurring problem."""
+    space = odl.uniform_discr([0, 0], [1, 1], [16, 16])
+    op = (odl.IdentityOperator(space) -
+          odl.Laplacian(space, pad_mode='symmetric'))
+    x_expl = odl.phantom.white_noise(space)
+    rhs = op(x_expl)
+
+    # Periodic approximation of the operator with symmetric boundary
+    precon = circulant_preconditioner(op, normal=False)
+    assert isinstance(precon, odl.solvers.CirculantPreconditioner)
+    assert precon.adjoint is precon
+
+    niter_cg = niter_to_tol(odl.solvers.conjugate_gradient,
+                            op, rhs, x_expl, tol=1e-8)
+    niter_pcg = niter_to_tol(odl.solvers.conjugate_gradient,
+                             op, rhs, x_expl, tol=1e-8,
+                             preconditioner=precon)
+    assert niter_pcg < niter_cg
+
+    precon = circulant_preconditioner(op)
+    niter_cgn = niter_to_tol(odl.solvers.conjugate_gradient_normal,
+                             op, rhs, x_expl, tol=1e-8)
+    niter_pcgn = niter_to_tol(odl.solvers.conjugate_gradient_normal,
+                              op, rhs, x_expl, tol=1e-8,
+                              preconditioner=precon)
+    assert niter_pcgn < niter_cgn
+
+
+if __name__ == '__main__':
+    pytest.main([str(__file__.replace('\\', '/')), '-v'])
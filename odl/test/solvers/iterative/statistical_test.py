@@ -0,0 +1,113 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test for the statistical (MLEM-type) solvers."""
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.solvers.iterative.statistical import (
+    _INVERSE_SENSITIVITY_CACHE, _subset_order)
+from odl.util.testutils import all_almost_equal, simple_fixture
+
+
+subset_order = simple_fixture(
+    'subset_order', ['sequential', 'bit_reversal', 'random', [3, 1, 0, 2]])
+
+
+def subset_problem(nsubsets=4):
+    """Return nonnegative subset operators and the truth.
+
+    The subsets have equal sensitivities, such that OSEM converges for
+    consistent data.
+    """
+    ops = []
+    for _ in range(nsubsets):
+        rand = np.random.rand(8, 8)
+        ops.append(odl.MatrixOperator(
+            np.eye(8) + 0.2 + 0.2 * (rand - rand.mean(axis=0))))
+    x_true = ops[0].domain.element(np.random.rand(8) + 0.5)
+    return ops, x_true
+
+
+def test_osmlem_subset_order(subset_order):
+    """Test convergence for consistent data with all subset orders."""
+    ops, x_true = subset_problem()
+    data = [op(x_true) for op in ops]
+
+    x = ops[0].domain.one()
+    updates = []
+    odl.solvers.osmlem(ops, x, data, niter=200, subset_order=subset_order,
+                       seed=0, callback=lambda x: updates.append(1))
+    assert len(updates) == 200 * len(_subset_order(4, subset_order)(0))
+    assert all_almost_equal(x, x_true)
+
+
+def test_osmlem_background():
+    """Test that the background is taken into account."""
+    ops, x_true = subset_problem(nsubsets=2)
+    background = [op.range.element(np.linspace(1, 2, 8)) for op in ops]
+    data = [op(x_true) + b for op, b in zip(ops, background)]
+
+    x = ops[0].domain.one()
+    odl.solvers.osmlem(ops, x, data, niter=200, background=background)
+    assert all_almost_equal(x, x_true)
+
+    # MLEM with a single background
+    x = ops[0].domain.one()
+    odl.solvers.mlem(ops[0], x, ops[0](x_true) + 1, niter=200, background=1)
+    assert all_almost_equal(x, x_true)
+
+
+def test_osmlem_sensitivities():
+    """Test given and cached sensitivities."""
+    ops, x_true = subset_problem(nsubsets=2)
+    data = [op(x_true) for op in ops]
+
+    x_ref = ops[0].domain.one()
+    odl.solvers.osmlem(ops, x_ref, data, niter=10)
+    assert all(op in _INVERSE_SENSITIVITY_CACHE for op in ops)
+
+    # Given sensitivities equal to the default
+    sens = [op.adjoint(op.range.one()) for op in ops]
+    x = ops[0].domain.one()
+    odl.solvers.osmlem(ops, x, data, niter=10, sensitivities=sens)
+    assert all_almost_equal(x, x_ref)
+
+    # The same sensitivity for all subsets
+    op = ops[0]
+    x_ref = op.domain.one()
+    odl.solvers.osmlem([op, op], x_ref, [data[0]] * 2, niter=5)
+    for sens in [sens[0], sens[0].asarray()]:
+        x = op.domain.one()
+        odl.solvers.mlem(op, x, data[0], niter=10, sensitivities=sens)
+        assert all_almost_equal(x, x_ref)
+
+    with pytest.raises(ValueError):
+        odl.solvers.osmlem(ops, x, data, niter=1, sensitivities=[1, 1, 1])
+    with pytest.raises(ValueError):
+        odl.solvers.osmlem(ops, x, data, niter=1, subset_order='reverse')
+    with pytest.raises(ValueError):
+        odl.solvers.osmlem(ops, x, data, niter=1, subset_order=[0, 2])
+
+
+def test_subset_order():
+    """Test that the subset orders are permutations."""
+    for n in [1, 2, 5, 8]:
+        for order in ['sequential', 'bit_reversal', 'random']:
+            assert sorted(_subset_order(n, order)(0)) == list(range(n))
+
+    random_order = _subset_order(10, 'random', seed=1)
+    assert random_order(3) == random_order(3)
+    assert random_order(3) != random_order(4)
+
+
+if __name__ == '__main__':
+    pytest.main([str(__file__.replace('\\', '/')), '-v'])
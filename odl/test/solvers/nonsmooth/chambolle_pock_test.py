@@ -141,5 +141,78 @@ def test_chambolle_pock_solver_produce_space():
     assert all_almost_equal(discr_vec, vec_expl, PLACES)
 
 
+def test_adaptive_pdhg():
+    """Test the adaptive primal-dual hybrid gradient method."""
+    mat = np.random.rand(20, 10)
+    op = odl.MatrixOperator(mat)
+    data = op.range.element(np.random.rand(20))
+    lam = 0.1
+
+    # Tikhonov regularized least squares with explicit solution
+    f = odl.solvers.L2NormSquared(op.range).translated(data)
+    g = lam * odl.solvers.L2NormSquared(op.domain)
+    x_expl = np.linalg.solve(mat.T.dot(mat) + lam * np.eye(10),
+                             mat.T.dot(data))
+
+    # Default, badly balanced and too large step sizes, with restarts
+    thetas = []
+    for tau, sigma in [(None, None), (0.01, 10.0), (10.0, 10.0)]:
+        for restart in [None, 1.5]:
+            x = op.domain.zero()
+            state = odl.solvers.SolverState()
+            info = odl.solvers.adaptive_pdhg(
+                x, f, g, op, niter=5000, tau=tau, sigma=sigma, tol=1e-8,
+                restart=restart, state=state,
+                callback=lambda x: thetas.append(state.get('theta')))
+
+            assert all_almost_equal(x, x_expl, places=6)
+            assert info.converged
+            assert info.niter < 5000
+            assert info.residuals[-1] <= 1e-8
+
+    # Restarts compute the next dual step without relaxation
+    assert 0 in thetas
+
+    # Resuming with the final steps and the dual variable
+    x = op.domain.zero()
+    y = op.range.zero()
+    info = odl.solvers.adaptive_pdhg(x, f, g, op, niter=50, y=y)
+    assert not info.converged
+    odl.solvers.adaptive_pdhg(x, f, g, op, niter=5000, tau=info.tau,
+                              sigma=info.sigma, y=y, tol=1e-8)
+    assert all_almost_equal(x, x_expl, places=6)
+
+    # Resuming with a solver state gives the same result as one run
+    x = op.domain.zero()
+    info = odl.solvers.adaptive_pdhg(x, f, g, op, niter=100)
+    state = odl.solvers.SolverState()
+    odl.solvers.adaptive_pdhg(op.domain.zero(), f, g, op, niter=60,
+                              state=state)
+    odl.solvers.adaptive_pdhg(op.domain.zero(), f, g, op, niter=40,
+                              state=state)
+    assert all_almost_equal(state['x'], x)
+    assert state['tau'] == info.tau
+    assert state['sigma'] == info.sigma
+
+    # Complex spaces, where the inner products in the backtracking are complex
+    space = odl.cn(3)
+    op_cn = odl.ScalingOperator(space, 2.0)
+    data_cn = space.element([1 + 1j, 2 - 1j, -1j])
+    f_cn = odl.solvers.L2NormSquared(space).translated(data_cn)
+    g_cn = lam * odl.solvers.L2NormSquared(space)
+    x_cn = space.zero()
+    info = odl.solvers.adaptive_pdhg(x_cn, f_cn, g_cn, op_cn, niter=5000,
+                                     tau=10.0, sigma=10.0, tol=1e-8)
+    assert all_almost_equal(x_cn, 2 * data_cn / (4 + lam), places=6)
+    assert info.converged
+
+    with pytest.raises(ValueError):
+        odl.solvers.adaptive_pdhg(x, f, g, op, niter=1, tau=-1)
+    with pytest.raises(ValueError):
+        odl.solvers.adaptive_pdhg(x, f, g, op, niter=1, alpha=1)
+    with pytest.raises(ValueError):
+        odl.solvers.adaptive_pdhg(x, f, g, op, niter=1, restart=0.5)
+
+
 if __name__ == '__main__':
     pytest.main([str(__file__.replace('\\', '/')), '-v'])
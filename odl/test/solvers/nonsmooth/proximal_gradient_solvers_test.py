@@ -0,0 +1,120 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test for the (accelerated) proximal gradient solvers."""
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.solvers import accelerated_proximal_gradient
+from odl.util.testutils import all_almost_equal, simple_fixture
+
+
+fista_options = simple_fixture(
+    'options',
+    [{}, {'backtracking': 0.5}, {'restart': 'function'},
+     {'restart': 'gradient'}, {'monotone': True},
+     {'monotone': True, 'restart': 'function', 'backtracking': 0.8}])
+
+
+def lasso_problem(max_scale):
+    """Return a LASSO problem and its step size."""
+    mat = np.random.randn(20, 10) * np.logspace(0, np.log10(max_scale), 10)
+    op = odl.MatrixOperator(mat)
+    data = op(np.random.rand(10))
+    f = 0.5 * odl.solvers.L1Norm(op.domain)
+    g = odl.solvers.L2NormSquared(op.range).translated(data) * op
+    gamma = 0.5 / np.linalg.norm(mat, 2) ** 2
+    return f, g, gamma
+
+
+def test_fista_options(fista_options):
+    """Test that all variants converge to the same solution."""
+    f, g, gamma = lasso_problem(max_scale=2)
+
+    x_ref = f.domain.zero()
+    accelerated_proximal_gradient(x_ref, f, g, gamma, niter=1000,
+                                  restart='gradient', tol=1e-12)
+
+    # Backtracking starts with a too large step size
+    if 'backtracking' in fista_options:
+        gamma *= 100
+
+    x = f.domain.zero()
+    info = accelerated_proximal_gradient(x, f, g, gamma, niter=1000,
+                                         tol=1e-8, **fista_options)
+    assert info.converged
+    assert all_almost_equal(x, x_ref, places=4)
+
+
+def test_fista_restart_and_monotone():
+    """Test the speed-up of restarts and monotonicity of MFISTA."""
+    f, g, gamma = lasso_problem(max_scale=10)
+    niters = {}
+    for restart in [None, 'function', 'gradient']:
+        x = f.domain.zero()
+        info = accelerated_proximal_gradient(x, f, g, gamma, niter=1000,
+                                             tol=1e-6, restart=restart)
+        niters[restart] = info.niter
+    assert niters['function'] < niters[None]
+    assert niters['gradient'] < niters[None]
+
+    objective = []
+    x = f.domain.zero()
+    accelerated_proximal_gradient(
+        x, f, g, gamma, niter=200, monotone=True,
+        callback=lambda x: objective.append(f(x) + g(x)))
+    assert np.all(np.diff(objective) <= 0)
+
+
+def test_fista_complex(fista_options):
+    """Test all variants in a complex space."""
+    space = odl.cn(3)
+    data = space.element([1 + 2j, -1j, 3])
+    f = odl.solvers.ZeroFunctional(space)
+    g = odl.solvers.L2NormSquared(space).translated(data)
+    x = space.zero()
+    info = accelerated_proximal_gradient(x, f, g, 0.2, niter=100, tol=1e-10,
+                                         **fista_options)
+    assert info.converged
+    assert all_almost_equal(x, data)
+
+
+def test_fista_step_size():
+    """Test default step size and input validation."""
+    space = odl.rn(5)
+    data = space.element(np.arange(5))
+    f = odl.solvers.ZeroFunctional(space)
+    g = odl.solvers.L2NormSquared(space).translated(data)
+
+    # Step size from `g.grad_lipschitz`, exact in one step
+    x = space.zero()
+    accelerated_proximal_gradient(x, f, g, gamma=None, niter=1)
+    assert all_almost_equal(x, data)
+
+    # Without Lipschitz constant, backtracking starts with gamma = 1
+    op = odl.MatrixOperator(data.asarray()[None, :])
+    g = odl.solvers.L2NormSquared(op.range).translated([1]) * op
+    x = space.zero()
+    with pytest.raises(ValueError):
+        accelerated_proximal_gradient(x, f, g, gamma=None, niter=1)
+    info = accelerated_proximal_gradient(x, f, g, gamma=None, niter=100,
+                                         backtracking=0.5, tol=1e-10)
+    assert info.converged
+    assert g(x) < 1e-10
+
+    with pytest.raises(ValueError):
+        accelerated_proximal_gradient(x, f, g, 1, niter=1, backtracking=1)
+    with pytest.raises(ValueError):
+        accelerated_proximal_gradient(x, f, g, 1, niter=1, restart='all')
+
+
+if __name__ == '__main__':
+    pytest.main([str(__file__.replace('\\', '/')), '-v'])
@@ -0,0 +1,78 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test for the stochastic primal-dual hybrid gradient solver."""
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.solvers import spdhg
+from odl.util.testutils import all_almost_equal, simple_fixture
+
+
+spdhg_options = simple_fixture(
+    'options',
+    [{}, {'sampling': 'importance'}, {'batch_size': 2},
+     {'prob': [0.2, 0.2, 0.3, 0.3]}])
+
+
+def tikhonov_problem(nblocks=4):
+    """Return a regularized least squares problem and its solution."""
+    mat = np.random.rand(5 * nblocks, 10)
+    data = np.random.rand(5 * nblocks)
+    lam = 0.1
+
+    ops = [odl.MatrixOperator(mat[5 * i:5 * (i + 1)]) for i in range(nblocks)]
+    funcs = [odl.solvers.L2NormSquared(op.range).translated(
+             data[5 * i:5 * (i + 1)]) for i, op in enumerate(ops)]
+    g = lam * odl.solvers.L2NormSquared(ops[0].domain)
+    x_expl = np.linalg.solve(mat.T.dot(mat) + lam * np.eye(10),
+                             mat.T.dot(data))
+    return funcs, g, ops, x_expl
+
+
+def test_spdhg(spdhg_options):
+    """Test convergence of SPDHG for the different samplings."""
+    funcs, g, ops, x_expl = tikhonov_problem()
+    f = odl.solvers.SeparableSum(*funcs)
+    L = odl.BroadcastOperator(*ops)
+
+    x = L.domain.zero()
+    spdhg(x, f, g, L, niter=1000, seed=0, **spdhg_options)
+    assert all_almost_equal(x, x_expl, places=6)
+
+
+def test_spdhg_resume():
+    """Test SPDHG with sequences of blocks and resumed iteration."""
+    funcs, g, ops, x_expl = tikhonov_problem()
+    x = ops[0].domain.zero()
+    y = [op.range.zero() for op in ops]
+    norms = [np.linalg.norm(op.matrix, 2) for op in ops]
+
+    iters = []
+    info = spdhg(x, funcs, g, ops, niter=500, y=y, block_norms=norms, seed=0,
+                 callback=iters.append)
+    assert len(iters) == info.niter == 500
+    spdhg(x, funcs, g, ops, niter=500, y=y, block_norms=norms, seed=1)
+    assert all_almost_equal(x, x_expl, places=6)
+
+    with pytest.raises(ValueError):
+        spdhg(x, funcs[:2], g, ops, niter=1)
+    with pytest.raises(ValueError):
+        spdhg(x, funcs, g, ops, niter=1, sampling='importance',
+              batch_size=2)
+    with pytest.raises(ValueError):
+        spdhg(x, funcs, g, ops, niter=1, prob=[1, 0, 0, 0])
+    with pytest.raises(TypeError):
+        spdhg(x, funcs[0], g, ops[0], niter=1)
+
+
+if __name__ == '__main__':
+    pytest.main([str(__file__.replace('\\', '/')), '-v'])
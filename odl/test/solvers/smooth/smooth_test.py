@@ -10,8 +10,10 @@
 
 from __future__ import division
 import pytest
+import numpy as np
 import odl
 from odl.operator import OpNotImplementedError
+from odl.util.testutils import all_almost_equal
 
 
 nonlinear_cg_beta = odl.util.testutils.simple_fixture('nonlinear_cg_beta',
@@ -101,6 +103,42 @@ def test_lbfgs_solver(functional_and_linesearch):
     assert functional(x) < 1e-3
 
 
+def test_lbfgs_ring_buffer():
+    """Test the bounded memory of the limited memory BFGS solver."""
+    space = odl.uniform_discr(0, 1, 10)
+    scaling = odl.MultiplyOperator(space.element(np.arange(1, 11)),
+                                   domain=space)
+    functional = odl.solvers.L2NormSquared(space) * scaling
+    maxiter = 6
+
+    # With enough memory, L-BFGS coincides with BFGS
+    x_bfgs = space.one()
+    odl.solvers.bfgs_method(functional, x_bfgs, maxiter=maxiter)
+    x_lbfgs = space.one()
+    odl.solvers.bfgs_method(functional, x_lbfgs, maxiter=maxiter,
+                            num_store=maxiter)
+    assert all_almost_equal(x_lbfgs, x_bfgs)
+
+    # A short memory still converges, also with a Hessian estimate
+    x = space.one()
+    hessinv_estimate = odl.ScalingOperator(space, 0.1)
+    odl.solvers.bfgs_method(functional, x, tol=1e-6, num_store=2,
+                            hessinv_estimate=hessinv_estimate,
+                            line_search=odl.solvers.BacktrackingLineSearch(
+                                functional))
+    assert functional(x) < 1e-3
+
+    # Without memory, the method reduces to steepest descent
+    x = space.one()
+    odl.solvers.bfgs_method(functional, x, tol=1e-6, num_store=0,
+                            line_search=odl.solvers.BacktrackingLineSearch(
+                                functional))
+    assert functional(x) < 1e-3
+
+    with pytest.raises(ValueError):
+        odl.solvers.bfgs_method(functional, x, num_store=-1)
+
+
 def test_broydens_method(broyden_impl, functional_and_linesearch):
     """Test the ``broydens_method`` quasi-Newton solver."""
     functional, line_search = functional_and_linesearch
@@ -0,0 +1,123 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test for checkpointing and resuming iterative methods."""
+
+from __future__ import division
+import io
+import numpy as np
+import pytest
+
+import odl
+from odl.solvers import SolverState
+from odl.util.testutils import simple_fixture
+
+
+solver_name = simple_fixture(
+    'solver', ['chambolle_pock', 'chambolle_pock_accelerated',
+               'douglas_rachford_pd', 'osmlem'])
+checkpoint = simple_fixture('checkpoint', ['memory', 'file', 'directory'])
+
+
+def run_solver(name, x, niter, state):
+    """Run ``niter`` iterations of a solver on a fixed problem."""
+    space = x.space
+    data = space.element(np.linspace(1, 2, space.size))
+
+    if name.startswith('chambolle_pock'):
+        grad = odl.Gradient(space)
+        L = odl.BroadcastOperator(odl.IdentityOperator(space), grad)
+        f = odl.solvers.SeparableSum(
+            odl.solvers.L2NormSquared(space).translated(data),
+            0.1 * odl.solvers.L1Norm(grad.range))
+        g = odl.solvers.ZeroFunctional(space)
+        gamma = 0.1 if name.endswith('accelerated') else None
+        odl.solvers.chambolle_pock_solver(x, f, g, L, tau=0.3, sigma=0.3,
+                                          niter=niter, gamma=gamma,
+                                          state=state)
+    elif name == 'douglas_rachford_pd':
+        f = odl.solvers.L2NormSquared(space).translated(data)
+        g = [0.1 * odl.solvers.L1Norm(space)]
+        odl.solvers.douglas_rachford_pd(
+            x, f, g, [odl.IdentityOperator(space)], tau=1.0, sigma=[1.0],
+            niter=niter, lam=lambda k: 1.5 / (1 + 0.1 * k), state=state)
+    elif name == 'osmlem':
+        ops = [odl.MultiplyOperator(space.element(np.linspace(1, 2, 10)
+                                                  ** i))
+               for i in range(3)]
+        odl.solvers.osmlem(ops, x, [op(data) for op in ops], niter=niter,
+                           state=state)
+    else:
+        assert False
+
+
+def test_solver_state():
+    """Test storing elements in `SolverState` and saving them."""
+    space = odl.uniform_discr(0, 1, 3)
+    pspace = odl.ProductSpace(space, odl.ProductSpace(space, 2))
+    state = SolverState(niter=3)
+    assert state.niter == 3
+
+    y = state.element('y', pspace)
+    assert y in pspace
+    assert state.element('y', pspace) is y
+    y[1][0] += 1
+    z = state.element('z', space, default=space.one)
+    assert z == space.one()
+
+    x = space.element([1, 2, 3])
+    state.iterate(x)
+    assert state['x'] is x
+
+    file = io.BytesIO()
+    state.save(file)
+    file.seek(0)
+    loaded = SolverState.load(file)
+    assert loaded.niter == 3
+    assert sorted(loaded) == ['niter', 'x', 'y.0', 'y.1.0', 'y.1.1', 'z']
+    assert loaded.element('y', pspace) == y
+    assert sorted(loaded) == ['niter', 'x', 'y', 'z']
+
+    x_new = space.zero()
+    loaded.iterate(x_new)
+    assert x_new == x
+    assert loaded['x'] is x_new
+
+
+def test_solver_resume(solver_name, checkpoint, tmpdir):
+    """Test that resumed iteration equals one long run."""
+    space = odl.uniform_discr(0, 1, 10)
+    x_ref = space.one()
+    run_solver(solver_name, x_ref, 6, state=None)
+
+    x = space.one()
+    state = SolverState()
+    run_solver(solver_name, x, 4, state=state)
+    assert state.niter == 4
+
+    if checkpoint == 'file':
+        path = str(tmpdir.join('state.npz'))
+        state.save(path)
+        state = SolverState.load(path)
+    elif checkpoint == 'directory':
+        path = str(tmpdir.join('state'))
+        state.save(path)
+        state = SolverState.load(path, mmap_mode='r')
+
+    # The state holds the returned iterate
+    assert np.array_equal(state['x'], x)
+
+    # The iterate is restored from the state
+    x = space.zero()
+    run_solver(solver_name, x, 2, state=state)
+    assert state.niter == 6
+    assert np.array_equal(x, x_ref)
+
+
+if __name__ == '__main__':
+    pytest.main([str(__file__.replace('\\', '/')), '-v'])
@@ -0,0 +1,129 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Test for the stopping criteria of iterative methods."""
+
+from __future__ import division
+import numpy as np
+import pytest
+
+import odl
+from odl.solvers import SolverInfo
+from odl.util.testutils import all_almost_equal, simple_fixture
+
+
+solver_name = simple_fixture(
+    'solver',
+    ['landweber', 'conjugate_gradient', 'conjugate_gradient_normal',
+     'chambolle_pock', 'douglas_rachford_pd', 'forward_backward_pd',
+     'proximal_gradient', 'accelerated_proximal_gradient', 'adaptive_pdhg',
+     'spdhg'])
+
+
+def test_solver_info():
+    """Test recording and stopping in `SolverInfo`."""
+    info = SolverInfo()
+    assert not info.monitoring
+    assert not info.update()
+    assert info.niter == 1
+    assert info.residuals == []
+    assert len(info.times) == 1
+
+    info = SolverInfo(tol=0.1)
+    assert info.monitoring
+    assert not info.update(1.0)
+    assert info.update(0.1)
+    assert info.converged
+    assert info.residuals == [1.0, 0.1]
+    assert info.time >= 0
+
+    info = SolverInfo(stopping_rule=lambda info: info.niter == 3)
+    assert [info.update(0) for _ in range(3)] == [False, False, True]
+
+    with pytest.raises(ValueError):
+        SolverInfo(tol=-1)
+    with pytest.raises(TypeError):
+        SolverInfo(stopping_rule=1)
+
+
+def run_solver(name, niter, **kwargs):
+    """Solve ``A x = b`` with a solver and return the solution and info."""
+    mat = np.eye(5) * 5 + np.ones([5, 5])
+    op = odl.MatrixOperator(mat)
+    rhs = op.range.one()
+    x = op.domain.zero()
+    l2 = odl.solvers.L2NormSquared(op.range)
+    zero = odl.solvers.ZeroFunctional(op.domain)
+    step = 0.9 / np.linalg.norm(mat, 2)
+
+    if name == 'landweber':
+        info = odl.solvers.landweber(op, x, rhs, niter, omega=step ** 2,
+                                     **kwargs)
+    elif name == 'conjugate_gradient':
+        info = odl.solvers.conjugate_gradient(op, x, rhs, niter, **kwargs)
+    elif name == 'conjugate_gradient_normal':
+        info = odl.solvers.conjugate_gradient_normal(op, x, rhs, niter,
+                                                     **kwargs)
+    elif name == 'chambolle_pock':
+        info = odl.solvers.chambolle_pock_solver(
+            x, l2.translated(rhs), zero, op, tau=step, sigma=step,
+            niter=niter, **kwargs)
+    elif name == 'douglas_rachford_pd':
+        info = odl.solvers.douglas_rachford_pd(
+            x, zero, [l2.translated(rhs)], [op], tau=step, sigma=[step],
+            niter=niter, **kwargs)
+    elif name == 'forward_backward_pd':
+        info = odl.solvers.forward_backward_pd(
+            x, zero, [], [], l2.translated(rhs) * op, tau=step ** 2 / 2,
+            sigma=[], niter=niter, **kwargs)
+    elif name == 'proximal_gradient':
+        info = odl.solvers.proximal_gradient(
+            x, zero, l2.translated(rhs) * op, gamma=step ** 2 / 2,
+            niter=niter, **kwargs)
+    elif name == 'accelerated_proximal_gradient':
+        info = odl.solvers.accelerated_proximal_gradient(
+            x, zero, l2.translated(rhs) * op, gamma=step ** 2 / 2,
+            niter=niter, **kwargs)
+    elif name == 'adaptive_pdhg':
+        info = odl.solvers.adaptive_pdhg(
+            x, l2.translated(rhs), zero, op, tau=step, sigma=step,
+            niter=niter, **kwargs)
+    elif name == 'spdhg':
+        info = odl.solvers.spdhg(
+            x, [l2.translated(rhs)], zero, [op], tau=step, sigma=[step],
+            niter=niter, seed=0, **kwargs)
+    else:
+        assert False
+
+    return op(x), rhs, info
+
+
+def test_solver_tol(solver_name):
+    """Test that the solvers stop when the residual is small."""
+    niter = 500
+    result, rhs, info = run_solver(solver_name, niter)
+    assert isinstance(info, SolverInfo)
+    assert not info.converged
+    assert info.residuals == []
+    assert len(info.times) == info.niter <= niter
+
+    result, rhs, info = run_solver(solver_name, niter, tol=1e-8)
+    assert info.converged
+    assert info.niter < niter
+    assert len(info.residuals) == info.niter
+    assert info.residuals[-1] <= 1e-8
+    assert all_almost_equal(result, rhs, places=5)
+
+    # Custom rule, stop after 3 iterations
+    result, rhs, info = run_solver(
+        solver_name, niter, stopping_rule=lambda info: info.niter == 3)
+    assert info.niter == 3
+
+
+if __name__ == '__main__':
+    pytest.main([str(__file__.replace('\\', '/')), '-v'])
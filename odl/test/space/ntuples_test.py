@@ -825,12 +825,59 @@ def test_matrix_is_valid():
     w_sparse = NumpyFnMatrixWeighting(sparse_mat)
     w_dense = NumpyFnMatrixWeighting(dense_mat)
     w_bad = NumpyFnMatrixWeighting(bad_mat)
+    w_bad_sparse = NumpyFnMatrixWeighting(scipy.sparse.csr_matrix(bad_mat))
+    w_nonsym = NumpyFnMatrixWeighting(dense_mat + np.triu(dense_mat, 1))
 
-    with pytest.raises(NotImplementedError):
-        w_sparse.is_valid()
-
+    assert w_sparse.is_valid()
     assert w_dense.is_valid()
     assert not w_bad.is_valid()
+    assert not w_bad_sparse.is_valid()
+    assert not w_nonsym.is_valid()
+
+
+def test_matrix_factor(fn):
+    sparse_mat = _sparse_matrix(fn)
+    sparse_mat_as_dense = np.asarray(sparse_mat.todense())
+    dense_mat = _dense_matrix(fn)
+    places = 3 if fn.dtype in (np.float32, np.complex64) else 8
+
+    # W = R^H R
+    w_dense = NumpyFnMatrixWeighting(dense_mat)
+    factor = w_dense.matrix_factor()
+    assert isinstance(factor, np.ndarray)
+    assert all_almost_equal(factor.conj().T.dot(factor), dense_mat,
+                            places=places)
+
+    w_sparse = NumpyFnMatrixWeighting(sparse_mat)
+    factor = w_sparse.matrix_factor()
+    assert scipy.sparse.isspmatrix(factor)
+    assert all_almost_equal(factor.conj().T.dot(factor).todense(),
+                            sparse_mat_as_dense, places=places)
+
+    # Caching
+    assert w_sparse.matrix_factor() is factor
+    w_nocache = NumpyFnMatrixWeighting(sparse_mat, cache_mat_factor=False)
+    assert w_nocache.matrix_factor() is not w_nocache.matrix_factor()
+
+    # Norm and dist using the factor
+    [xarr, yarr], [x, y] = noise_elements(fn, 2)
+    for mat, mat_as_dense in [(dense_mat, dense_mat),
+                              (sparse_mat, sparse_mat_as_dense)]:
+        w = NumpyFnMatrixWeighting(mat, precomp_mat_factor=True)
+        true_norm = np.sqrt(np.vdot(xarr, np.dot(mat_as_dense, xarr)).real)
+        true_dist = np.sqrt(np.vdot(xarr - yarr,
+                                    np.dot(mat_as_dense, xarr - yarr)).real)
+        assert almost_equal(w.norm(x), true_norm, places=places)
+        assert almost_equal(w.dist(x, y), true_dist, places=places)
+
+    # Not positive definite
+    bad_mat = np.eye(fn.size)
+    bad_mat[0, 0] = -1
+    with pytest.raises(np.linalg.LinAlgError):
+        NumpyFnMatrixWeighting(bad_mat).matrix_factor()
+    with pytest.raises(np.linalg.LinAlgError):
+        NumpyFnMatrixWeighting(
+            scipy.sparse.csr_matrix(bad_mat)).matrix_factor()
 
 
 def test_matrix_equals(fn, exponent):
@@ -1568,6 +1615,171 @@ def test_reduction(fn, reduction):
     assert ufunc(x_arr) == getattr(x.ufuncs, name)()
 
 
+def test_memmap_element(tmpdir):
+    filename = str(tmpdir.join('x.dat'))
+    space = odl.rn(10)
+
+    # New file
+    x = space.element([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], memmap=filename)
+    assert isinstance(x.data, np.memmap)
+    assert all_equal(x, np.arange(1, 11))
+    x.data.flush()
+
+    # Existing file is reused without overwriting
+    y = space.element(memmap=filename)
+    assert isinstance(y.data, np.memmap)
+    assert all_equal(y, x)
+
+    # Wrapping an existing memmap does not copy
+    arr = np.memmap(filename, dtype=space.dtype, mode='r+', shape=(10,))
+    z = space.element(arr)
+    z[0] = -1
+    assert arr[0] == -1
+
+    with pytest.raises(ValueError):
+        space.element(memmap=filename, data_ptr=x.data_ptr)
+
+
+def test_memmap_blockwise(tmpdir, monkeypatch, exponent):
+    # Use a small block size to enforce blockwise evaluation
+    monkeypatch.setattr(odl.space.npy_ntuples, 'BLOCK_SIZE', 7)
+
+    space = odl.rn(50, exponent=exponent)
+    weighting = _pos_array(space)
+    space_w = odl.rn(50, exponent=exponent, weighting=weighting)
+    [xarr, yarr], [x, y] = noise_elements(space, 2)
+    x = space.element(x, memmap=str(tmpdir.join('x.dat')))
+    y = space.element(y, memmap=str(tmpdir.join('y.dat')))
+    out = space.element(memmap=str(tmpdir.join('out.dat')))
+
+    # Arithmetic
+    space.lincomb(2, x, -1, y, out=out)
+    assert all_almost_equal(out, 2 * xarr - yarr)
+    space.lincomb(2, out, 3, y, out=out)
+    assert all_almost_equal(out, 4 * xarr + yarr)
+
+    # Ufuncs
+    x.ufuncs.sin(out=out)
+    assert all_almost_equal(out, np.sin(xarr))
+    x.ufuncs.add(y, out=out)
+    assert all_almost_equal(out, xarr + yarr)
+    x.ufuncs.add(1, out=out)
+    assert all_almost_equal(out, xarr + 1)
+
+    # Reductions, unweighted and weighted
+    true_norm = np.linalg.norm(xarr, ord=exponent)
+    true_dist = np.linalg.norm(xarr - yarr, ord=exponent)
+    assert almost_equal(space.norm(x), true_norm)
+    assert almost_equal(space.dist(x, y), true_dist)
+
+    if exponent == float('inf'):
+        true_norm_w = np.max(weighting * np.abs(xarr))
+        true_dist_w = np.max(weighting * np.abs(xarr - yarr))
+    else:
+        true_norm_w = np.sum(
+            weighting * np.abs(xarr) ** exponent) ** (1 / exponent)
+        true_dist_w = np.sum(
+            weighting * np.abs(xarr - yarr) ** exponent) ** (1 / exponent)
+    x_w = space_w.element(x.data)
+    y_w = space_w.element(y.data)
+    assert almost_equal(space_w.norm(x_w), true_norm_w)
+    assert almost_equal(space_w.dist(x_w, y_w), true_dist_w)
+
+    if exponent == 2.0:
+        assert almost_equal(space.inner(x, y), np.dot(yarr, xarr))
+        assert almost_equal(space_w.inner(x_w, y_w),
+                            np.dot(yarr, weighting * xarr))
+
+
+def test_blockwise_reductions(fn, exponent, monkeypatch):
+    # Reductions on vectors larger than BLOCK_SIZE are done blockwise
+    monkeypatch.setattr(odl.space.npy_ntuples, 'BLOCK_SIZE', 3)
+
+    weighting = _pos_array(fn)
+    const = 1.5
+    space_a = NumpyFn(fn.size, fn.dtype, exponent=exponent,
+                      weighting=weighting)
+    space_c = NumpyFn(fn.size, fn.dtype, exponent=exponent, weighting=const)
+    [xarr, yarr], [x, y] = noise_elements(fn, 2)
+
+    if exponent == float('inf'):
+        true_norm_a = np.max(weighting * np.abs(xarr))
+        true_dist_a = np.max(weighting * np.abs(xarr - yarr))
+        true_norm_c = const * np.max(np.abs(xarr))
+        true_dist_c = const * np.max(np.abs(xarr - yarr))
+    else:
+        true_norm_a = np.sum(
+            weighting * np.abs(xarr) ** exponent) ** (1 / exponent)
+        true_dist_a = np.sum(
+            weighting * np.abs(xarr - yarr) ** exponent) ** (1 / exponent)
+        true_norm_c = (const * np.sum(np.abs(xarr) ** exponent)
+                       ) ** (1 / exponent)
+        true_dist_c = (const * np.sum(np.abs(xarr - yarr) ** exponent)
+                       ) ** (1 / exponent)
+
+    places = 4 if fn.dtype in (np.float32, np.complex64) else 10
+    x_a, y_a = space_a.element(x.data), space_a.element(y.data)
+    x_c, y_c = space_c.element(x.data), space_c.element(y.data)
+    assert almost_equal(space_a.norm(x_a), true_norm_a, places=places)
+    assert almost_equal(space_a.dist(x_a, y_a), true_dist_a, places=places)
+    assert almost_equal(space_c.norm(x_c), true_norm_c, places=places)
+    assert almost_equal(space_c.dist(x_c, y_c), true_dist_c, places=places)
+    if exponent == 2.0:
+        true_inner = np.vdot(yarr, weighting * xarr)
+        assert almost_equal(space_a.inner(x_a, y_a), true_inner,
+                            places=places)
+
+
+def test_blockwise_reductions_accuracy(monkeypatch):
+    # Partial sums of the blocks are added without loss of accuracy
+    monkeypatch.setattr(odl.space.npy_ntuples, 'BLOCK_SIZE', 1)
+
+    space = odl.rn(3, weighting=[1.0, 1.0, 1.0])
+    x = space.element([1e16, 1.0, -1e16])
+    assert space.inner(x, space.one()) == 1.0
+
+
+def test_multithreaded(fn, monkeypatch):
+    # Enforce splitting of the vectors over several threads
+    monkeypatch.setattr(odl.space.npy_ntuples, 'NUM_THREADS', 3)
+    monkeypatch.setattr(odl.space.npy_ntuples, 'THRESHOLD_THREADS', 4)
+    monkeypatch.setattr(odl.space.npy_ntuples, 'BLOCK_SIZE', 3)
+
+    [xarr, yarr, zarr], [x, y, z] = noise_elements(fn, 3)
+
+    # Linear combination with all kinds of aliasing
+    for a, b in [(0, 0), (1, 0), (0, 1), (2, -1), (1, 1.5)]:
+        _test_lincomb(fn, a, b)
+
+    fn.lincomb(2, x, -1, y, out=z)
+    assert all_almost_equal(z, 2 * xarr - yarr)
+
+    # Element-wise arithmetic
+    fn.multiply(x, y, out=z)
+    assert all_almost_equal(z, xarr * yarr)
+    fn.divide(x, y, out=z)
+    assert all_almost_equal(z, xarr / yarr)
+
+    # Ufuncs
+    x.ufuncs.exp(out=z)
+    assert all_almost_equal(z, np.exp(xarr))
+    assert all_almost_equal(x.ufuncs.add(y), xarr + yarr)
+    assert all_almost_equal(x.ufuncs.multiply(2.0), 2.0 * xarr)
+
+    # Reductions
+    space_w = NumpyFn(fn.size, fn.dtype, weighting=_pos_array(fn))
+    weighting = space_w.weighting.array
+    x_w, y_w = space_w.element(x.data), space_w.element(y.data)
+    places = 4 if fn.dtype in (np.float32, np.complex64) else 10
+    assert almost_equal(fn.dist(x, y), np.linalg.norm(xarr - yarr),
+                        places=places)
+    assert almost_equal(space_w.inner(x_w, y_w),
+                        np.vdot(yarr, weighting * xarr), places=places)
+    assert almost_equal(space_w.norm(x_w),
+                        np.sqrt(np.sum(weighting * np.abs(xarr) ** 2)),
+                        places=places)
+
+
 def test_ufunc_reduction_docs_notempty():
     for _, __, ___, doc in UFUNCS:
         assert doc.splitlines()[0] != ''
@@ -0,0 +1,103 @@
+# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import division
+import pytest
+
+import odl
+from odl.util.bufferpool import BufferPool, temporary_element
+
+
+def test_buffer_pool_reuse():
+    pool = BufferPool()
+    space = odl.rn(10)
+
+    x = pool.acquire(space)
+    assert x in space
+    assert len(pool) == 0
+    pool.release(x)
+    assert len(pool) == 1
+    assert pool.nbytes == x.nbytes
+
+    # Releasing twice does not store the element twice
+    pool.release(x)
+    assert len(pool) == 1
+
+    with pool.element(space) as y:
+        assert y is x
+        assert len(pool) == 0
+        with pool.element(space) as z:
+            # Nested request must get a different element
+            assert z is not y
+    assert len(pool) == 2
+
+    # Different dtype and different space are kept apart
+    with pool.element(odl.rn(10, dtype='float32')) as w:
+        assert w is not x
+        assert w.dtype == 'float32'
+    with pool.element(odl.uniform_discr(0, 1, 10)) as w:
+        assert w is not x
+        assert w in odl.uniform_discr(0, 1, 10)
+
+    pool.clear()
+    assert len(pool) == 0
+    assert pool.nbytes == 0
+
+
+def test_buffer_pool_product_space():
+    pool = BufferPool()
+    space = odl.ProductSpace(odl.rn(3), odl.rn(2, dtype='float32'))
+
+    with pool.element(space) as x:
+        assert x in space
+    assert pool.nbytes == 3 * 8 + 2 * 4
+
+    assert pool.acquire(space) is x
+
+
+def test_buffer_pool_max_bytes():
+    space = odl.rn(10)
+    pool = BufferPool(max_bytes=space.element().nbytes)
+
+    x = space.element()
+    y = space.element()
+    pool.release(x)
+    pool.release(y)
+    assert len(pool) == 1
+    assert pool.nbytes <= pool.max_bytes
+
+    # Reducing the capacity purges the pool
+    pool.max_bytes = 0
+    assert len(pool) == 0
+    pool.release(x)
+    assert len(pool) == 0
+
+    with pytest.raises(ValueError):
+        pool.max_bytes = -1
+
+
+def test_temporary_element_in_operators():
+    space = odl.rn(5)
+    op = odl.ScalingOperator(space, 2.0)
+    x = space.element([1, 2, 3, 4, 5])
+    out = space.element()
+
+    odl.OperatorSum(op, op)(x, out=out)
+    assert out == 4 * x
+
+    odl.OperatorComp(op, op)(x, out=out)
+    assert out == 4 * x
+
+    # The default pool hands out the temporaries used above
+    with temporary_element(space) as tmp:
+        assert tmp in space
+        assert tmp is not out
+
+
+if __name__ == '__main__':
+    pytest.main([str(__file__.replace('\\', '/')), '-v'])
@@ -7,12 +7,13 @@
 # obtain one at https://mozilla.org/MPL/2.0/.
 
 from __future__ import division
+from multiprocessing.pool import ThreadPool
 import pytest
 import numpy as np
 
 from odl.util.utility import (
     is_scalar_dtype, is_real_dtype, is_real_floating_dtype,
-    is_complex_floating_dtype)
+    is_complex_floating_dtype, executor_map)
 
 
 real_float_dtypes = np.sctypes['float']
@@ -49,5 +50,24 @@ def test_is_complex_floating_dtype():
         assert is_complex_floating_dtype(dtype)
 
 
+# ---- Concurrency helpers ---- #
+
+
+def test_executor_map():
+    assert executor_map(None, lambda i: 2 * i, range(3)) == [0, 2, 4]
+
+    pool = ThreadPool(1)
+    try:
+        assert executor_map(pool, lambda i: 2 * i, range(3)) == [0, 2, 4]
+
+        # Nested calls sharing one worker must not deadlock
+        def inner(i):
+            return sum(executor_map(pool, lambda j: i * j, range(3)))
+
+        assert executor_map(pool, inner, range(3)) == [0, 3, 6]
+    finally:
+        pool.close()
+
+
 if __name__ == '__main__':
     pytest.main([str(__file__.replace('\\', '/')), '-v'])
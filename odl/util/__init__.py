@@ -30,4 +30,7 @@ __all__ += numerics.__all__
 from .vectorization import *
 __all__ += vectorization.__all__
 
+from .bufferpool import *
+__all__ += bufferpool.__all__
+
 from . import ufuncs
@@ -0,0 +1,267 @@
+﻿# Copyright 2014-2017 The ODL contributors
+#
+# This file is part of ODL.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Pool of reusable temporary space elements."""
+
+# Imports for common Python 2/3 codebase
+from __future__ import print_function, division, absolute_import
+from builtins import object
+from collections import defaultdict
+from contextlib import contextmanager
+import threading
+
+
+__all__ = ('BufferPool', 'default_buffer_pool', 'temporary_element')
+
+
+# Default upper bound for the number of bytes kept in the default pool
+BUFFER_POOL_MAX_BYTES = 2 ** 28
+
+
+def _space_nbytes(space):
+    """Return the memory size of an element of ``space`` in bytes.
+
+    ``None`` is returned if the size cannot be determined, in which case
+    elements of ``space`` are not pooled.
+    """
+    spaces = getattr(space, 'spaces', None)
+    if spaces is not None:
+        # Product space: sum over the components
+        nbytes = 0
+        for spc in spaces:
+            spc_nbytes = _space_nbytes(spc)
+            if spc_nbytes is None:
+                return None
+            nbytes += spc_nbytes
+        return nbytes
+
+    try:
+        return int(space.size) * space.dtype.itemsize
+    except (AttributeError, TypeError):
+        return None
+
+
+def _pool_key(space):
+    """Return the pool key of ``space``, or ``None`` if not hashable."""
+    key = (space, getattr(space, 'dtype', None))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    else:
+        return key
+
+
+class BufferPool(object):
+
+    """Pool of temporary space elements for reuse.
+
+    Elements are stored per ``(space, dtype)`` and handed out again by
+    `acquire` once they have been given back with `release`. This
+    avoids repeated allocation of scratch memory in operators and
+    iterative methods that are evaluated many times.
+
+    The contents of an acquired element are arbitrary, just as for
+    ``space.element()``. Elements must not be used anymore after they
+    have been released.
+    """
+
+    def __init__(self, max_bytes=None):
+        """Initialize a new instance.
+
+        Parameters
+        ----------
+        max_bytes : nonnegative int, optional
+            Maximum number of bytes held by elements in the pool.
+            Released elements that would exceed this bound are dropped
+            instead of being stored. ``None`` means
+            ``BUFFER_POOL_MAX_BYTES``.
+
+        Examples
+        --------
+        >>> pool = BufferPool()
+        >>> r3 = odl.rn(3)
+        >>> with pool.element(r3) as tmp:
+        ...     tmp[:] = [1, 2, 3]
+        ...     tmp.norm() ** 2
+        14.0
+        >>> pool.nbytes
+        24
+
+        The same element is handed out again in the next request:
+
+        >>> x = pool.acquire(r3)
+        >>> x
+        rn(3).element([1.0, 2.0, 3.0])
+        >>> pool.release(x)
+        """
+        self.__free = defaultdict(list)
+        self.__nbytes = 0
+        self.__lock = threading.Lock()
+
+        if max_bytes is None:
+            max_bytes = BUFFER_POOL_MAX_BYTES
+        self.max_bytes = max_bytes
+
+    @property
+    def max_bytes(self):
+        """Maximum number of bytes held by the pool."""
+        return self.__max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes):
+        """Set the maximum number of bytes, purging if necessary."""
+        max_bytes = int(max_bytes)
+        if max_bytes < 0:
+            raise ValueError('`max_bytes` must be nonnegative, got {}'
+                             ''.format(max_bytes))
+        self.__max_bytes = max_bytes
+        if self.nbytes > max_bytes:
+            self.clear()
+
+    @property
+    def nbytes(self):
+        """Number of bytes currently held by the pool."""
+        return self.__nbytes
+
+    def __len__(self):
+        """Return ``len(self)``, the number of pooled elements."""
+        return sum(len(elems) for elems in self.__free.values())
+
+    def acquire(self, space):
+        """Return a temporary element of ``space``.
+
+        If the pool holds an unused element of ``space``, it is returned,
+        otherwise a new one is created.
+
+        Parameters
+        ----------
+        space : `LinearSpace`
+            Space of the requested element.
+
+        Returns
+        -------
+        element : ``space`` element
+            Element with arbitrary contents. It should be given back with
+            `release` when it is no longer needed.
+        """
+        key = _pool_key(space)
+        if key is not None:
+            with self.__lock:
+                elems = self.__free.get(key)
+                if elems:
+                    elem = elems.pop()
+                    self.__nbytes -= _space_nbytes(space)
+                    return elem
+
+        return space.element()
+
+    def release(self, element):
+        """Give ``element`` back to the pool for reuse.
+
+        Elements whose size cannot be determined, and elements that
+        would make the pool exceed `max_bytes`, are dropped.
+        """
+        space = getattr(element, 'space', None)
+        key = _pool_key(space)
+        nbytes = _space_nbytes(space)
+        if key is None or nbytes is None:
+            return
+
+        with self.__lock:
+            if self.__nbytes + nbytes > self.max_bytes:
+                return
+            elems = self.__free[key]
+            if any(elem is element for elem in elems):
+                return
+            elems.append(element)
+            self.__nbytes += nbytes
+
+    @contextmanager
+    def element(self, space):
+        """Context manager for a temporary element of ``space``.
+
+        The element is acquired when entering the context and released
+        when leaving it.
+
+        Examples
+        --------
+        >>> pool = BufferPool()
+        >>> r3 = odl.rn(3)
+        >>> with pool.element(r3) as tmp:
+        ...     tmp in r3
+        True
+        """
+        elem = self.acquire(space)
+        try:
+            yield elem
+        finally:
+            self.release(elem)
+
+    def clear(self):
+        """Remove all elements from the pool."""
+        with self.__lock:
+            self.__free.clear()
+            self.__nbytes = 0
+
+    def __repr__(self):
+        """Return ``repr(self)``."""
+        if self.max_bytes == BUFFER_POOL_MAX_BYTES:
+            return '{}()'.format(self.__class__.__name__)
+        else:
+            return '{}(max_bytes={})'.format(self.__class__.__name__,
+                                             self.max_bytes)
+
+
+_DEFAULT_BUFFER_POOL = BufferPool()
+
+
+def default_buffer_pool():
+    """Return the buffer pool used by ODL operators and solvers.
+
+    Its capacity can be changed or set to 0 (disabling pooling) via
+    `BufferPool.max_bytes`.
+
+    Examples
+    --------
+    >>> pool = default_buffer_pool()
+    >>> pool is default_buffer_pool()
+    True
+    """
+    return _DEFAULT_BUFFER_POOL
+
+
+def temporary_element(space, pool=None):
+    """Context manager for a temporary element of ``space``.
+
+    Parameters
+    ----------
+    space : `LinearSpace`
+        Space of the requested element.
+    pool : `BufferPool`, optional
+        Pool from which the element is taken. ``None`` means
+        `default_buffer_pool`.
+
+    Examples
+    --------
+    >>> r3 = odl.rn(3)
+    >>> x = r3.element([1, 2, 3])
+    >>> with temporary_element(r3) as tmp:
+    ...     result = x.multiply(x, out=tmp)
+    ...     tmp.inner(r3.one())
+    14.0
+    """
+    if pool is None:
+        pool = _DEFAULT_BUFFER_POOL
+    return pool.element(space)
+
+
+if __name__ == '__main__':
+    # pylint: disable=wrong-import-position
+    from odl.util.testutils import run_doctests
+    run_doctests()
@@ -170,6 +170,25 @@ for name, doc in REDUCTIONS:
     setattr(NtuplesBaseUfuncs, name, method)
 
 
+def _elementwise_slices(*vectors):
+    """Return slices for blockwise evaluation of a ufunc, or ``None``.
+
+    Memory-mapped vectors are processed in blocks, and large vectors
+    are split into chunks for multiple threads if enabled.
+    See ``odl.space.npy_ntuples`` for the parameters controlling this.
+    """
+    # Lazy import to avoid circular import
+    from odl.space.npy_ntuples import _elementwise_slices
+    return _elementwise_slices(*vectors)
+
+
+def _map_blocks(func, slices):
+    """Evaluate ``func`` on all ``slices``, possibly multi-threaded."""
+    # Lazy import to avoid circular import
+    from odl.space.npy_ntuples import _map_blocks
+    return _map_blocks(func, slices)
+
+
 # Optimized implementation of ufuncs since we can use the out parameter
 # as well as the data parameter to avoid one call to asarray() when using an
 # NumpyNtuplesVector
@@ -187,7 +206,14 @@ def wrap_ufunc_ntuples(name, n_in, n_out, doc):
             def wrapper(self, out=None):
                 if out is None:
                     out = self.vector.space.element()
-                wrapped(self.vector, out.data)
+
+                slices = _elementwise_slices(self.vector, out)
+                if slices is None:
+                    wrapped(self.vector, out.data)
+                else:
+                    _map_blocks(lambda slc: wrapped(self.vector.data[slc],
+                                                    out.data[slc]),
+                                slices)
                 return out
 
         elif n_out == 2:
@@ -197,7 +223,14 @@ def wrap_ufunc_ntuples(name, n_in, n_out, doc):
                 if out2 is None:
                     out2 = self.vector.space.element()
 
-                y1, y2 = wrapped(self.vector, out1.data, out2.data)
+                slices = _elementwise_slices(self.vector, out1, out2)
+                if slices is None:
+                    wrapped(self.vector, out1.data, out2.data)
+                else:
+                    _map_blocks(lambda slc: wrapped(self.vector.data[slc],
+                                                    out1.data[slc],
+                                                    out2.data[slc]),
+                                slices)
                 return out1, out2
 
         else:
@@ -209,7 +242,17 @@ def wrap_ufunc_ntuples(name, n_in, n_out, doc):
                 if out is None:
                     out = self.vector.space.element()
 
-                wrapped(self.vector, x2, out.data)
+                slices = _elementwise_slices(self.vector, out)
+                if slices is None:
+                    wrapped(self.vector, x2, out.data)
+                else:
+                    x2 = np.asarray(x2)
+
+                    def wrapped_block(slc):
+                        x2_blk = x2 if x2.size == 1 else x2[slc]
+                        wrapped(self.vector.data[slc], x2_blk, out.data[slc])
+
+                    _map_blocks(wrapped_block, slices)
                 return out
 
         else:
@@ -13,6 +13,7 @@ from __future__ import print_function, division, absolute_import
 
 from functools import wraps
 from collections import OrderedDict
+import threading
 import numpy as np
 
 
@@ -22,7 +23,8 @@ __all__ = ('array1d_repr', 'array1d_str', 'arraynd_repr', 'arraynd_str',
            'is_real_dtype', 'is_real_floating_dtype',
            'is_complex_floating_dtype', 'real_dtype', 'complex_dtype',
            'conj_exponent', 'as_flat_array', 'writable_array',
-           'run_from_ipython', 'NumpyRandomSeed', 'cache_arguments', 'unique')
+           'run_from_ipython', 'NumpyRandomSeed', 'cache_arguments', 'unique',
+           'executor_map')
 
 TYPE_MAP_R2C = {np.dtype(dtype): np.result_type(dtype, 1j)
                 for dtype in np.sctypes['float']}
@@ -31,6 +33,9 @@ TYPE_MAP_C2R = {cdt: np.empty(0, dtype=cdt).real.dtype
                 for rdt, cdt in TYPE_MAP_R2C.items()}
 TYPE_MAP_C2R.update({k: k for k in TYPE_MAP_R2C.keys()})
 
+# Marks threads that currently evaluate a task for an executor
+_EXECUTOR_STATE = threading.local()
+
 
 def indent_rows(string, indent=4):
     """Return ``string`` indented by ``indent`` spaces."""
@@ -907,6 +912,50 @@ def unique(seq):
         return unique_values
 
 
+def executor_map(executor, func, items):
+    """Return ``[func(item) for item in items]``, using ``executor`` if given.
+
+    Items are evaluated sequentially if ``func`` is itself evaluated by
+    an executor in this function, which avoids deadlocks in nested calls
+    sharing the same executor.
+
+    Parameters
+    ----------
+    executor : object with ``map`` method
+        Executor used to evaluate the items concurrently, e.g., a
+        `multiprocessing.pool.ThreadPool` or a
+        `concurrent.futures.ThreadPoolExecutor`. For ``None``, the items
+        are evaluated sequentially.
+    func : callable
+        Function called with each item.
+    items : iterable
+        Arguments of ``func``.
+
+    Returns
+    -------
+    results : list
+        Values of ``func`` in the order of ``items``.
+
+    Examples
+    --------
+    >>> executor_map(None, lambda i: i ** 2, range(4))
+    [0, 1, 4, 9]
+    """
+    items = list(items)
+    if (executor is None or len(items) <= 1 or
+            getattr(_EXECUTOR_STATE, 'active', False)):
+        return [func(item) for item in items]
+
+    def task(item):
+        _EXECUTOR_STATE.active = True
+        try:
+            return func(item)
+        finally:
+            _EXECUTOR_STATE.active = False
+
+    return list(executor.map(task, items))
+
+
 if __name__ == '__main__':
     # pylint: disable=wrong-import-position
     from odl.util.testutils import run_doctests